@@ -0,0 +1,83 @@
+"""
+Compare the COPY bulk loader with the batched INSERT path of
+TradingDataPersistence on synthetic market data.
+
+Needs a PostgreSQL database created from resources/queries.sql. Every run
+upserts the same BENCH timestamps, so repeated runs measure the update path.
+Differential saves are off: both paths write every row instead of skipping
+the months the other path just stored.
+
+Usage:
+    python -m benchmarks.bench_persistence [--sizes 10000 100000] [--dbname trading_analytics] ...
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.data.trading_data_persistence import TradingDataPersistence
+
+
+def make_results(n: int, seed: int = 42) -> dict:
+    """Backtest-shaped results with `n` minute bars"""
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0.0, 0.001, n)))
+    closes = pd.Series(prices)
+    return {
+        'dates': pd.date_range('2024-01-02', periods=n, freq='min').tolist(),
+        'prices': prices.tolist(),
+        'volumes': rng.lognormal(10, 0.5, n).round().tolist(),
+        'ema_short': closes.ewm(span=9, adjust=False).mean().tolist(),
+        'ema_long': closes.ewm(span=20, adjust=False).mean().tolist(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--insert-max', type=int, default=100_000,
+                        help='largest size the batched INSERT path is timed on')
+    parser.add_argument('--dbname', default='trading_analytics')
+    parser.add_argument('--user', default='trading_user')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', default='5432')
+    args = parser.parse_args()
+
+    db_config = {
+        'dbname': args.dbname,
+        'user': args.user,
+        'password': args.password,
+        'host': args.host,
+        'port': args.port
+    }
+    config = TradingConfig(
+        symbol='BENCH', start_date='2024-01-01', end_date='2025-01-01',
+        initial_capital=100000, ema_short=9, ema_long=20,
+        volume_threshold=1.5, stop_loss=0.02, take_profit=0.03
+    )
+
+    print(f"{'rows':>12} {'COPY (rows/s)':>15} {'INSERT (rows/s)':>16} {'speedup':>10}")
+    with TradingDataPersistence(db_config, differential=False) as db:
+        strategy_id = db.save_trading_strategy(config)
+        for size in args.sizes:
+            results = make_results(size)
+
+            start = time.perf_counter()
+            db.bulk_save_market_data(strategy_id, results, config)
+            copy_rate = size / (time.perf_counter() - start)
+
+            if size <= args.insert_max:
+                start = time.perf_counter()
+                db.save_market_data(strategy_id, results, config)
+                insert_rate = size / (time.perf_counter() - start)
+                print(f"{size:>12,} {copy_rate:>15,.0f} {insert_rate:>16,.0f} "
+                      f"{copy_rate / insert_rate:>9.1f}x")
+            else:
+                print(f"{size:>12,} {copy_rate:>15,.0f} {'-':>16} {'-':>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Time every pipeline stage on synthetic data and record the results as JSON.
+
+Stages, per size: signal generation, trade execution, analysis, report
+rendering and persistence. Each stage is timed (best of --repeat runs) and
+then run once more under tracemalloc for its peak traced memory, unless
+--no-memory is given. Inputs come from benchmarks.synthetic, so nothing is
+downloaded.
+
+Persistence writes to an in-process stand-in connection that accepts every
+statement and drains COPY payloads, which measures the client side of the
+writes (frame building, fingerprints, CSV encoding). Pass --dbname to write
+to a real PostgreSQL database created from resources/queries.sql instead.
+
+Compare two runs, e.g. before and after a change, with --baseline.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--sizes 1000 100000 10000000] [--output bench.json]
+    python -m benchmarks.bench_pipeline --sizes 100000 --baseline old.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.backtesting.backtest import Backtest
+from src.backtesting.backtest_result import BacktestResult
+from src.data.trading_data_persistence import TradingDataPersistence
+from src.reporting.trading_report import TradingReport
+from src.signals.signal_generator import SignalGenerator
+from src.trade_execution.trade_manager import TradeManager
+from .synthetic import make_ohlcv
+
+STAGES = ('signals', 'trades', 'analyze', 'report', 'persist')
+
+
+class StandInCursor:
+    """Cursor accepting every statement; COPY payloads are read and dropped"""
+
+    def __init__(self, conn: 'StandInConnection'):
+        self.conn = conn
+        self.rowcount = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.statements += 1
+
+    def mogrify(self, query, params=None) -> bytes:
+        return b''
+
+    def fetchone(self):
+        return (1,)
+
+    def fetchall(self):
+        return []
+
+    def copy_expert(self, sql, file):
+        while True:
+            chunk = file.read(1 << 20)
+            if not chunk:
+                break
+            self.conn.copied_bytes += len(chunk)
+
+    def close(self):
+        pass
+
+
+class StandInConnection:
+    """Local stand-in for a psycopg2 connection"""
+
+    def __init__(self):
+        self.statements = 0
+        self.copied_bytes = 0
+        self.closed = 0
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+def measure(func: Callable, repeat: int = 1, memory: bool = True) -> Tuple[object, float, Optional[int]]:
+    """
+    Returns:
+        Tuple: (last return value, best wall time in seconds, peak traced bytes or None)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        del value
+        tracemalloc.start()
+        try:
+            value = func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return value, best, peak
+
+
+def run_benchmarks(sizes: List[int], stages=STAGES, repeat: int = 1, memory: bool = True,
+                   report_format: str = 'pdf', db_config: Optional[Dict] = None,
+                   seed: int = 42) -> List[Dict]:
+    """
+    Run the selected stages at every size.
+
+    Stages depend on the previous ones' outputs, which are always computed,
+    but only the selected stages are measured.
+
+    Returns:
+        List: One row per (size, stage): bars, stage, wall_time, peak_bytes
+        and bars_per_second
+    """
+    config = TradingConfig(
+        symbol='BENCH', start_date='2010-01-01', end_date='2030-01-01',
+        initial_capital=100000, ema_short=9, ema_long=20,
+        volume_threshold=1.5, stop_loss=0.02, take_profit=0.03
+    )
+    rows = []
+
+    def stage(name: str, size: int, func: Callable):
+        if name not in stages:
+            return func()
+        value, wall_time, peak = measure(func, repeat, memory)
+        rows.append({
+            'bars': size,
+            'stage': name,
+            'wall_time': wall_time,
+            'peak_bytes': peak,
+            'bars_per_second': size / wall_time if wall_time > 0 else None,
+        })
+        logging.getLogger(__name__).info(f"{name:>8} {size:>12,} bars {wall_time:10.4f}s")
+        return value
+
+    with tempfile.TemporaryDirectory() as report_dir:
+        for size in sizes:
+            data = make_ohlcv(size, seed=seed)
+            signals = stage('signals', size, lambda: SignalGenerator(config).generate_signals(data))
+            trade_results = stage('trades', size, lambda: TradeManager(config).execute_trades(data, signals))
+            result = BacktestResult.from_run(data, signals, trade_results)
+            del trade_results
+
+            def analyze():
+                backtest = Backtest(config)
+                backtest.results = result
+                backtest.dates = data.index
+                return backtest.analyze_results()
+
+            analysis = stage('analyze', size, analyze)
+            stage('report', size, lambda: TradingReport(
+                config, result, analysis, report_dir=report_dir, output_format=report_format
+            ).generate_report())
+            stage('persist', size, lambda: _persist(db_config, config, result, analysis))
+            del data, signals, result, analysis
+    return rows
+
+
+def _persist(db_config: Optional[Dict], config: TradingConfig, result: BacktestResult, analysis: Dict) -> int:
+    conn = None if db_config else StandInConnection()
+    with TradingDataPersistence(db_config or {}, conn=conn) as db:
+        return db.write_all_data(config, result, analysis)
+
+
+def environment() -> Dict:
+    """Versions identifying a benchmark run"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(rows: List[Dict], baseline: List[Dict]) -> pd.DataFrame:
+    """Current vs baseline wall time and peak memory per (bars, stage)"""
+    current = pd.DataFrame(rows).set_index(['bars', 'stage'])
+    previous = pd.DataFrame(baseline).set_index(['bars', 'stage'])
+    joined = current[['wall_time', 'peak_bytes']].join(
+        previous[['wall_time', 'peak_bytes']], rsuffix='_baseline', how='inner'
+    )
+    joined['time_ratio'] = joined['wall_time'] / joined['wall_time_baseline']
+    joined['memory_ratio'] = joined['peak_bytes'] / joined['peak_bytes_baseline']
+    return joined
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 10_000_000])
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per stage, best is kept')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--report-format', choices=['pdf', 'json', 'html'], default='pdf')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_pipeline.json')
+    parser.add_argument('--baseline', help='earlier --output file to compare against')
+    parser.add_argument('--dbname', help='write to this PostgreSQL database instead of the stand-in')
+    parser.add_argument('--user', default='trading_user')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', default='5432')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger(__name__).setLevel(logging.INFO)
+    db_config = None
+    if args.dbname:
+        db_config = {
+            'dbname': args.dbname,
+            'user': args.user,
+            'password': args.password,
+            'host': args.host,
+            'port': args.port
+        }
+
+    rows = run_benchmarks(args.sizes, args.stages, args.repeat, not args.no_memory,
+                          args.report_format, db_config, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'database': 'postgresql' if db_config else 'stand-in',
+                   'results': rows}, f, indent=1)
+
+    table = pd.DataFrame(rows)
+    table['peak_mb'] = table['peak_bytes'] / 2 ** 20
+    print(table[['bars', 'stage', 'wall_time', 'peak_mb', 'bars_per_second']].to_string(index=False))
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        print(compare(rows, baseline)[['wall_time', 'wall_time_baseline', 'time_ratio', 'memory_ratio']]
+              .to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Compare the vectorized and per-bar SignalGenerator paths.
+
+Usage:
+    python -m benchmarks.bench_signal_generator [--sizes 1000 100000 ...] [--iterative-max 100000]
+"""
+import argparse
+import time
+
+from config.config import TradingConfig
+from src.signals.signal_generator import SignalGenerator
+from .synthetic import make_ohlcv
+
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--iterative-max', type=int, default=100_000,
+                        help='largest size the per-bar loop is timed on')
+    args = parser.parse_args()
+
+    config = TradingConfig(
+        symbol='BENCH', start_date='2010-01-01', end_date='2020-01-01',
+        initial_capital=100000, ema_short=9, ema_long=20,
+        volume_threshold=1.5, stop_loss=0.02, take_profit=0.03
+    )
+    generator = SignalGenerator(config)
+
+    print(f"{'bars':>12} {'vectorized (s)':>15} {'iterative (s)':>15} {'speedup':>10}")
+    for size in args.sizes:
+        data = make_ohlcv(size)
+        vectorized = time_call(generator.generate_signals, data)
+        if size <= args.iterative_max:
+            iterative = time_call(generator.generate_signals_iterative, data)
+            print(f"{size:>12,} {vectorized:>15.4f} {iterative:>15.4f} {iterative / vectorized:>9.0f}x")
+        else:
+            print(f"{size:>12,} {vectorized:>15.4f} {'-':>15} {'-':>10}")
+
+
+if __name__ == '__main__':
+    main()
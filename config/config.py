@@ -13,6 +13,8 @@ class TradingConfig:
     stop_loss: float
     take_profit: float
     pivot_threshold: float = 0.001  # New parameter for pivot level proximity
+    interval: str = '1d'  # Bar size requested from the data source, e.g. '1m', '5m'
+    intraday: bool = False  # Derive CPR/pivots from the previous session instead of the previous bar
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'TradingConfig':
@@ -38,8 +38,13 @@ CREATE TABLE config.trading_strategies (
     volume_threshold DECIMAL(15,2) NOT NULL,
     stop_loss DECIMAL(5,4) NOT NULL,
     take_profit DECIMAL(5,4) NOT NULL,
+    pivot_threshold DECIMAL(8,6) NOT NULL,
+    interval VARCHAR(10) NOT NULL,
+    intraday BOOLEAN NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (symbol, start_date, end_date, initial_capital, ema_short, ema_long,
+            volume_threshold, stop_loss, take_profit, pivot_threshold, interval, intraday)
 );
 
 -- Create trigger for trading_strategies
@@ -48,18 +53,29 @@ CREATE TRIGGER update_trading_strategies_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- One row per persisted backtest; per-run rows reference it and are never rewritten
+CREATE TABLE config.backtest_runs (
+    run_id SERIAL PRIMARY KEY,
+    strategy_id INTEGER REFERENCES config.trading_strategies(strategy_id),
+    symbol VARCHAR(20) NOT NULL,
+    status VARCHAR(10) DEFAULT 'RUNNING' CHECK (status IN ('RUNNING', 'COMPLETE')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create partitioned market_data table
 CREATE TABLE trading.market_data (
     id SERIAL,
     strategy_id INTEGER REFERENCES config.trading_strategies(strategy_id),
     timestamp TIMESTAMP NOT NULL,
     symbol VARCHAR(20) NOT NULL,
+    interval VARCHAR(10) NOT NULL DEFAULT '1d',
+    open DECIMAL(15,2),
+    high DECIMAL(15,2),
+    low DECIMAL(15,2),
     price DECIMAL(15,2) NOT NULL,
     volume DECIMAL(15,2) NOT NULL,
-    ema_short DECIMAL(15,2),
-    ema_long DECIMAL(15,2),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE (symbol, timestamp)
+    UNIQUE (symbol, interval, timestamp)
 ) PARTITION BY RANGE (timestamp);
 
 -- Create initial partitions
@@ -158,10 +174,21 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Strategy indicators per run; they depend on the run's parameters, so they
+-- are kept out of the shared market_data table and its fingerprints
+CREATE TABLE trading.run_indicators (
+    run_id INTEGER NOT NULL REFERENCES config.backtest_runs(run_id),
+    timestamp TIMESTAMP NOT NULL,
+    ema_short DECIMAL(15,2),
+    ema_long DECIMAL(15,2),
+    PRIMARY KEY (run_id, timestamp)
+);
+
 -- Create trades table
 CREATE TABLE trading.trades (
     trade_id SERIAL PRIMARY KEY,
     strategy_id INTEGER REFERENCES config.trading_strategies(strategy_id),
+    run_id INTEGER REFERENCES config.backtest_runs(run_id),
     symbol VARCHAR(20) NOT NULL,
     entry_date TIMESTAMP NOT NULL,
     exit_date TIMESTAMP,
@@ -187,9 +214,10 @@ CREATE TRIGGER update_trades_updated_at
 CREATE TABLE metrics.portfolio_metrics (
     id SERIAL PRIMARY KEY,
     strategy_id INTEGER REFERENCES config.trading_strategies(strategy_id),
+    run_id INTEGER REFERENCES config.backtest_runs(run_id),
     timestamp TIMESTAMP NOT NULL,
     equity_value DECIMAL(15,2) NOT NULL,
-    drawdown DECIMAL(8,4),
+    drawdown DECIMAL(15,2),
     drawdown_pct DECIMAL(8,4),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -198,6 +226,7 @@ CREATE TABLE metrics.portfolio_metrics (
 CREATE TABLE metrics.daily_performance (
     id SERIAL PRIMARY KEY,
     strategy_id INTEGER REFERENCES config.trading_strategies(strategy_id),
+    run_id INTEGER REFERENCES config.backtest_runs(run_id),
     date DATE NOT NULL,
     starting_equity DECIMAL(15,2) NOT NULL,
     ending_equity DECIMAL(15,2) NOT NULL,
@@ -208,7 +237,28 @@ CREATE TABLE metrics.daily_performance (
     losing_trades INTEGER,
     sharpe_ratio DECIMAL(8,4),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE (strategy_id, date)
+    UNIQUE (run_id, date)
+);
+
+-- Per symbol and month: watermark and content hash of the market data last saved,
+-- so unchanged months are not rewritten
+CREATE TABLE trading.market_data_fingerprints (
+    symbol VARCHAR(20) NOT NULL,
+    interval VARCHAR(10) NOT NULL,
+    month DATE NOT NULL,
+    row_count INTEGER NOT NULL,
+    last_timestamp TIMESTAMP NOT NULL,
+    fingerprint CHAR(32) NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, interval, month)
+);
+
+-- Spool segments already written to the database, so replays are idempotent
+CREATE TABLE trading.spool_applied (
+    segment_id VARCHAR(64) PRIMARY KEY,
+    symbol VARCHAR(20) NOT NULL,
+    strategy_id INTEGER,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create auto-partitioning function
@@ -258,10 +308,13 @@ CREATE TRIGGER create_market_data_partition_trigger
     EXECUTE FUNCTION trading.create_market_data_partition();
 
 -- Create indexes
-CREATE INDEX idx_market_data_symbol_timestamp ON trading.market_data(symbol, timestamp);
+CREATE INDEX idx_market_data_symbol_timestamp ON trading.market_data(symbol, interval, timestamp);
 CREATE INDEX idx_trades_symbol_dates ON trading.trades(symbol, entry_date, exit_date);
 CREATE INDEX idx_portfolio_metrics_strategy_timestamp ON metrics.portfolio_metrics(strategy_id, timestamp);
 CREATE INDEX idx_daily_performance_strategy_date ON metrics.daily_performance(strategy_id, date);
+CREATE INDEX idx_backtest_runs_symbol_created ON config.backtest_runs(symbol, created_at);
+CREATE INDEX idx_trades_run ON trading.trades(run_id);
+CREATE INDEX idx_portfolio_metrics_run ON metrics.portfolio_metrics(run_id);
 
 -- Create a trading application user (replace password with your secure password)
 DO $$
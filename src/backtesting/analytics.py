@@ -0,0 +1,248 @@
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Bars per year used to annualize Sharpe, Sortino and Calmar when there are no
+# dates to infer it from: one bar per trading day
+PERIODS_PER_YEAR = 252
+
+SCALAR_METRICS = [
+    'total_trades', 'winning_trades', 'losing_trades', 'total_profit', 'win_rate',
+    'max_drawdown', 'sharpe_ratio', 'sortino_ratio', 'calmar_ratio', 'annual_return',
+    'exposure', 'turnover'
+]
+
+
+class PerformanceAnalyzer:
+    """
+    Performance metrics from an equity curve and a trade log.
+
+    Everything is derived from NumPy arrays in one pass over the data: the
+    trade log is converted to arrays once and the returns, running peak and
+    drawdowns of the equity curve are computed once and shared by every
+    metric, so analyzing a run costs a handful of vector operations. The
+    per-bar and per-day series are optional and skipped in parameter sweeps.
+    """
+
+    @staticmethod
+    def analyze(equity_curve: Sequence[float], trades: Union[List[Dict], np.ndarray], dates: Optional[Sequence] = None,
+                series: bool = True, periods_per_year: Optional[float] = None) -> Dict:
+        """
+        Args:
+            equity_curve: TradeManager equity curve; with one entry more than
+                there are dates, entry 0 is the starting capital and entry
+                i + 1 the equity after bar i
+            trades: TradeManager trade dicts (entry/exit date and price,
+                profit) or a BacktestResult trade log
+            dates: Bar dates; needed for exposure and daily performance
+            series: Also return drawdown_series, drawdown_pct_series and
+                daily_performance
+            periods_per_year: Bars per year used for annualizing; inferred
+                from the spacing of `dates` when omitted, PERIODS_PER_YEAR
+                without dates
+
+        Returns:
+            Dict: SCALAR_METRICS, plus the series when requested
+        """
+        index = pd.DatetimeIndex(dates) if dates is not None and len(dates) else None
+        if periods_per_year is None:
+            periods_per_year = PerformanceAnalyzer.periods_per_year(index)
+
+        equity = np.asarray(equity_curve, dtype=np.float64)
+        profits = _trade_field(trades, 'profit')
+        closed = ~np.isnan(profits)
+        closed_profits = profits[closed]
+
+        analysis = {
+            'total_trades': len(trades),
+            'winning_trades': int(np.count_nonzero(closed_profits > 0)),
+            'losing_trades': int(np.count_nonzero(closed_profits < 0)),
+            'total_profit': float(closed_profits.sum()),
+            'win_rate': float(np.count_nonzero(closed_profits > 0) / len(trades)) if len(trades) else 0.0,
+        }
+
+        if len(equity) < 2:
+            analysis.update(max_drawdown=0.0, sharpe_ratio=0.0, sortino_ratio=0.0,
+                            calmar_ratio=0.0, annual_return=0.0, exposure=0.0, turnover=0.0)
+            if series:
+                analysis.update(drawdown_series=[0.0] * len(equity), drawdown_pct_series=[0.0] * len(equity),
+                                daily_performance={})
+            return analysis
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = equity[1:] / equity[:-1] - 1.0
+            peak = np.maximum.accumulate(equity)
+            drawdown = equity - peak
+            drawdown_pct = equity / peak - 1.0
+
+        max_drawdown = float(np.nanmin(drawdown_pct))
+        annual_return = float((equity[-1] / equity[0]) ** (periods_per_year / len(returns)) - 1.0) \
+            if equity[0] > 0 and equity[-1] > 0 else 0.0
+        analysis.update(
+            max_drawdown=max_drawdown,
+            sharpe_ratio=PerformanceAnalyzer._sharpe(returns, periods_per_year),
+            sortino_ratio=PerformanceAnalyzer._sortino(returns, periods_per_year),
+            calmar_ratio=annual_return / -max_drawdown if max_drawdown < 0 else 0.0,
+            annual_return=annual_return,
+            turnover=PerformanceAnalyzer._turnover(trades, closed, equity),
+        )
+
+        positions = None
+        if index is not None:
+            positions = PerformanceAnalyzer._trade_positions(index, trades)
+            analysis['exposure'] = PerformanceAnalyzer._exposure(positions, len(index))
+        else:
+            analysis['exposure'] = 0.0
+
+        if series:
+            analysis['drawdown_series'] = drawdown.tolist()
+            analysis['drawdown_pct_series'] = drawdown_pct.tolist()
+            analysis['daily_performance'] = (
+                PerformanceAnalyzer.daily_performance(index, equity, profits, positions[1])
+                if positions is not None else {}
+            )
+        return analysis
+
+    @staticmethod
+    def periods_per_year(index: Optional[pd.DatetimeIndex]) -> float:
+        """
+        Bars per year implied by the bar spacing: PERIODS_PER_YEAR trading
+        days times the bars per session for daily or finer bars, calendar
+        time for coarser ones (weekly, monthly)
+        """
+        if index is None or len(index) < 2:
+            return PERIODS_PER_YEAR
+
+        days = index.normalize()
+        bars_per_day = len(index) / days.nunique()
+        if bars_per_day > 1:
+            return PERIODS_PER_YEAR * bars_per_day
+
+        gap_days = (days[1:] - days[:-1]).median() / pd.Timedelta(days=1)
+        if gap_days <= 1:
+            return PERIODS_PER_YEAR
+        return 365.25 / gap_days
+
+    @staticmethod
+    def daily_performance(index: pd.DatetimeIndex, equity: np.ndarray, profits: np.ndarray,
+                          exit_bars: np.ndarray) -> Dict[str, Dict]:
+        """
+        Per-day equity, return, P&L and trade counts, trades counted on the
+        day they closed.
+
+        Returns:
+            Dict: ISO date -> the fields metrics.daily_performance stores
+        """
+        n = len(index)
+        # Equity before and after each bar
+        if len(equity) == n + 1:
+            before, after = equity[:-1], equity[1:]
+        else:
+            after = equity[:n]
+            before = np.r_[after[:1], after[:-1]]
+
+        days = index.normalize() if index.tz is None else index.tz_localize(None).normalize()
+        day_codes, day_values = pd.factorize(days, sort=True)
+        # Bars are in time order, so each day is one contiguous run
+        first = np.flatnonzero(np.r_[True, day_codes[1:] != day_codes[:-1]])
+        last = np.r_[first[1:], n] - 1
+
+        starting = before[first]
+        ending = after[last]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            day_returns = np.where(starting != 0, ending / starting - 1.0, 0.0)
+
+        closed = (exit_bars >= 0) & ~np.isnan(profits)
+        exit_days = day_codes[exit_bars[closed]]
+        closed_profits = profits[closed]
+        n_days = len(day_values)
+        num_trades = np.bincount(exit_days, minlength=n_days)
+        winning = np.bincount(exit_days[closed_profits > 0], minlength=n_days)
+        losing = np.bincount(exit_days[closed_profits < 0], minlength=n_days)
+
+        return {
+            day: {
+                'starting_equity': start,
+                'ending_equity': end,
+                'returns': ret,
+                'profit_loss': end - start,
+                'num_trades': trades,
+                'winning_trades': wins,
+                'losing_trades': losses,
+            }
+            for day, start, end, ret, trades, wins, losses in zip(
+                day_values.strftime('%Y-%m-%d'), starting.tolist(), ending.tolist(), day_returns.tolist(),
+                num_trades.tolist(), winning.tolist(), losing.tolist()
+            )
+        }
+
+    @staticmethod
+    def _sharpe(returns: np.ndarray, periods_per_year: float) -> float:
+        returns = returns[~np.isnan(returns)]
+        if len(returns) < 2:
+            return 0.0
+        std = returns.std(ddof=1)
+        if not std > 0:
+            return 0.0
+        return float(returns.mean() / std * periods_per_year ** 0.5)
+
+    @staticmethod
+    def _sortino(returns: np.ndarray, periods_per_year: float) -> float:
+        """Mean return over the downside deviation (root mean square of the losses)"""
+        returns = returns[~np.isnan(returns)]
+        if not len(returns):
+            return 0.0
+        downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+        if not downside > 0:
+            return 0.0
+        return float(returns.mean() / downside * periods_per_year ** 0.5)
+
+    @staticmethod
+    def _turnover(trades, closed: np.ndarray, equity: np.ndarray) -> float:
+        """Traded notional of the one-unit trades over the average equity"""
+        if not len(trades):
+            return 0.0
+        entry_prices = _trade_field(trades, 'entry_price')
+        exit_prices = _trade_field(trades, 'exit_price')
+        notional = entry_prices.sum() + exit_prices[closed].sum()
+        average_equity = equity.mean()
+        return float(notional / average_equity) if average_equity > 0 else 0.0
+
+    @staticmethod
+    def _trade_positions(index: pd.DatetimeIndex, trades):
+        """Bar positions of each trade's entry and exit; -1 for trades still open"""
+        if isinstance(trades, np.ndarray):
+            return trades['entry_bar'], trades['exit_bar']
+        if len(trades) and all('entry_bar' in trade for trade in trades):
+            # Recorded by TradeManager; no lookup, and safe with duplicate timestamps
+            entries = np.array([trade['entry_bar'] for trade in trades], dtype=np.int64)
+            exits = np.array([trade['exit_bar'] if trade.get('exit_date') is not None else -1
+                              for trade in trades], dtype=np.int64)
+            return entries, exits
+        entries = index.get_indexer(pd.DatetimeIndex([trade['entry_date'] for trade in trades]))
+        exit_dates = [trade.get('exit_date') for trade in trades]
+        open_trade = np.array([date is None or pd.isna(date) for date in exit_dates], dtype=bool)
+        exits = np.full(len(trades), -1, dtype=np.int64)
+        if (~open_trade).any():
+            exits[~open_trade] = index.get_indexer(
+                pd.DatetimeIndex([date for date, is_open in zip(exit_dates, open_trade) if not is_open])
+            )
+        return entries, exits
+
+    @staticmethod
+    def _exposure(positions, n: int) -> float:
+        """Fraction of bar-to-bar intervals spent holding a position"""
+        entries, exits = positions
+        if n < 2 or not len(entries):
+            return 0.0
+        valid = entries >= 0
+        held = np.where(exits >= 0, exits, n - 1)[valid] - entries[valid]
+        return float(np.clip(held, 0, None).sum() / (n - 1))
+
+
+def _trade_field(trades, name: str) -> np.ndarray:
+    """One float64 field of a trade log or of trade dicts, NaN where missing"""
+    if isinstance(trades, np.ndarray):
+        return trades[name]
+    return np.array([trade.get(name) for trade in trades], dtype=np.float64)
@@ -1,39 +1,41 @@
 from config.config import TradingConfig
 from ..data.data_loader import DataLoader
+from ..data.market_data_cache import MarketDataCache
+from ..data.market_data_db import MarketDataDB
+from ..data.market_data_store import MarketDataStore
+from ..instrumentation import registry as instrumentation
 from ..signals.signal_generator import SignalGenerator
+from .analytics import PerformanceAnalyzer
+from .backtest_result import BacktestResult
 from ..trade_execution.trade_manager import TradeManager
-from typing import Dict, List
+from typing import Dict, Optional, Union
 import pandas as pd
 import numpy as np
 
 
 class Backtest:
-    def __init__(self, config: 'TradingConfig'):
+    def __init__(self, config: 'TradingConfig', cache: Optional[MarketDataCache] = None,
+                 store: Optional[MarketDataStore] = None, database: Optional[MarketDataDB] = None):
         self.config = config
         self.data_loader = DataLoader(
             config.symbol,
             config.start_date,
-            config.end_date
+            config.end_date,
+            cache=cache,
+            store=store,
+            interval=config.interval,
+            database=database
         )
         self.signal_generator = SignalGenerator(config)
         self.trade_manager = TradeManager(config)
-        self.results: Dict = {}
+        self.results: Union[BacktestResult, Dict] = {}
+        self.dates: Optional[pd.DatetimeIndex] = None
 
-    def _ensure_list(self, data, length):
-        """Helper method to ensure data is in list format"""
-        if isinstance(data, pd.Series):
-            return data.tolist()
-        elif isinstance(data, np.ndarray):
-            return data.tolist()
-        elif isinstance(data, list):
-            return data
-        else:
-            return [np.nan] * length
-
-    def run(self) -> Dict:
-        """Run backtest and return results"""
+    def run(self) -> BacktestResult:
+        """Run backtest and return its columnar results"""
         # Load data
-        data = self.data_loader.fetch_data()
+        with instrumentation.stage('fetch'):
+            data = self.data_loader.fetch_data()
 
         # Convert data to DataFrame if it's not already
         if isinstance(data, pd.DataFrame):
@@ -42,91 +44,39 @@ class Backtest:
             df = pd.DataFrame(data)
 
         # Generate signals
-        signals = self.signal_generator.generate_signals(df)
+        with instrumentation.stage('signals'):
+            signals = self.signal_generator.generate_signals(df)
+        instrumentation.count('bars_processed', len(df), symbol=self.config.symbol)
 
         # Execute trades
-        trade_results = self.trade_manager.execute_trades(df, signals)
-
-        # Store trade results
-        self.results = trade_results
-
-        # Get data length
-        data_length = len(df)
-
-        # Format results for reporting system
-        formatted_results = {
-            'dates': df.index.tolist() if isinstance(df.index, pd.DatetimeIndex)
-            else list(range(data_length)),
-            'prices': self._ensure_list(df['Close'] if 'Close' in df else df.iloc[:, 0], data_length),
-            'ema_short': self._ensure_list(df['EMA_short'] if 'EMA_short' in df else None, data_length),
-            'ema_long': self._ensure_list(df['EMA_long'] if 'EMA_long' in df else None, data_length),
-            'equity_curve': self.results.get('equity_curve', [self.config.initial_capital] * data_length),
-            'buy_dates': [],
-            'buy_prices': [],
-            'sell_dates': [],
-            'sell_prices': []
-        }
-
-        # Extract buy and sell points from trades
-        if 'trades' in self.results:
-            for trade in self.results['trades']:
-                if trade.get('type') in ['buy', 'long']:
-                    formatted_results['buy_dates'].append(trade.get('entry_time', 0))
-                    formatted_results['buy_prices'].append(trade.get('entry_price', 0))
-                if trade.get('type') in ['sell', 'short']:
-                    formatted_results['sell_dates'].append(trade.get('exit_time', 0))
-                    formatted_results['sell_prices'].append(trade.get('exit_price', 0))
-
-        return formatted_results
-
-    def analyze_results(self) -> Dict:
-        """Analyze backtest results"""
-        if not self.results or 'trades' not in self.results:
-            return {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'total_profit': 0.0,
-                'max_drawdown': 0.0,
-                'sharpe_ratio': 0.0
-            }
-
-        trades = self.results.get('trades', [])
-
-        analysis = {
-            'total_trades': len(trades),
-            'winning_trades': sum(1 for trade in trades
-                                  if trade.get('profit', 0) > 0),
-            'total_profit': sum(trade.get('profit', 0) for trade in trades),
-            'max_drawdown': self._calculate_max_drawdown(),
-            'sharpe_ratio': self._calculate_sharpe_ratio()
-        }
-
-        return analysis
-
-    def _calculate_max_drawdown(self) -> float:
-        """Calculate maximum drawdown from equity curve"""
-        if not self.results.get('equity_curve'):
-            return 0.0
-
-        try:
-            equity = pd.Series(self.results['equity_curve'])
-            rolling_max = equity.expanding().max()
-            drawdowns = equity / rolling_max - 1.0
-            return float(drawdowns.min())
-        except Exception as e:
-            print(f"Error calculating max drawdown: {e}")
-            return 0.0
-
-    def _calculate_sharpe_ratio(self) -> float:
-        """Calculate Sharpe ratio of returns"""
-        if not self.results.get('equity_curve'):
-            return 0.0
-
-        try:
-            returns = pd.Series(self.results['equity_curve']).pct_change()
-            if returns.std() == 0:
-                return 0.0
-            return float((returns.mean() / returns.std()) * (252 ** 0.5))  # Annualized
-        except Exception as e:
-            print(f"Error calculating Sharpe ratio: {e}")
-            return 0.0
\ No newline at end of file
+        with instrumentation.stage('trades'):
+            trade_results = self.trade_manager.execute_trades(df, signals)
+        instrumentation.count('trades_executed', len(trade_results['trades']), symbol=self.config.symbol)
+
+        # Store results; the columns are the only copy kept
+        self.results = BacktestResult.from_run(df, signals, trade_results)
+        if isinstance(df.index, pd.DatetimeIndex):
+            self.dates = df.index
+        return self.results
+
+    def analyze_results(self, series: bool = True) -> Dict:
+        """
+        Analyze backtest results.
+
+        Args:
+            series: Also return the drawdown series and daily performance
+                persisted by TradingDataPersistence; sweeps only need the
+                scalar metrics
+
+        Returns:
+            Dict: PerformanceAnalyzer metrics
+        """
+        trades = (self.results.trade_log if isinstance(self.results, BacktestResult)
+                  else self.results.get('trades', []))
+        with instrumentation.stage('analyze'):
+            return PerformanceAnalyzer.analyze(
+                self.results.get('equity_curve', []),
+                trades,
+                dates=self.dates,
+                series=series
+            )
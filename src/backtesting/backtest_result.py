@@ -0,0 +1,205 @@
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columnar trade log; open trades have exit_bar -1, exit_date NaT and NaN exit values
+TRADE_DTYPE = np.dtype([
+    ('entry_bar', np.int64),
+    ('exit_bar', np.int64),
+    ('entry_date', np.int64),
+    ('exit_date', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('profit', np.float64),
+])
+
+# Result key -> OHLCV column it is taken from
+PRICE_COLUMNS = {
+    'prices': 'Close',
+    'opens': 'Open',
+    'highs': 'High',
+    'lows': 'Low',
+    'volumes': 'Volume',
+}
+
+_NAT = np.iinfo(np.int64).min
+
+
+class BacktestResult(Mapping):
+    """
+    Columnar result of a backtest run.
+
+    Bars are held as NumPy arrays (dates as int64 nanoseconds since the epoch
+    in UTC, everything else float64) and trades as a TRADE_DTYPE structured
+    array, so no per-value Python objects exist for long histories.
+
+    The result is a read-only mapping with the keys of the former results
+    dict ('dates', 'prices', 'equity_curve', 'trades', 'buy_dates', ...).
+    Values are arrays or a DatetimeIndex, created on access; 'trades' is
+    materialized as TradeManager-style dicts the first time it is read.
+    to_dict, to_frame and trades_frame convert the whole result when a
+    consumer really needs lists or DataFrames.
+    """
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray], equity_curve: np.ndarray,
+                 trade_log: np.ndarray, tz: Optional[str] = None, datetime_index: bool = True):
+        """
+        Args:
+            dates: int64 bar dates (UTC nanoseconds, or positions without a DatetimeIndex)
+            columns: float64 bar columns keyed like the results dict
+                ('prices', 'opens', ..., 'ema_short', 'ema_long')
+            equity_curve: float64 equity, starting capital first
+            trade_log: TRADE_DTYPE trades
+            tz: Timezone of the bar dates
+            datetime_index: False when the bars had no dates
+        """
+        self.dates = dates
+        self.columns = columns
+        self.equity_curve = equity_curve
+        self.trade_log = trade_log
+        self.tz = tz
+        self.datetime_index = datetime_index
+        self._index: Optional[pd.DatetimeIndex] = None
+        self._trades: Optional[List[Dict]] = None
+
+    @classmethod
+    def from_run(cls, data: pd.DataFrame, signals: pd.DataFrame, trade_results: Dict) -> 'BacktestResult':
+        """
+        Build the result from Backtest.run inputs without copying more than
+        once per column.
+
+        Args:
+            data: OHLCV frame the backtest ran on
+            signals: SignalGenerator output (EMA_short/EMA_long)
+            trade_results: TradeManager.execute_trades output
+        """
+        datetime_index = isinstance(data.index, pd.DatetimeIndex)
+        if datetime_index:
+            index = data.index
+            tz = str(index.tz) if index.tz is not None else None
+            dates = index.as_unit('ns').asi8
+        else:
+            index = None
+            tz = None
+            dates = np.arange(len(data), dtype=np.int64)
+
+        columns = {
+            key: data[column].to_numpy(dtype=np.float64)
+            for key, column in PRICE_COLUMNS.items() if column in data
+        }
+        if 'prices' not in columns:
+            columns['prices'] = data.iloc[:, 0].to_numpy(dtype=np.float64)
+        for key, column in (('ema_short', 'EMA_short'), ('ema_long', 'EMA_long')):
+            if column in signals:
+                columns[key] = signals[column].to_numpy(dtype=np.float64)
+
+        trades = trade_results.get('trades', [])
+        trade_log = np.zeros(len(trades), dtype=TRADE_DTYPE)
+        if trades:
+            exit_dates = [trade.get('exit_date') for trade in trades]
+            trade_log['entry_price'] = [trade['entry_price'] for trade in trades]
+            trade_log['exit_price'] = [np.nan if trade.get('exit_price') is None else trade['exit_price']
+                                       for trade in trades]
+            trade_log['profit'] = [np.nan if trade.get('profit') is None else trade['profit']
+                                   for trade in trades]
+            # Bar positions recorded by TradeManager; -1 marks a trade still open
+            trade_log['entry_bar'] = [trade['entry_bar'] for trade in trades]
+            trade_log['exit_bar'] = [-1 if date is None else trade['exit_bar']
+                                     for trade, date in zip(trades, exit_dates)]
+            trade_log['entry_date'] = dates[trade_log['entry_bar']]
+            trade_log['exit_date'] = np.where(trade_log['exit_bar'] >= 0, dates[trade_log['exit_bar']], _NAT)
+
+        equity_curve = np.asarray(trade_results.get('equity_curve', []), dtype=np.float64)
+        result = cls(dates, columns, equity_curve, trade_log, tz=tz, datetime_index=datetime_index)
+        result._index = index
+        return result
+
+    @property
+    def index(self):
+        """Bar dates as a DatetimeIndex (positions without dates)"""
+        if not self.datetime_index:
+            return self.dates
+        if self._index is None:
+            index = pd.DatetimeIndex(self.dates.view('M8[ns]'))
+            self._index = index.tz_localize('UTC').tz_convert(self.tz) if self.tz else index
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __contains__(self, key) -> bool:
+        # Without materializing the value, unlike Mapping.__contains__
+        return key in self.keys()
+
+    def keys(self):
+        return ['dates', *self.columns, 'equity_curve', 'trades',
+                'buy_dates', 'buy_prices', 'sell_dates', 'sell_prices']
+
+    def __getitem__(self, key: str):
+        if key == 'dates':
+            return self.index
+        if key in self.columns:
+            return self.columns[key]
+        if key == 'equity_curve':
+            return self.equity_curve
+        if key == 'trades':
+            return self.trades()
+        if key == 'buy_dates':
+            return self._take_dates(self.trade_log['entry_bar'])
+        if key == 'buy_prices':
+            return self.trade_log['entry_price']
+        closed = self.trade_log[self.trade_log['exit_bar'] >= 0]
+        if key == 'sell_dates':
+            return self._take_dates(closed['exit_bar'])
+        if key == 'sell_prices':
+            return closed['exit_price']
+        raise KeyError(key)
+
+    def trades(self) -> List[Dict]:
+        """Trade log as TradeManager trade dicts, built once"""
+        if self._trades is None:
+            index = self.index
+            self._trades = [
+                {
+                    'entry_date': index[trade['entry_bar']],
+                    'entry_price': float(trade['entry_price']),
+                    'exit_date': index[trade['exit_bar']] if trade['exit_bar'] >= 0 else None,
+                    'exit_price': float(trade['exit_price']) if trade['exit_bar'] >= 0 else None,
+                    'profit': float(trade['profit']) if trade['exit_bar'] >= 0 else None,
+                    'entry_bar': int(trade['entry_bar']),
+                    'exit_bar': int(trade['exit_bar']),
+                }
+                for trade in self.trade_log
+            ]
+        return self._trades
+
+    def trades_frame(self) -> pd.DataFrame:
+        """Trade log as a DataFrame with dated entry/exit columns"""
+        frame = pd.DataFrame(self.trade_log)
+        for column, bars in (('entry_date', 'entry_bar'), ('exit_date', 'exit_bar')):
+            dates = self._take_dates(np.maximum(frame[bars].to_numpy(), 0))
+            frame[column] = pd.Series(dates, index=frame.index).where(frame[bars].to_numpy() >= 0)
+        return frame
+
+    def to_frame(self) -> pd.DataFrame:
+        """Bars as a DataFrame, with the equity after each bar"""
+        frame = pd.DataFrame(self.columns, index=self.index, copy=False)
+        n = len(self.dates)
+        if len(self.equity_curve) == n + 1:
+            frame['equity'] = self.equity_curve[1:]
+        return frame
+
+    def to_dict(self) -> Dict:
+        """The former list-based results dict"""
+        return {
+            key: value.tolist() if isinstance(value, (np.ndarray, pd.Index)) else value
+            for key, value in self.items()
+        }
+
+    def _take_dates(self, bars: np.ndarray):
+        return self.index[bars]
@@ -0,0 +1,232 @@
+import dataclasses
+import itertools
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from .backtest import Backtest
+from ..data.data_loader import DataLoader
+from ..data.market_data_cache import MarketDataCache
+from ..data.market_data_store import MarketDataStore
+from ..signals.cpr import CPRCalculator
+from ..signals.ema import EMACalculator
+from ..signals.pivot_ranges import PivotCalculator
+from ..signals.signal_generator import (
+    SIGNAL_CHUNK_BARS, SignalGenerator, previous_bar, rolling_volume_mean, session_levels
+)
+from ..trade_execution.trade_manager import TradeManager
+
+logger = logging.getLogger(__name__)
+
+SWEEP_FIELDS = ('ema_short', 'ema_long', 'volume_threshold', 'stop_loss', 'take_profit', 'pivot_threshold')
+# Fields that change the entry signal; stop_loss/take_profit only affect execution
+SIGNAL_FIELDS = ('ema_short', 'ema_long', 'volume_threshold', 'pivot_threshold')
+
+# Inputs shared by every combination, installed once per worker process
+_shared: Dict = {}
+
+
+def _init_worker(shared: Dict):
+    _shared.clear()
+    _shared.update(shared)
+
+
+def _evaluate(tasks: List[Tuple[Dict, int]]) -> List[Dict]:
+    """Execute trades and analyze results for (params, signal column) pairs"""
+    prices = _shared['prices']
+    # Exposure and daily performance need the bar dates
+    dates = prices.index if isinstance(prices.index, pd.DatetimeIndex) else None
+    rows = []
+    for params, column in tasks:
+        config = dataclasses.replace(_shared['base_config'], **params)
+        signals = pd.DataFrame({'signal': _shared['signals'][:, column]}, index=prices.index, copy=False)
+
+        backtest = Backtest(config)
+        backtest.results = TradeManager(config).execute_trades(prices, signals)
+        backtest.dates = dates
+        rows.append({**params, **backtest.analyze_results(series=False)})
+    return rows
+
+
+class ParameterSweep:
+    """
+    Grid or random search over TradingConfig fields.
+
+    Data is loaded once, each distinct EMA period and the CPR/pivot levels are
+    computed once, and the entry signals of every distinct signal-affecting
+    parameter set are evaluated together as a 2-D (bars x parameter sets)
+    boolean array. Trade execution and analysis then run per combination
+    across a process pool.
+    """
+
+    def __init__(self, base_config: TradingConfig, grid: Dict[str, Sequence],
+                 metric: str = 'total_profit', ascending: bool = False,
+                 max_workers: Optional[int] = None, data: Optional[pd.DataFrame] = None,
+                 cache: Optional[MarketDataCache] = None, store: Optional[MarketDataStore] = None):
+        """
+        Args:
+            base_config: Config supplying every field not swept
+            grid: Candidate values per field, keys from SWEEP_FIELDS
+            metric: analyze_results key used to rank combinations
+            ascending: Rank lowest metric first (e.g. for max_drawdown magnitude)
+            max_workers: Worker processes (None uses the CPU count, 1 runs inline)
+            data: Pre-loaded OHLCV frame; fetched through DataLoader when omitted
+            cache: Optional MarketDataCache used when fetching
+            store: Optional MarketDataStore used when fetching
+        """
+        unknown = set(grid) - set(SWEEP_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot sweep fields: {sorted(unknown)}")
+
+        self.base_config = base_config
+        self.grid = {field: list(values) for field, values in grid.items()}
+        self.metric = metric
+        self.ascending = ascending
+        self.max_workers = max_workers
+        self.data = data
+        self.cache = cache
+        self.store = store
+
+    def combinations(self, n_iter: Optional[int] = None, seed: Optional[int] = None) -> List[Dict]:
+        """
+        Parameter sets to evaluate: the full grid, or `n_iter` of them sampled
+        without replacement for a random search
+        """
+        fields = list(self.grid)
+        sizes = [len(values) for values in self.grid.values()]
+        total = math.prod(sizes)
+        if n_iter is None or n_iter >= total:
+            return [dict(zip(fields, values)) for values in itertools.product(*self.grid.values())]
+        if not n_iter:
+            return []
+
+        # Decode sampled positions in the flattened grid, never building all of it
+        flat = np.random.default_rng(seed).choice(total, size=n_iter, replace=False)
+        positions = np.unravel_index(flat, sizes)
+        return [
+            {field: self.grid[field][int(i)] for field, i in zip(fields, choice)}
+            for choice in zip(*positions)
+        ]
+
+    def run(self, n_iter: Optional[int] = None, seed: Optional[int] = None) -> pd.DataFrame:
+        """Evaluate the sweep and return one row per combination ranked by the metric"""
+        start = time.perf_counter()
+        data = self._load_data()
+        combos = self.combinations(n_iter, seed)
+        if not combos:
+            return pd.DataFrame(columns=list(self.grid))
+
+        signal_keys = sorted({self._signal_key(params) for params in combos})
+        key_column = {key: i for i, key in enumerate(signal_keys)}
+        shared = {
+            'base_config': self.base_config,
+            'prices': data[['Close']],
+            'signals': self._signal_matrix(data, signal_keys, self.base_config.intraday),
+        }
+        tasks = [(params, key_column[self._signal_key(params)]) for params in combos]
+        logger.info(
+            f"Sweeping {len(combos)} combinations over {len(data)} bars "
+            f"({len(signal_keys)} distinct signal sets)"
+        )
+
+        if self.max_workers == 1:
+            _init_worker(shared)
+            rows = _evaluate(tasks)
+        else:
+            workers = self.max_workers or os.cpu_count() or 1
+            chunk = max(1, math.ceil(len(tasks) / (workers * 4)))
+            chunks = [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared,)) as executor:
+                rows = [row for rows in executor.map(_evaluate, chunks) for row in rows]
+
+        results = pd.DataFrame(rows)
+        if len(results):
+            results = results.sort_values(self.metric, ascending=self.ascending, kind='stable')
+        logger.info(f"Sweep finished in {time.perf_counter() - start:.2f}s")
+        return results.reset_index(drop=True)
+
+    def _load_data(self) -> pd.DataFrame:
+        if self.data is None:
+            self.data = DataLoader(
+                self.base_config.symbol,
+                self.base_config.start_date,
+                self.base_config.end_date,
+                cache=self.cache,
+                store=self.store,
+                interval=self.base_config.interval
+            ).fetch_data()
+        return self.data
+
+    def _signal_key(self, params: Dict) -> Tuple:
+        return tuple(params.get(field, getattr(self.base_config, field)) for field in SIGNAL_FIELDS)
+
+    @staticmethod
+    def _signal_matrix(data: pd.DataFrame, signal_keys: List[Tuple], intraday: bool = False,
+                       chunk_cells: int = SIGNAL_CHUNK_BARS) -> np.ndarray:
+        """
+        Entry signals for every signal key as a (bars x keys) boolean array.
+        Applies the same conditions as SignalGenerator.generate_signals.
+
+        Args:
+            data: OHLCV frame
+            signal_keys: SIGNAL_FIELDS values per output column
+            intraday: Use previous-session instead of previous-bar levels
+            chunk_cells: Bound on bars x keys combined per block, limiting
+                the temporaries to about that many booleans
+        """
+        price = data['Close'].to_numpy(dtype=np.float64)
+        if intraday:
+            session_of_bar, *previous_session = session_levels(
+                data.index,
+                data['High'].to_numpy(dtype=np.float64),
+                data['Low'].to_numpy(dtype=np.float64),
+                price
+            )
+            high, low, close = (levels[session_of_bar] for levels in previous_session)
+        else:
+            high = previous_bar(data['High'].to_numpy(dtype=np.float64))
+            low = previous_bar(data['Low'].to_numpy(dtype=np.float64))
+            close = previous_bar(price)
+        volume = data['Volume'].to_numpy()
+        avg_volume = rolling_volume_mean(volume)
+
+        cpr = CPRCalculator.calculate_batch(high, low, close)
+        pivot_levels = PivotCalculator.calculate_batch(high, low, close)
+        above_tc = CPRCalculator.is_price_above_tc_batch(price, cpr)
+
+        periods = sorted({period for key in signal_keys for period in key[:2]})
+        emas = {period: EMACalculator.calculate(data['Close'], period).to_numpy() for period in periods}
+
+        pairs = sorted({key[:2] for key in signal_keys})
+        volume_thresholds = sorted({key[2] for key in signal_keys})
+        pivot_thresholds = sorted({key[3] for key in signal_keys})
+
+        # One column per distinct value of each component
+        ema_ok = np.column_stack([emas[short] > emas[long] for short, long in pairs])
+        with np.errstate(invalid='ignore'):
+            volume_ok = volume[:, None] > (avg_volume[:, None] * np.asarray(volume_thresholds)[None, :])
+        pivot_ok = np.column_stack([
+            above_tc & SignalGenerator.pivot_mask(price, pivot_levels, threshold)
+            for threshold in pivot_thresholds
+        ])
+
+        pair_idx = [pairs.index(key[:2]) for key in signal_keys]
+        volume_idx = [volume_thresholds.index(key[2]) for key in signal_keys]
+        pivot_idx = [pivot_thresholds.index(key[3]) for key in signal_keys]
+
+        # Column-major so each parameter set's signal column is contiguous
+        signals = np.empty((len(data), len(signal_keys)), dtype=bool, order='F')
+        step = max(1, chunk_cells // max(1, len(data)))
+        for start in range(0, len(signal_keys), step):
+            block = slice(start, start + step)
+            np.logical_and(ema_ok[:, pair_idx[block]], volume_ok[:, volume_idx[block]], out=signals[:, block])
+            signals[:, block] &= pivot_ok[:, pivot_idx[block]]
+        return signals
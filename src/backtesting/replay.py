@@ -0,0 +1,249 @@
+"""
+Bar-replay market simulator.
+
+Historical frames are replayed as asyncio events in timestamp order across
+all symbols, in real time, N times faster, or as fast as possible. Each
+symbol has a consumer task that turns bars into signals and simulated
+orders, and the engine measures the latency from a bar's arrival to its
+signal and to its order, plus the sustained throughput.
+
+Usage:
+    stats = ReplayEngine.from_loader(config, ['AAPL', 'MSFT'], speed=60).run()
+    print(stats.as_dict())
+"""
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from ..data.data_loader import DataLoader
+from ..data.market_data_cache import MarketDataCache
+from ..data.market_data_db import MarketDataDB
+from ..data.market_data_store import MarketDataStore
+from ..signals.streaming import StreamingSignalEngine
+from ..trade_execution.trade_manager import TradeManager
+
+logger = logging.getLogger(__name__)
+
+LATENCY_PERCENTILES = (50, 90, 99, 99.9)
+
+_BAR_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class StrategyConsumer:
+    """Default per-symbol consumer: streaming signals feeding a TradeManager"""
+
+    def __init__(self, config: TradingConfig):
+        self.signal_engine = StreamingSignalEngine(config)
+        self.trade_manager = TradeManager(config)
+
+    def signal(self, date: pd.Timestamp, bar: Dict) -> int:
+        return self.signal_engine.update(bar, date)
+
+    def order(self, date: pd.Timestamp, bar: Dict, signal: int) -> Optional[Dict]:
+        return self.trade_manager.process_bar(date, bar['Close'], signal)
+
+
+@dataclass
+class ReplayStats:
+    """Latency and throughput of a replay"""
+    symbols: int = 0
+    bars: int = 0
+    signals: int = 0
+    orders: int = 0
+    wall_seconds: float = 0.0
+    # Bar arrival to signal and to simulated order, in nanoseconds
+    signal_latency_ns: List[int] = field(default_factory=list, repr=False)
+    order_latency_ns: List[int] = field(default_factory=list, repr=False)
+    max_queue_depth: int = 0
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            'symbols': self.symbols,
+            'bars': self.bars,
+            'signals': self.signals,
+            'orders': self.orders,
+            'wall_seconds': self.wall_seconds,
+            'bars_per_second': self.bars_per_second,
+            'max_queue_depth': self.max_queue_depth,
+            'signal_latency_us': _percentiles(self.signal_latency_ns),
+            'order_latency_us': _percentiles(self.order_latency_ns),
+        }
+
+
+class ReplayEngine:
+    """
+    Replay OHLCV frames of several symbols through per-symbol consumers.
+
+    A single feed task walks the merged timeline of all frames and puts
+    each bar on its symbol's bounded queue, stamping its arrival time. When
+    a speed is set, the feed sleeps so that bar timestamps advance `speed`
+    times faster than the wall clock. As fast as possible, the queues bound
+    how far the feed runs ahead, so the measured latency includes the time
+    a bar waits behind the ones before it.
+    """
+
+    def __init__(self, config: TradingConfig, frames: Dict[str, pd.DataFrame], speed: Optional[float] = None,
+                 max_gap: Optional[float] = 60.0, queue_size: int = 256,
+                 consumer_factory: Optional[Callable[[str], object]] = None):
+        """
+        Args:
+            config: Strategy configuration shared by every symbol
+            frames: symbol -> DataFrame with a DatetimeIndex and OHLCV columns
+            speed: Market seconds replayed per wall second (1.0 is real
+                time); None replays as fast as possible
+            max_gap: Longest pause, in market seconds, between consecutive
+                bars when paced, so nights and weekends are skipped (None
+                keeps every gap)
+            queue_size: Bars buffered per symbol before the feed waits
+            consumer_factory: symbol -> consumer with signal(date, bar) and
+                order(date, bar, signal); StrategyConsumer by default
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for as fast as possible")
+        self.config = config
+        self.frames = frames
+        self.speed = speed
+        self.max_gap = max_gap
+        self.queue_size = queue_size
+        self.consumer_factory = consumer_factory or (lambda symbol: StrategyConsumer(config))
+        self.consumers: Dict[str, object] = {}
+        self.stats = ReplayStats()
+
+    @classmethod
+    def from_loader(cls, config: TradingConfig, symbols: Sequence[str],
+                    cache: Optional[MarketDataCache] = None, store: Optional[MarketDataStore] = None,
+                    database: Optional[MarketDataDB] = None, **kwargs) -> 'ReplayEngine':
+        """Engine over the config's date range of each symbol, fetched through DataLoader"""
+        frames = {
+            symbol: DataLoader(
+                symbol,
+                config.start_date,
+                config.end_date,
+                cache=cache,
+                store=store,
+                interval=config.interval,
+                database=database
+            ).fetch_data()
+            for symbol in symbols
+        }
+        return cls(config, frames, **kwargs)
+
+    def run(self) -> ReplayStats:
+        """Replay every frame to completion on a new event loop"""
+        return asyncio.run(self.replay())
+
+    async def replay(self) -> ReplayStats:
+        """Replay every frame to completion on the running event loop"""
+        self.stats = ReplayStats(symbols=len(self.frames))
+        symbols = list(self.frames)
+        self.consumers = {symbol: self.consumer_factory(symbol) for symbol in symbols}
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in symbols]
+        columns = [self._columns(self.frames[symbol]) for symbol in symbols]
+
+        start = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._consume(self.consumers[symbol], self.frames[symbol].index.tolist(), bars, queue))
+            for symbol, bars, queue in zip(symbols, columns, queues)
+        ]
+        tasks.append(asyncio.create_task(self._feed(queues)))
+        try:
+            # A failing consumer fails the replay instead of stalling the feed
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        self.stats.wall_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"Replayed {self.stats.bars} bars of {len(symbols)} symbols in {self.stats.wall_seconds:.2f}s "
+            f"({self.stats.bars_per_second:,.0f} bars/s)"
+        )
+        return self.stats
+
+    async def _feed(self, queues: List[asyncio.Queue]):
+        """Put (row, arrival) on the symbols' queues in timestamp order, then None"""
+        timeline = self._timeline()
+        clock_start = time.perf_counter()
+        market_elapsed = 0.0
+        previous = None
+        for timestamp, symbol_id, row in timeline:
+            if self.speed is not None:
+                if previous is not None:
+                    gap = (timestamp - previous) / 1e9
+                    market_elapsed += min(gap, self.max_gap) if self.max_gap is not None else gap
+                previous = timestamp
+                delay = clock_start + market_elapsed / self.speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            queue = queues[symbol_id]
+            await queue.put((row, time.perf_counter_ns()))
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, queue.qsize())
+
+        for queue in queues:
+            await queue.put(None)
+
+    def _timeline(self):
+        """(timestamp ns, symbol id, row) of every bar, merged across symbols in time order"""
+        streams = [
+            zip(_epoch_ns(frame.index).tolist(), [symbol_id] * len(frame), range(len(frame)))
+            for symbol_id, frame in enumerate(self.frames.values())
+        ]
+        return heapq.merge(*streams)
+
+    async def _consume(self, consumer, dates: List[pd.Timestamp], bars: List[Dict], queue: asyncio.Queue):
+        stats = self.stats
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            row, arrival = item
+            date, bar = dates[row], bars[row]
+
+            signal = consumer.signal(date, bar)
+            signalled = time.perf_counter_ns()
+            order = consumer.order(date, bar, signal)
+            decided = time.perf_counter_ns()
+
+            stats.bars += 1
+            stats.signal_latency_ns.append(signalled - arrival)
+            if signal:
+                stats.signals += 1
+            if order is not None:
+                stats.orders += 1
+                stats.order_latency_ns.append(decided - arrival)
+
+    @staticmethod
+    def _columns(frame: pd.DataFrame) -> List[Dict]:
+        """Bars of a frame as dicts, built before the replay starts so the feed stays cheap"""
+        present = [name for name in _BAR_FIELDS if name in frame]
+        values = zip(*(frame[name].tolist() for name in present))
+        return [dict(zip(present, row)) for row in values]
+
+
+def _epoch_ns(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC')
+    return index.as_unit('ns').asi8
+
+
+def _percentiles(latencies_ns: List[int]) -> Dict[str, float]:
+    """Latency percentiles and max, in microseconds"""
+    if not latencies_ns:
+        return {}
+    values = np.asarray(latencies_ns, dtype=np.float64) / 1e3
+    summary = {f"p{p:g}": float(v) for p, v in zip(LATENCY_PERCENTILES, np.percentile(values, LATENCY_PERCENTILES))}
+    summary['max'] = float(values.max())
+    return summary
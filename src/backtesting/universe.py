@@ -0,0 +1,96 @@
+import dataclasses
+import logging
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from config.config import TradingConfig
+from .analytics import SCALAR_METRICS
+from .backtest import Backtest
+from ..data.market_data_cache import MarketDataCache
+from ..data.market_data_store import MarketDataStore
+
+logger = logging.getLogger(__name__)
+
+METRIC_COLUMNS = SCALAR_METRICS
+
+
+def run_symbol(config: TradingConfig, cache_dir: Optional[str] = None,
+               store_dir: Optional[str] = None) -> Dict:
+    """
+    Run one symbol's backtest and analysis, never raising.
+
+    Returns:
+        Dict: symbol, status ('ok' or 'error'), wall_time, the analyze_results
+        metrics and the error message when the run failed
+    """
+    start = time.perf_counter()
+    row = {'symbol': config.symbol, 'status': 'ok', 'error': None}
+    try:
+        backtest = Backtest(
+            config,
+            cache=MarketDataCache(cache_dir) if cache_dir else None,
+            store=MarketDataStore(store_dir) if store_dir else None
+        )
+        backtest.run()
+        row.update(backtest.analyze_results(series=False))
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = f"{type(e).__name__}: {e}"
+        logger.debug(traceback.format_exc())
+    row['wall_time'] = time.perf_counter() - start
+    return row
+
+
+class UniverseRunner:
+    """Run the same strategy over many symbols in a process pool"""
+
+    def __init__(self, base_config: TradingConfig, symbols: List[str],
+                 max_workers: Optional[int] = None, chunksize: int = 8,
+                 cache_dir: Optional[str] = None, store_dir: Optional[str] = None):
+        """
+        Args:
+            base_config: Strategy parameters shared by every symbol
+            symbols: Symbols to backtest
+            max_workers: Worker processes (None uses the CPU count, 1 runs inline)
+            chunksize: Symbols handed to a worker at a time
+            cache_dir: Optional MarketDataCache directory used by each worker
+            store_dir: Optional MarketDataStore directory used by each worker
+        """
+        self.base_config = base_config
+        self.symbols = symbols
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.cache_dir = cache_dir
+        self.store_dir = store_dir
+
+    def run(self) -> pd.DataFrame:
+        """Backtest every symbol and return one row per symbol"""
+        configs = [dataclasses.replace(self.base_config, symbol=symbol) for symbol in self.symbols]
+        cache_dirs = [self.cache_dir] * len(configs)
+        store_dirs = [self.store_dir] * len(configs)
+
+        start = time.perf_counter()
+        if self.max_workers == 1:
+            rows = list(map(run_symbol, configs, cache_dirs, store_dirs))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                rows = list(executor.map(run_symbol, configs, cache_dirs, store_dirs,
+                                         chunksize=self.chunksize))
+        elapsed = time.perf_counter() - start
+
+        results = pd.DataFrame(rows, columns=['symbol', 'status', 'wall_time'] + METRIC_COLUMNS + ['error'])
+        failed = results[results['status'] == 'error']
+        logger.info(
+            f"Universe run finished: {len(results) - len(failed)} ok, {len(failed)} failed "
+            f"in {elapsed:.1f}s"
+        )
+        for _, row in failed.iterrows():
+            logger.warning(f"{row['symbol']} failed: {row['error']}")
+        for _, row in results.nlargest(5, 'wall_time').iterrows():
+            logger.info(f"Slowest: {row['symbol']} took {row['wall_time']:.2f}s")
+
+        return results
@@ -0,0 +1,251 @@
+import dataclasses
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config.config import TradingConfig
+from .backtest import Backtest
+from .parameter_sweep import ParameterSweep, SWEEP_FIELDS
+from ..data.data_loader import DataLoader
+from ..data.market_data_cache import MarketDataCache
+from ..data.market_data_store import MarketDataStore
+from ..signals.signal_generator import SignalGenerator
+from ..trade_execution.trade_manager import TradeManager
+
+logger = logging.getLogger(__name__)
+
+# (train_start, test_start, test_end) bar positions; train ends where test starts
+Window = Tuple[int, int, int]
+
+# Full history shared by every window, installed once per worker process
+_shared: Dict = {}
+
+
+def _init_worker(shared: Dict):
+    _shared.clear()
+    _shared.update(shared)
+
+
+def _run_window(window: Window) -> Dict:
+    """Optimize on the training slice, then trade the following test slice"""
+    train_start, test_start, test_end = window
+    data = _shared['data']
+    base_config = _shared['base_config']
+
+    start = time.perf_counter()
+    sweep = ParameterSweep(
+        base_config,
+        _shared['grid'],
+        metric=_shared['metric'],
+        ascending=_shared['ascending'],
+        max_workers=1,
+        data=data.iloc[train_start:test_start]
+    )
+    ranked = sweep.run(n_iter=_shared['n_iter'], seed=_shared['seed'])
+    best = {field: ranked.iloc[0][field] for field in sweep.grid}
+    for field in ('ema_short', 'ema_long'):
+        if field in best:
+            best[field] = int(best[field])
+    train_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    config = dataclasses.replace(base_config, **best)
+    test_data = data.iloc[test_start:test_end]
+    # The training slice warms up the EMAs, volume mean and prior-bar/session
+    # levels, so the test bars see the same signals as a full-history run
+    signals = SignalGenerator(config).generate_signals(data.iloc[train_start:test_end])
+    signals = signals.iloc[test_start - train_start:]
+    trade_results = TradeManager(config).execute_trades(test_data, signals)
+    backtest = Backtest(config)
+    backtest.results = trade_results
+    backtest.dates = test_data.index if isinstance(test_data.index, pd.DatetimeIndex) else None
+    analysis = backtest.analyze_results(series=False)
+    test_time = time.perf_counter() - start
+
+    return {
+        'window': window,
+        'params': best,
+        'train_metric': ranked.iloc[0][_shared['metric']],
+        'analysis': analysis,
+        'trades': trade_results['trades'],
+        'equity_curve': trade_results['equity_curve'],
+        'train_time': train_time,
+        'test_time': test_time,
+    }
+
+
+@dataclass
+class WalkForwardResult:
+    """Per-window summary plus stitched out-of-sample results for TradingReport"""
+    windows: pd.DataFrame
+    results: Dict
+    analysis: Dict
+
+
+class WalkForwardOptimizer:
+    """
+    Rolling in-sample/out-of-sample optimization on top of ParameterSweep.
+
+    The history is loaded once and every window works on slices of that
+    frame. Windows are independent and run concurrently in a process pool.
+    """
+
+    def __init__(self, base_config: TradingConfig, grid: Dict[str, Sequence],
+                 train_bars: int, test_bars: int, step_bars: Optional[int] = None,
+                 metric: str = 'total_profit', ascending: bool = False,
+                 n_iter: Optional[int] = None, seed: Optional[int] = None,
+                 max_workers: Optional[int] = None, data: Optional[pd.DataFrame] = None,
+                 cache: Optional[MarketDataCache] = None, store: Optional[MarketDataStore] = None):
+        """
+        Args:
+            base_config: Config supplying every field not optimized
+            grid: Candidate values per field, keys from SWEEP_FIELDS
+            train_bars: Bars in each in-sample slice
+            test_bars: Bars in each out-of-sample slice
+            step_bars: Bars between window starts (defaults to test_bars, must
+                not be smaller so test slices never overlap)
+            metric: analyze_results key optimized on the training slice
+            ascending: Prefer the lowest metric value
+            n_iter: Random-search size per window (full grid when None)
+            seed: Seed for the random search
+            max_workers: Worker processes (None uses the CPU count, 1 runs inline)
+            data: Pre-loaded OHLCV frame; fetched through DataLoader when omitted
+            cache: Optional MarketDataCache used when fetching
+            store: Optional MarketDataStore used when fetching
+        """
+        unknown = set(grid) - set(SWEEP_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot optimize fields: {sorted(unknown)}")
+        if step_bars is not None and step_bars < test_bars:
+            raise ValueError("step_bars must be at least test_bars so test slices do not overlap")
+
+        self.base_config = base_config
+        self.grid = grid
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.step_bars = step_bars or test_bars
+        self.metric = metric
+        self.ascending = ascending
+        self.n_iter = n_iter
+        self.seed = seed
+        self.max_workers = max_workers
+        self.data = data
+        self.cache = cache
+        self.store = store
+
+    def windows(self, n_bars: int) -> List[Window]:
+        """Window boundaries covering a history of n_bars"""
+        windows = []
+        start = 0
+        while start + self.train_bars + self.test_bars <= n_bars:
+            test_start = start + self.train_bars
+            windows.append((start, test_start, test_start + self.test_bars))
+            start += self.step_bars
+        return windows
+
+    def run(self) -> WalkForwardResult:
+        """Run every window and stitch the out-of-sample results together"""
+        if self.data is None:
+            self.data = DataLoader(
+                self.base_config.symbol,
+                self.base_config.start_date,
+                self.base_config.end_date,
+                cache=self.cache,
+                store=self.store,
+                interval=self.base_config.interval
+            ).fetch_data()
+
+        windows = self.windows(len(self.data))
+        if not windows:
+            raise ValueError(
+                f"{len(self.data)} bars are too few for {self.train_bars} training "
+                f"and {self.test_bars} test bars"
+            )
+
+        shared = {
+            'data': self.data,
+            'base_config': self.base_config,
+            'grid': self.grid,
+            'metric': self.metric,
+            'ascending': self.ascending,
+            'n_iter': self.n_iter,
+            'seed': self.seed,
+        }
+        start = time.perf_counter()
+        if self.max_workers == 1:
+            _init_worker(shared)
+            outcomes = [_run_window(window) for window in windows]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(shared,)) as executor:
+                outcomes = list(executor.map(_run_window, windows))
+        logger.info(f"Walk-forward over {len(windows)} windows took {time.perf_counter() - start:.2f}s")
+
+        results = self._stitch(outcomes)
+        return WalkForwardResult(
+            windows=self._summarize(outcomes),
+            results=results,
+            analysis=self._analyze(results)
+        )
+
+    def _summarize(self, outcomes: List[Dict]) -> pd.DataFrame:
+        index = self.data.index
+        rows = []
+        for outcome in outcomes:
+            train_start, test_start, test_end = outcome['window']
+            rows.append({
+                'train_start': index[train_start],
+                'test_start': index[test_start],
+                'test_end': index[test_end - 1],
+                **outcome['params'],
+                f"train_{self.metric}": outcome['train_metric'],
+                **{f"test_{key}": value for key, value in outcome['analysis'].items()},
+                'train_time': outcome['train_time'],
+                'test_time': outcome['test_time'],
+            })
+        return pd.DataFrame(rows)
+
+    def _stitch(self, outcomes: List[Dict]) -> Dict:
+        """
+        Chain the test slices into one results dict shaped like Backtest.run,
+        carrying each window's equity forward from the previous window's end
+        """
+        initial_capital = self.base_config.initial_capital
+        equity_curve = [initial_capital]
+        trades = []
+        positions = []
+        for outcome in outcomes:
+            _, test_start, test_end = outcome['window']
+            # Bar positions of the window's trades move to the stitched bars
+            bar_offset = len(positions)
+            trades.extend(
+                dict(trade, entry_bar=trade['entry_bar'] + bar_offset, exit_bar=trade['exit_bar'] + bar_offset)
+                for trade in outcome['trades']
+            )
+            positions.extend(range(test_start, test_end))
+            offset = equity_curve[-1] - initial_capital
+            equity_curve.extend(value + offset for value in outcome['equity_curve'][1:])
+
+        test_data = self.data.iloc[positions]
+        return {
+            'dates': test_data.index.tolist(),
+            'prices': test_data['Close'].tolist(),
+            'equity_curve': equity_curve,
+            'trades': trades,
+            'buy_dates': [trade['entry_date'] for trade in trades],
+            'buy_prices': [trade['entry_price'] for trade in trades],
+            'sell_dates': [trade['exit_date'] for trade in trades],
+            'sell_prices': [trade['exit_price'] for trade in trades],
+        }
+
+    def _analyze(self, stitched: Dict) -> Dict:
+        """analyze_results over the stitched out-of-sample trades and equity"""
+        backtest = Backtest(self.base_config)
+        backtest.results = {'trades': stitched['trades'], 'equity_curve': stitched['equity_curve']}
+        if isinstance(self.data.index, pd.DatetimeIndex):
+            backtest.dates = pd.DatetimeIndex(stitched['dates'])
+        return backtest.analyze_results()
@@ -2,21 +2,59 @@ import yfinance as yf
 import pandas as pd
 from typing import Optional
 
+from .market_data_cache import MarketDataCache
+from .market_data_db import MarketDataDB
+from .market_data_store import MarketDataStore
+
+
 class DataLoader:
-    def __init__(self, symbol: str, start_date: str, end_date: str):
+    def __init__(self, symbol: str, start_date: str, end_date: str,
+                 cache: Optional[MarketDataCache] = None,
+                 store: Optional[MarketDataStore] = None,
+                 interval: str = '1d',
+                 database: Optional[MarketDataDB] = None):
         self.symbol = symbol
         self.start_date = start_date
         self.end_date = end_date
+        self.interval = interval
+        self.cache = cache
+        self.store = store
+        self.database = database
         self.data: Optional[pd.DataFrame] = None
 
     def fetch_data(self) -> pd.DataFrame:
+        """
+        Fetch historical data from the memory-mapped store or the database
+        when one is configured, otherwise from Yahoo Finance through the
+        optional cache
+        """
+        if self.store is not None:
+            self.data = self.store.read_frame(self.storage_key, self.start_date, self.end_date)
+        elif self.database is not None:
+            self.data = self.database.read_frame(self.symbol, self.start_date, self.end_date, self.interval)
+        elif self.cache is not None:
+            self.data = self.cache.get(
+                self.storage_key,
+                self.start_date,
+                self.end_date,
+                self._fetch_upstream
+            )
+        else:
+            self.data = self._fetch_upstream(self.start_date, self.end_date)
+        return self.data
+
+    @property
+    def storage_key(self) -> str:
+        """Name used in the local cache and store, distinct per bar interval"""
+        return self.symbol if self.interval == '1d' else f"{self.symbol}@{self.interval}"
+
+    def _fetch_upstream(self, start_date: str, end_date: str) -> pd.DataFrame:
         """Fetch historical data from Yahoo Finance"""
         ticker = yf.Ticker(self.symbol)
-        self.data = ticker.history(start=self.start_date, end=self.end_date)
-        return self.data
+        return ticker.history(start=start_date, end=end_date, interval=self.interval)
 
     def get_latest_data(self) -> pd.DataFrame:
         """Get the most recent data point"""
         if self.data is None:
             self.fetch_data()
-        return self.data.iloc[-1]
\ No newline at end of file
+        return self.data.iloc[-1]
@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# (start, end) with end exclusive, matching yfinance's history() convention
+DateRange = Tuple[pd.Timestamp, pd.Timestamp]
+Fetcher = Callable[[str, str], pd.DataFrame]
+# Archive member holding the JSON manifest
+MANIFEST_KEY = '__manifest__'
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how much upstream I/O the cache avoided"""
+    requests: int = 0
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    upstream_fetches: int = 0
+    rows_from_disk: int = 0
+    rows_fetched: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class MarketDataCache:
+    """
+    Columnar on-disk OHLCV cache, one NumPy archive per symbol.
+
+    Each archive embeds a small JSON manifest listing the date ranges already
+    downloaded, so data and manifest are replaced together and always agree.
+    Requests are served from disk and only the spans not covered by the
+    manifest are fetched from the upstream source.
+    """
+
+    def __init__(self, cache_dir: str, offline: bool = False):
+        """
+        Args:
+            cache_dir: Directory holding the per-symbol files
+            offline: Serve purely from disk and never call the upstream source
+        """
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.stats = CacheStats()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, symbol: str, start_date: str, end_date: str, fetcher: Fetcher) -> pd.DataFrame:
+        """
+        Return OHLCV data for [start_date, end_date), fetching only missing spans.
+
+        Args:
+            symbol: Ticker symbol
+            start_date: Inclusive start date
+            end_date: Exclusive end date
+            fetcher: Callable taking (start, end) date strings and returning
+                the upstream frame for that span
+        """
+        self.stats.requests += 1
+        requested = (pd.Timestamp(start_date), pd.Timestamp(end_date))
+
+        data, covered = self._load(symbol)
+        missing = _subtract(requested, covered)
+
+        if not missing:
+            self.stats.hits += 1
+        elif len(missing) == 1 and missing[0] == requested:
+            self.stats.misses += 1
+        else:
+            self.stats.partial_hits += 1
+
+        if missing and self.offline:
+            logger.warning(
+                f"Offline cache for {symbol} is missing "
+                f"{', '.join(f'{s.date()}..{e.date()}' for s, e in missing)}"
+            )
+        elif missing:
+            frames = [data] if data is not None else []
+            fetched_ranges = []
+            for span_start, span_end in missing:
+                fetched = fetcher(span_start.strftime('%Y-%m-%d'), span_end.strftime('%Y-%m-%d'))
+                self.stats.upstream_fetches += 1
+                self.stats.rows_fetched += len(fetched)
+                # An empty answer may be an upstream failure, so it covers nothing
+                if len(fetched):
+                    frames.append(fetched)
+                    fetched_ranges.append((span_start, span_end))
+
+            if frames:
+                data = pd.concat(frames)
+                data = data[~data.index.duplicated(keep='last')].sort_index()
+
+            # Never mark today or future days as covered, they may still change
+            today = pd.Timestamp.today().normalize()
+            fetched_ranges = [(s, min(e, today)) for s, e in fetched_ranges if min(e, today) > s]
+            covered = _merge(covered + fetched_ranges)
+            if data is not None:
+                self._save(symbol, data, covered)
+
+        if data is None:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+
+        result = data[_mask_between(data.index, *requested)]
+        self.stats.rows_from_disk += len(result)
+        return result
+
+    def covered_ranges(self, symbol: str) -> List[DateRange]:
+        """Date ranges of `symbol` already present on disk"""
+        manifest = self._read_manifest(symbol)
+        return _manifest_ranges(manifest) if manifest else []
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, symbol.replace('/', '_')) + '.npz'
+
+    def _read_manifest(self, symbol: str) -> Optional[Dict]:
+        """The manifest embedded in the symbol's archive, read without loading its columns"""
+        data_path = self._path(symbol)
+        if not os.path.exists(data_path):
+            return None
+        with np.load(data_path) as archive:
+            return _archive_manifest(archive)
+
+    def _load(self, symbol: str) -> Tuple[Optional[pd.DataFrame], List[DateRange]]:
+        """Load the cached frame and its covered ranges"""
+        data_path = self._path(symbol)
+        if not os.path.exists(data_path):
+            return None, []
+
+        with np.load(data_path) as archive:
+            manifest = _archive_manifest(archive)
+            if manifest is None:
+                return None, []
+            index = pd.DatetimeIndex(archive['index'].view('datetime64[ns]')).as_unit(manifest['unit'])
+            if manifest['tz']:
+                index = index.tz_localize('UTC').tz_convert(manifest['tz'])
+            data = pd.DataFrame(
+                {column: archive[column] for column in manifest['columns']},
+                index=index
+            )
+        data.index.name = manifest.get('index_name')
+        self.stats.bytes_read += os.path.getsize(data_path)
+
+        return data, _manifest_ranges(manifest)
+
+    def _save(self, symbol: str, data: pd.DataFrame, covered: List[DateRange]):
+        """Atomically replace the symbol's archive, data and manifest in one file"""
+        data_path = self._path(symbol)
+        tz = str(data.index.tz) if getattr(data.index, 'tz', None) is not None else None
+        index = data.index.tz_convert('UTC').tz_localize(None) if tz else data.index
+        columns = [c for c in data.columns if pd.api.types.is_numeric_dtype(data[c])]
+
+        manifest = {
+            'symbol': symbol,
+            'tz': tz,
+            'index_name': data.index.name,
+            'unit': data.index.unit,
+            'columns': columns,
+            'ranges': [[s.strftime('%Y-%m-%d'), e.strftime('%Y-%m-%d')] for s, e in covered]
+        }
+        arrays = {column: data[column].to_numpy() for column in columns}
+        _replace_atomically(data_path, lambda f: np.savez(
+            f,
+            index=index.to_numpy(dtype='datetime64[ns]').view(np.int64),
+            **{MANIFEST_KEY: np.array(json.dumps(manifest))},
+            **arrays
+        ))
+        self.stats.bytes_written += os.path.getsize(data_path)
+
+
+def _archive_manifest(archive) -> Optional[Dict]:
+    """Manifest of an open archive; None for archives written without one"""
+    if MANIFEST_KEY not in archive.files:
+        return None
+    return json.loads(str(archive[MANIFEST_KEY]))
+
+
+def _replace_atomically(path: str, write: Callable):
+    """
+    Write through a uniquely named temporary file in path's directory, then
+    rename it over path, so concurrent writers never share a temp file
+    """
+    with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(path) or '.',
+                                     prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                     delete=False) as f:
+        tmp_path = f.name
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    os.replace(tmp_path, path)
+
+
+def _manifest_ranges(manifest: Dict) -> List[DateRange]:
+    return [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in manifest['ranges']]
+
+
+def _merge(ranges: List[DateRange]) -> List[DateRange]:
+    """Merge overlapping or touching ranges"""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract(requested: DateRange, covered: List[DateRange]) -> List[DateRange]:
+    """Parts of the requested range not contained in the covered ranges"""
+    missing = []
+    cursor, end = requested
+    for covered_start, covered_end in covered:
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+def _mask_between(index: pd.DatetimeIndex, start: pd.Timestamp, end: pd.Timestamp) -> np.ndarray:
+    """Select bars whose local calendar date falls in [start, end)"""
+    local = index.tz_localize(None) if index.tz is not None else index
+    return (local >= start) & (local < end)
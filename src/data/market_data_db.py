@@ -0,0 +1,181 @@
+import io
+import logging
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# Bytes of COPY output buffered before a chunk is parsed into arrays
+COPY_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Column order of the COPY output: symbol ordinal, epoch microseconds, OHLCV
+_FIELDS = ['symbol', 'timestamp', 'Open', 'High', 'Low', 'Close', 'Volume']
+_DTYPES = {
+    'symbol': np.int32,
+    'timestamp': np.int64,
+    'Open': np.float64,
+    'High': np.float64,
+    'Low': np.float64,
+    'Close': np.float64,
+    'Volume': np.float64,
+}
+
+
+class _ColumnSink:
+    """
+    File-like target for COPY TO STDOUT that parses the CSV stream in
+    fixed-size chunks straight into NumPy column arrays
+    """
+
+    def __init__(self, chunk_bytes: int):
+        self.chunk_bytes = chunk_bytes
+        self.pending = bytearray()
+        self.parts: Dict[str, List[np.ndarray]] = {field: [] for field in _FIELDS}
+        self.bytes_read = 0
+
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode()
+        self.pending += data
+        self.bytes_read += len(data)
+        if len(self.pending) >= self.chunk_bytes:
+            self._parse(final=False)
+        return len(data)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Parse what is left and return the concatenated columns"""
+        self._parse(final=True)
+        return {
+            field: np.concatenate(parts) if parts else np.empty(0, dtype=_DTYPES[field])
+            for field, parts in self.parts.items()
+        }
+
+    def _parse(self, final: bool):
+        # Only complete lines are parsed; a trailing partial row waits for more data
+        cut = len(self.pending) if final else self.pending.rfind(b'\n') + 1
+        if cut <= 0:
+            return
+        block = bytes(self.pending[:cut])
+        del self.pending[:cut]
+
+        frame = pd.read_csv(io.BytesIO(block), header=None, names=_FIELDS, dtype=_DTYPES, engine='c')
+        for field in _FIELDS:
+            self.parts[field].append(frame[field].to_numpy())
+
+
+class MarketDataDB:
+    """
+    Read OHLCV history back from trading.market_data.
+
+    Ranges are streamed with COPY (SELECT ...) TO STDOUT and parsed in
+    chunks of COPY_CHUNK_BYTES into NumPy arrays, so no Python row tuples are
+    built. The timestamp bounds are inlined as constants so the planner
+    prunes partitions outside the range.
+    """
+
+    def __init__(self, db_config: Optional[Dict[str, str]] = None, conn=None,
+                 chunk_bytes: int = COPY_CHUNK_BYTES, tz: Optional[str] = None):
+        """
+        Args:
+            db_config: psycopg2.connect keyword arguments, used when conn is None
+            conn: Existing connection to read through
+            chunk_bytes: COPY output buffered per parsed chunk
+            tz: Timezone the stored wall-clock timestamps are localized to
+        """
+        if conn is None and db_config is None:
+            raise ValueError("MarketDataDB needs db_config or conn")
+        self.db_config = db_config
+        self.conn = conn
+        self.owns_conn = conn is None
+        self.chunk_bytes = chunk_bytes
+        self.tz = tz
+
+    def connect(self):
+        if self.conn is None:
+            self.conn = psycopg2.connect(**self.db_config)
+
+    def read_frame(self, symbol: str, start: Optional[str] = None, end: Optional[str] = None,
+                   interval: str = '1d') -> pd.DataFrame:
+        """Bars of one symbol in [start, end) as a DataFrame shaped like DataLoader output"""
+        return self.read_frames([symbol], start, end, interval)[symbol]
+
+    def read_frames(self, symbols: Sequence[str], start: Optional[str] = None,
+                    end: Optional[str] = None, interval: str = '1d') -> Dict[str, pd.DataFrame]:
+        """
+        Bars of several symbols in [start, end), fetched with one query.
+
+        Rows written before open/high/low were stored fall back to the close.
+
+        Args:
+            symbols: Symbols to read
+            start: Inclusive start
+            end: Exclusive end
+            interval: Bar interval the rows were stored with, e.g. '1d', '5m'
+
+        Returns:
+            Dict: symbol -> DataFrame (empty for symbols without data)
+        """
+        self.connect()
+        symbols = list(symbols)
+        conditions = ["symbol = ANY(%(symbols)s)", "interval = %(interval)s"]
+        params = {'symbols': symbols, 'interval': interval}
+        if start is not None:
+            conditions.append("timestamp >= %(start)s")
+            params['start'] = pd.Timestamp(start).to_pydatetime()
+        if end is not None:
+            conditions.append("timestamp < %(end)s")
+            params['end'] = pd.Timestamp(end).to_pydatetime()
+
+        sink = _ColumnSink(self.chunk_bytes)
+        begin = time.perf_counter()
+        with self.conn.cursor() as cur:
+            query = cur.mogrify(f"""
+                SELECT array_position(%(symbols)s::text[], symbol::text) - 1,
+                       (EXTRACT(EPOCH FROM timestamp) * 1000000)::bigint,
+                       COALESCE(open, price), COALESCE(high, price), COALESCE(low, price),
+                       price, volume
+                FROM trading.market_data
+                WHERE {' AND '.join(conditions)}
+                ORDER BY 1, 2
+                """, params).decode()
+            cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", sink)
+        if self.owns_conn:
+            # Leave no idle transaction open between reads
+            self.conn.rollback()
+
+        columns = sink.columns()
+        logger.info(
+            f"Read {len(columns['timestamp'])} {interval} bars for {len(symbols)} symbols "
+            f"({sink.bytes_read} bytes) in {time.perf_counter() - begin:.2f}s"
+        )
+        return self._split(symbols, columns)
+
+    def _split(self, symbols: List[str], columns: Dict[str, np.ndarray]) -> Dict[str, pd.DataFrame]:
+        """Cut the symbol-ordered columns into one frame per symbol"""
+        bounds = np.searchsorted(columns['symbol'], np.arange(len(symbols) + 1))
+        frames = {}
+        for ordinal, symbol in enumerate(symbols):
+            rows = slice(bounds[ordinal], bounds[ordinal + 1])
+            index = pd.DatetimeIndex(columns['timestamp'][rows].astype('datetime64[us]'), name='Date')
+            if self.tz is not None:
+                index = index.tz_localize(self.tz)
+            frames[symbol] = pd.DataFrame(
+                {field: columns[field][rows] for field in _FIELDS[2:]},
+                index=index
+            )
+        return frames
+
+    def close(self):
+        if self.conn is not None and self.owns_conn:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
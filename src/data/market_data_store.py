@@ -0,0 +1,213 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Fixed-width on-disk record; timestamps are UTC nanoseconds
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+# One date index entry per this many records
+INDEX_STRIDE = 4096
+
+
+class MarketDataStore:
+    """
+    Append-only binary OHLCV store read through numpy.memmap.
+
+    Every symbol has a file of fixed-width records sorted by timestamp, a
+    sparse date index holding the timestamp of every INDEX_STRIDE-th record
+    and a small JSON header. Range reads binary-search the index, then the
+    timestamp column inside one block, and return a view of the mapped file,
+    so worker processes share the OS page cache instead of private copies.
+    """
+
+    def __init__(self, root_dir: str, index_stride: int = INDEX_STRIDE):
+        self.root_dir = root_dir
+        self.index_stride = index_stride
+        os.makedirs(root_dir, exist_ok=True)
+
+    def symbols(self) -> List[str]:
+        """Symbols present in the store"""
+        return sorted(f[:-4] for f in os.listdir(self.root_dir) if f.endswith('.bin'))
+
+    def __len__(self) -> int:
+        return len(self.symbols())
+
+    def count(self, symbol: str) -> int:
+        """Number of records stored for `symbol`"""
+        data_path, _, _ = self._paths(symbol)
+        if not os.path.exists(data_path):
+            return 0
+        return os.path.getsize(data_path) // RECORD_DTYPE.itemsize
+
+    def append(self, symbol: str, data: pd.DataFrame) -> int:
+        """
+        Append OHLCV rows to the symbol's file.
+
+        Rows at or before the last stored timestamp are skipped so re-ingesting
+        an overlapping frame is harmless.
+
+        Args:
+            symbol: Ticker symbol
+            data: Frame with a DatetimeIndex and Open/High/Low/Close/Volume columns
+
+        Returns:
+            int: Number of records appended
+        """
+        data_path, index_path, header_path = self._paths(symbol)
+        header = self._read_header(symbol)
+        tz = str(data.index.tz) if data.index.tz is not None else None
+        if header is None:
+            header = {'symbol': symbol, 'tz': tz}
+            with open(header_path, 'w') as f:
+                json.dump(header, f)
+        elif header['tz'] != tz:
+            raise ValueError(f"Timezone {tz} does not match stored timezone {header['tz']} for {symbol}")
+
+        records = _to_records(data)
+        if not np.all(np.diff(records['timestamp']) > 0):
+            raise ValueError(f"Rows for {symbol} must have unique, increasing timestamps")
+
+        existing = self.count(symbol)
+        if existing:
+            last = self._memmap(symbol)[-1]['timestamp']
+            records = records[records['timestamp'] > last]
+        if not len(records):
+            return 0
+
+        # Drop what an interrupted append left behind: a torn trailing record
+        # and index entries beyond, or short of, the whole records
+        first_block = -(-existing // self.index_stride)
+        _truncate(data_path, existing * RECORD_DTYPE.itemsize)
+        if existing:
+            self._date_index(symbol, existing)
+        _truncate(index_path, first_block * np.dtype('<i8').itemsize)
+
+        with open(data_path, 'ab') as f:
+            records.tofile(f)
+
+        # Extend the sparse index with the records that start a new block
+        positions = np.arange(first_block * self.index_stride, existing + len(records), self.index_stride)
+        with open(index_path, 'ab') as f:
+            records['timestamp'][positions - existing].astype('<i8').tofile(f)
+
+        logger.info(f"Appended {len(records)} records for {symbol}")
+        return len(records)
+
+    def ingest(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+        """Bulk append several symbols' frames"""
+        return {symbol: self.append(symbol, frame) for symbol, frame in frames.items()}
+
+    def read(self, symbol: str, start: Optional[pd.Timestamp] = None,
+             end: Optional[pd.Timestamp] = None) -> np.ndarray:
+        """
+        Zero-copy view of the records with start <= timestamp < end.
+
+        Args:
+            symbol: Ticker symbol
+            start: Inclusive start, naive values are read in the symbol's timezone
+            end: Exclusive end
+        """
+        records = self._memmap(symbol)
+        if records is None:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        tz = self._read_header(symbol)['tz']
+        lo = 0 if start is None else self._search(symbol, records, _to_utc_ns(start, tz))
+        hi = len(records) if end is None else self._search(symbol, records, _to_utc_ns(end, tz))
+        return records[lo:hi]
+
+    def read_frame(self, symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Records in [start, end) as a DataFrame shaped like DataLoader output.
+        The range lookup is zero-copy; building the frame copies the selected
+        columns, so use read() when the arrays alone are enough.
+        """
+        records = self.read(
+            symbol,
+            None if start is None else pd.Timestamp(start),
+            None if end is None else pd.Timestamp(end)
+        )
+        header = self._read_header(symbol)
+        index = pd.DatetimeIndex(records['timestamp'].view('datetime64[ns]'), name='Date')
+        if header and header['tz']:
+            index = index.tz_localize('UTC').tz_convert(header['tz'])
+
+        return pd.DataFrame(
+            {column: records[field] for field, column in COLUMNS.items()},
+            index=index
+        )
+
+    def _paths(self, symbol: str) -> Tuple[str, str, str]:
+        base = os.path.join(self.root_dir, symbol.replace('/', '_'))
+        return f"{base}.bin", f"{base}.idx", f"{base}.json"
+
+    def _read_header(self, symbol: str) -> Optional[Dict]:
+        _, _, header_path = self._paths(symbol)
+        if not os.path.exists(header_path):
+            return None
+        with open(header_path) as f:
+            return json.load(f)
+
+    def _memmap(self, symbol: str) -> Optional[np.ndarray]:
+        count = self.count(symbol)
+        if not count:
+            return None
+        data_path, _, _ = self._paths(symbol)
+        return np.memmap(data_path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def _date_index(self, symbol: str, count: int) -> np.ndarray:
+        """Sparse index, rebuilt if an interrupted append left it short"""
+        _, index_path, _ = self._paths(symbol)
+        expected = -(-count // self.index_stride)
+        index = np.fromfile(index_path, dtype='<i8') if os.path.exists(index_path) else np.empty(0, '<i8')
+        if len(index) < expected:
+            records = self._memmap(symbol)
+            index = np.array(records['timestamp'][::self.index_stride])
+            index.tofile(index_path)
+        return index[:expected]
+
+    def _search(self, symbol: str, records: np.ndarray, timestamp: int) -> int:
+        """Position of the first record with a timestamp >= `timestamp`"""
+        index = self._date_index(symbol, len(records))
+        block = max(int(np.searchsorted(index, timestamp, side='right')) - 1, 0)
+        lo = block * self.index_stride
+        hi = min(lo + self.index_stride, len(records))
+        return lo + int(np.searchsorted(records['timestamp'][lo:hi], timestamp))
+
+
+def _to_records(data: pd.DataFrame) -> np.ndarray:
+    """Convert an OHLCV frame into the on-disk record layout"""
+    index = data.index.tz_convert('UTC').tz_localize(None) if data.index.tz is not None else data.index
+    records = np.empty(len(data), dtype=RECORD_DTYPE)
+    records['timestamp'] = index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    for field, column in COLUMNS.items():
+        records[field] = data[column].to_numpy(dtype=np.float64)
+    return records
+
+
+def _truncate(path: str, size: int):
+    """Cut the file at `path` down to `size` bytes if it is longer"""
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        logger.warning(f"Truncating {path} to {size} bytes left by an interrupted append")
+        os.truncate(path, size)
+
+
+def _to_utc_ns(timestamp: pd.Timestamp, tz: Optional[str]) -> int:
+    if timestamp.tzinfo is None and tz:
+        timestamp = timestamp.tz_localize(tz)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return int(np.datetime64(timestamp, 'ns').view(np.int64))
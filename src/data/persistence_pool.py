@@ -0,0 +1,250 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+from psycopg2.pool import ThreadedConnectionPool
+
+from .trading_data_persistence import TradingDataPersistence
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_SQL = 'SELECT 1'
+
+# Seconds an idle writer thread waits for a job before checking for shutdown
+_IDLE_POLL_SECONDS = 0.1
+
+
+class PersistencePool:
+    """
+    Thread-safe pool of database connections for TradingDataPersistence.
+
+    Connections are health-checked when borrowed; broken ones are discarded
+    and replaced.
+    """
+
+    def __init__(self, db_config: Dict[str, str], minconn: int = 1, maxconn: int = 4,
+                 health_check: bool = True, bulk_load: bool = True):
+        """
+        Args:
+            db_config: psycopg2.connect keyword arguments
+            minconn: Connections opened up front and kept open
+            maxconn: Upper bound on concurrently borrowed connections
+            health_check: Run HEALTH_CHECK_SQL on every borrowed connection
+            bulk_load: Passed to the TradingDataPersistence instances handed out
+        """
+        self.db_config = db_config
+        self.health_check = health_check
+        self.bulk_load = bulk_load
+        self.maxconn = maxconn
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **db_config)
+        # getconn raises instead of waiting when the pool is exhausted
+        self._available = threading.BoundedSemaphore(maxconn)
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """Borrow a healthy connection, waiting for one when all are in use"""
+        self._available.acquire()
+        try:
+            conn = self._healthy_connection()
+            try:
+                yield conn
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                self._pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            self._available.release()
+
+    @contextmanager
+    def persistence(self) -> Iterator[TradingDataPersistence]:
+        """TradingDataPersistence bound to a pooled connection"""
+        with self.connection() as conn:
+            yield TradingDataPersistence(self.db_config, bulk_load=self.bulk_load, conn=conn)
+
+    def _healthy_connection(self):
+        # One retry per pool slot covers every idle connection having gone stale
+        for _ in range(self.maxconn + 1):
+            conn = self._pool.getconn()
+            if not self.health_check or self._is_healthy(conn):
+                return conn
+            logger.warning("Discarding unhealthy database connection")
+            self._pool.putconn(conn, close=True)
+        raise ConnectionError("No healthy database connection available")
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cur:
+                cur.execute(HEALTH_CHECK_SQL)
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        """Close every pooled connection"""
+        self._pool.closeall()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+@dataclass
+class WriterStats:
+    """Throughput, backpressure and per-table latency of an AsyncPersistenceWriter"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    # Submissions that found the queue full and had to wait
+    blocked_submits: int = 0
+    blocked_seconds: float = 0.0
+    max_queue_depth: int = 0
+    persist_seconds: float = 0.0
+    table_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict:
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'blocked_submits': self.blocked_submits,
+            'blocked_seconds': self.blocked_seconds,
+            'max_queue_depth': self.max_queue_depth,
+            'persist_seconds': self.persist_seconds,
+            'table_seconds': dict(self.table_seconds),
+        }
+
+
+class AsyncPersistenceWriter:
+    """
+    Persist backtest results on background threads.
+
+    submit() enqueues a (config, results, analysis) job into a bounded queue
+    and returns a Future resolving to the strategy_id. When the queue is full,
+    submit() blocks, slowing producers down to the rate the database absorbs.
+    """
+
+    def __init__(self, pool: PersistencePool, workers: int = 2, max_queue: int = 16):
+        """
+        Args:
+            pool: Connection pool the writer threads borrow from
+            workers: Writer threads (at most the pool's maxconn are useful)
+            max_queue: Jobs buffered before submit() blocks
+        """
+        self.pool = pool
+        self.stats = WriterStats()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        # Held while checking _closed and queueing, so no job lands after shutdown
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        # Set by shutdown(); writer threads exit once the queue is empty
+        self._stopping = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"persistence-writer-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, config, results: Dict, analysis: Dict) -> Future:
+        """Queue one backtest for persistence; blocks while the queue is full"""
+        future: Future = Future()
+        job = (future, config, results, analysis)
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("Writer has been shut down")
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                # Writer threads keep draining the queue, so waiting here
+                # while holding the lock only holds back shutdown and other
+                # submits, which would block as well
+                start = time.perf_counter()
+                self._queue.put(job)
+                with self._lock:
+                    self.stats.blocked_submits += 1
+                    self.stats.blocked_seconds += time.perf_counter() - start
+
+            with self._lock:
+                self.stats.submitted += 1
+                self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._queue.qsize())
+        return future
+
+    def drain(self):
+        """Wait until every queued job has been persisted or has failed"""
+        self._queue.join()
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting jobs and stop the writer threads once every queued
+        job has been persisted.
+
+        Args:
+            wait: Block until that has happened; otherwise return at once
+                and let the threads finish in the background
+        """
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stopping.set()
+        if wait:
+            self.drain()
+            for thread in self._threads:
+                thread.join()
+        logger.info(f"Persistence writer stopped: {self.stats.as_dict()}")
+
+    def _work(self):
+        while True:
+            try:
+                job = self._queue.get(timeout=_IDLE_POLL_SECONDS)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+            try:
+                self._persist(*job)
+            finally:
+                self._queue.task_done()
+
+    def _persist(self, future: Future, config, results: Dict, analysis: Dict):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        start = time.perf_counter()
+        try:
+            with self.pool.persistence() as db:
+                strategy_id = db.persist_all_data(config, results, analysis)
+                table_latency = db.table_latency
+        except Exception as e:
+            with self._lock:
+                self.stats.failed += 1
+            logger.error(f"Persisting {config.symbol} failed: {e}")
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self.stats.completed += 1
+            self.stats.persist_seconds += time.perf_counter() - start
+            for table, seconds in table_latency.items():
+                self.stats.table_seconds[table] = self.stats.table_seconds.get(table, 0.0) + seconds
+        future.set_result(strategy_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown(wait=True)
@@ -0,0 +1,279 @@
+"""
+Local write-ahead spool for TradingDataPersistence.
+
+Each persisted run becomes one immutable .npz segment: numeric and datetime
+columns are stored as arrays, everything else (config, trades, scalar
+metrics) as JSON. Segments are written to a temporary name and renamed into
+place, so a crash never leaves a partial segment behind.
+
+Usage:
+    python -m src.data.persistence_spool inspect --spool-dir ../spool
+    python -m src.data.persistence_spool drain --spool-dir ../spool [--dbname ...]
+"""
+import argparse
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = '.npz'
+
+
+class PersistenceSpool:
+    """Append-only directory of spooled runs, replayed into the database in order"""
+
+    def __init__(self, spool_dir: str):
+        """
+        Args:
+            spool_dir: Directory holding the segments; created if missing
+        """
+        self.spool_dir = spool_dir
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def append(self, config: TradingConfig, results: Dict, analysis: Dict) -> str:
+        """
+        Durably write one run and return its segment id.
+
+        Segment ids sort in arrival order and are unique across processes.
+        """
+        segment_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:12]}"
+        arrays: Dict[str, np.ndarray] = {}
+        meta = {
+            'segment_id': segment_id,
+            'config': dataclasses.asdict(config),
+            'results': _encode_section('results', results, arrays),
+            'analysis': _encode_section('analysis', analysis, arrays),
+        }
+        arrays['meta'] = np.array(json.dumps(meta, default=_json_default))
+
+        tmp_path = os.path.join(self.spool_dir, f".{segment_id}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(segment_id))
+        return segment_id
+
+    def segments(self) -> List[str]:
+        """Ids of the pending segments, oldest first"""
+        return sorted(
+            name[:-len(SEGMENT_SUFFIX)] for name in os.listdir(self.spool_dir)
+            if name.endswith(SEGMENT_SUFFIX) and not name.startswith('.')
+        )
+
+    def load(self, segment_id: str) -> Tuple[TradingConfig, Dict, Dict]:
+        """Read a segment back into (config, results, analysis)"""
+        with np.load(self._path(segment_id), allow_pickle=False) as segment:
+            meta = json.loads(str(segment['meta']), object_hook=_json_object_hook)
+            arrays = {key: segment[key] for key in segment.files if key != 'meta'}
+        return (
+            TradingConfig.from_dict(meta['config']),
+            _decode_section(meta['results'], arrays),
+            _decode_section(meta['analysis'], arrays),
+        )
+
+    def describe(self) -> pd.DataFrame:
+        """One row per pending segment: id, symbol, bars, trades and size on disk"""
+        rows = []
+        for segment_id in self.segments():
+            config, results, _ = self.load(segment_id)
+            rows.append({
+                'segment_id': segment_id,
+                'symbol': config.symbol,
+                'bars': len(results.get('dates', [])),
+                'trades': len(results.get('trades', [])),
+                'bytes': os.path.getsize(self._path(segment_id)),
+            })
+        return pd.DataFrame(rows, columns=['segment_id', 'symbol', 'bars', 'trades', 'bytes'])
+
+    def replay(self, db, limit: Optional[int] = None) -> int:
+        """
+        Apply pending segments to the database through `db`, oldest first.
+
+        Each segment is written in one transaction together with its row in
+        trading.spool_applied, and deleted only after that commit. A segment
+        left behind by a crash after the commit is recognised by its marker
+        and skipped, so replay is idempotent and resumes where it stopped.
+
+        Args:
+            db: Connected TradingDataPersistence
+            limit: Maximum number of segments to replay
+
+        Returns:
+            int: Number of segments applied by this call
+        """
+        applied = 0
+        for segment_id in self.segments()[:limit]:
+            config, results, analysis = self.load(segment_id)
+            with db.transaction():
+                with db.conn.cursor() as cur:
+                    cur.execute("""
+                        INSERT INTO trading.spool_applied (segment_id, symbol)
+                        VALUES (%s, %s)
+                        ON CONFLICT (segment_id) DO NOTHING;
+                        """, (segment_id, config.symbol))
+                    is_new = cur.rowcount == 1
+                if is_new:
+                    strategy_id = db.write_all_data(config, results, analysis)
+                    with db.conn.cursor() as cur:
+                        cur.execute("""
+                            UPDATE trading.spool_applied SET strategy_id = %s
+                            WHERE segment_id = %s;
+                            """, (strategy_id, segment_id))
+
+            os.remove(self._path(segment_id))
+            if is_new:
+                applied += 1
+                logger.info(f"Replayed spool segment {segment_id} as strategy {strategy_id}")
+            else:
+                logger.info(f"Spool segment {segment_id} was already applied, removed")
+        return applied
+
+    def _path(self, segment_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{segment_id}{SEGMENT_SUFFIX}")
+
+
+class SpoolReplayer:
+    """Background thread replaying a spool periodically, riding out database outages"""
+
+    def __init__(self, db, interval: float = 30.0):
+        """
+        Args:
+            db: TradingDataPersistence created with a spool_dir
+            interval: Seconds between replay attempts
+        """
+        self.db = db
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='spool-replayer', daemon=True)
+
+    def start(self) -> 'SpoolReplayer':
+        self._thread.start()
+        return self
+
+    def stop(self, drain: bool = True):
+        """Stop the thread, optionally making one final replay pass"""
+        self._stop.set()
+        self._thread.join()
+        if drain:
+            self.db.replay_spool()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.db.replay_spool()
+            except Exception as e:
+                # Dropped connections are reopened on the next attempt
+                logger.warning(f"Spool replay failed, retrying in {self.interval}s: {e}")
+                if self.db.conn is not None and self.db.conn.closed:
+                    self.db.conn = None
+
+
+def _encode_section(prefix: str, section: Dict, arrays: Dict[str, np.ndarray]) -> Dict:
+    """
+    Move numeric and datetime sequences of a results/analysis dict into
+    `arrays`, returning the JSON-serializable remainder with references
+    """
+    encoded = {}
+    for key, value in section.items():
+        array_key = f"{prefix}/{key}"
+        if isinstance(value, (list, tuple, np.ndarray, pd.Series, pd.Index)):
+            values = np.asarray(value)
+            if not len(values) and values.dtype.kind not in 'biufM':
+                # Empty sequences (e.g. the dates of a run without trades) carry
+                # no usable dtype and are stored as zero-length arrays
+                values = np.empty(0, dtype=np.float64)
+            if values.dtype.kind in 'biuf':
+                arrays[array_key] = values
+                encoded[key] = {'__array__': array_key}
+                continue
+            if values.dtype.kind == 'M' or all(isinstance(v, (pd.Timestamp, datetime)) for v in value):
+                dates = pd.DatetimeIndex(pd.to_datetime(value))
+                tz = str(dates.tz) if dates.tz is not None else None
+                naive = dates.tz_convert('UTC').tz_localize(None) if tz else dates
+                arrays[array_key] = naive.as_unit('ns').asi8
+                encoded[key] = {'__dates__': array_key, 'tz': tz}
+                continue
+        encoded[key] = value
+    return encoded
+
+
+def _decode_section(encoded: Dict, arrays: Dict[str, np.ndarray]) -> Dict:
+    section = {}
+    for key, value in encoded.items():
+        if isinstance(value, dict) and '__array__' in value:
+            section[key] = arrays[value['__array__']].tolist()
+        elif isinstance(value, dict) and '__dates__' in value:
+            dates = pd.to_datetime(arrays[value['__dates__']], unit='ns', utc=value['tz'] is not None)
+            if value['tz'] is not None:
+                dates = dates.tz_convert(value['tz'])
+            section[key] = dates.tolist()
+        else:
+            section[key] = value
+    return section
+
+
+def _json_default(value):
+    if isinstance(value, pd.Timestamp):
+        return {'__timestamp__': value.isoformat()} if not pd.isna(value) else None
+    if isinstance(value, (datetime, date)):
+        return {'__timestamp__': value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot spool value of type {type(value).__name__}")
+
+
+def _json_object_hook(obj: Dict):
+    if set(obj) == {'__timestamp__'}:
+        return pd.Timestamp(obj['__timestamp__'])
+    return obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or drain a persistence spool')
+    parser.add_argument('command', choices=['inspect', 'drain'])
+    parser.add_argument('--spool-dir', required=True)
+    parser.add_argument('--limit', type=int, help='segments to drain at most')
+    parser.add_argument('--dbname', default='trading_analytics')
+    parser.add_argument('--user', default='trading_user')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', default='5432')
+    args = parser.parse_args()
+
+    if args.command == 'inspect':
+        segments = PersistenceSpool(args.spool_dir).describe()
+        print(segments.to_string(index=False) if len(segments) else "Spool is empty")
+        print(f"{len(segments)} pending segments, {int(segments['bytes'].sum())} bytes")
+        return
+
+    from .trading_data_persistence import TradingDataPersistence
+
+    db_config = {
+        'dbname': args.dbname,
+        'user': args.user,
+        'password': args.password,
+        'host': args.host,
+        'port': args.port
+    }
+    with TradingDataPersistence(db_config, spool_dir=args.spool_dir) as db:
+        applied = db.replay_spool(limit=args.limit)
+    print(f"Applied {applied} segments")
+
+
+if __name__ == '__main__':
+    main()
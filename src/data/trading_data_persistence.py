@@ -1,21 +1,60 @@
 import psycopg2
+import psycopg2.errors
 from psycopg2.extras import execute_batch
-from datetime import datetime
-import logging
-import pandas as pd
-from typing import Dict, List, Optional, Tuple
-
-import psycopg2
-from psycopg2.extras import execute_batch
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import date, datetime
+import io
 import logging
+import time
+import numpy as np
 import pandas as pd
+import hashlib
 from dateutil.relativedelta import relativedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
+import weakref
+
+from ..instrumentation import registry as instrumentation
+
+# Rows serialized per COPY chunk in the bulk load path
+COPY_CHUNK_ROWS = 250_000
+# Rows deleted per statement when retiring old runs
+RETIRE_BATCH_ROWS = 50_000
+# Catalog refreshes tolerated when concurrent writers create the same partitions
+PARTITION_CREATE_ATTEMPTS = 3
+# Errors of losing a partition creation race (42P07, or 23505 on the catalog);
+# any other error is raised instead of retried
+PARTITION_RACE_ERRORS = (psycopg2.errors.DuplicateTable, psycopg2.errors.UniqueViolation)
+
+# Skip rewriting rows whose stored values are unchanged, leaving no dead tuples
+MARKET_DATA_CHANGED = """
+    WHERE (trading.market_data.open, trading.market_data.high, trading.market_data.low,
+           trading.market_data.price, trading.market_data.volume)
+    IS DISTINCT FROM
+          (EXCLUDED.open, EXCLUDED.high, EXCLUDED.low, EXCLUDED.price, EXCLUDED.volume)"""
+# Market data columns covered by the per-month fingerprints. Strategy-dependent
+# indicators are stored per run in trading.run_indicators instead.
+FINGERPRINT_COLUMNS = ['open', 'high', 'low', 'price', 'volume']
+
+# Known market_data partition names per connection
+_partition_cache: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """Cursor counting its statements and COPYs as db_round_trips"""
+
+    def execute(self, query, vars=None):
+        instrumentation.count('db_round_trips')
+        return super().execute(query, vars)
+
+    def copy_expert(self, sql, file, size=8192):
+        instrumentation.count('db_round_trips')
+        return super().copy_expert(sql, file, size)
 
 
 class TradingDataPersistence:
-    def __init__(self, db_config: Dict[str, str]):
+    def __init__(self, db_config: Dict[str, str], bulk_load: bool = True,
+                 conn: Optional['psycopg2.extensions.connection'] = None,
+                 spool_dir: Optional[str] = None, differential: bool = True):
         """
         Initialize database connection.
 
@@ -28,11 +67,45 @@ class TradingDataPersistence:
                     'host': 'localhost',
                     'port': '5432'
                 }
+            bulk_load: Persist through COPY into staging tables plus one
+                set-based merge instead of batched INSERT statements
+            conn: Existing connection to use, e.g. one borrowed from a
+                PersistencePool; it is left open by close()
+            spool_dir: Write persist_all_data calls to a local PersistenceSpool
+                instead of the database; the connection is then only opened
+                when the spool is replayed
+            differential: Only write market data months whose content
+                changed since the last save, tracked per symbol and bar
+                interval in trading.market_data_fingerprints
         """
         self.db_config = db_config
+        self.bulk_load = bulk_load
+        self.differential = differential
+        # run_id of the latest persist_all_data call
+        self.run_id: Optional[int] = None
+        # (rows, seconds) of the latest bulk load per table
+        self.load_stats: Dict[str, Tuple[int, float]] = {}
+        # Seconds spent per table by the latest persist_all_data call
+        self.table_latency: Dict[str, float] = {}
         self.setup_logging()
-        self.conn = None
-        self.connect()
+        self.conn = conn
+        self.owns_conn = conn is None
+        if conn is not None:
+            self._instrument()
+        # Set inside transaction(), where the save methods leave committing to it
+        self._in_transaction = False
+        self.spool = None
+        if spool_dir is not None:
+            # Imported here, the spool module depends on this one
+            from .persistence_spool import PersistenceSpool
+            self.spool = PersistenceSpool(spool_dir)
+        elif self.owns_conn:
+            self.connect()
+
+    def _instrument(self):
+        """Count round trips on the connection while instrumentation is enabled"""
+        if instrumentation.enabled() and isinstance(self.conn, psycopg2.extensions.connection):
+            self.conn.cursor_factory = InstrumentedCursor
 
     def setup_logging(self):
         """Setup logging configuration"""
@@ -46,45 +119,113 @@ class TradingDataPersistence:
         """Establish database connection"""
         try:
             self.conn = psycopg2.connect(**self.db_config)
+            self._instrument()
             self.logger.info("Successfully connected to the database")
         except Exception as e:
             self.logger.error(f"Error connecting to database: {str(e)}")
             raise
 
+    @contextmanager
+    def transaction(self):
+        """
+        Run several save methods as one transaction: their own commits are
+        suppressed and everything commits on exit, or rolls back on error.
+        """
+        if self.conn is None:
+            self.connect()
+        if self._in_transaction:
+            yield self
+            return
+
+        self._in_transaction = True
+        try:
+            yield self
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            # Partitions created inside the transaction are gone again
+            _partition_cache.pop(self.conn, None)
+            raise
+        finally:
+            self._in_transaction = False
+
+    def _commit(self):
+        """Commit unless an enclosing transaction() will"""
+        if not self._in_transaction:
+            self.conn.commit()
+
     def ensure_partitions_exist(self, start_date: datetime, end_date: datetime):
         """
         Ensure all required partitions exist for the date range.
 
+        Existing partitions are read from the catalog once per connection and
+        cached; only missing months are created, in one batched statement.
+        If a concurrent writer creates one of them first, the cache is
+        refreshed and the remainder retried.
+
         Args:
             start_date: Start date for data
             end_date: End date for data
         """
-        try:
-            current = start_date.replace(day=1)  # Start at beginning of month
-            while current <= end_date:
-                partition_name = f"market_data_y{current.year}m{current.month:02d}"
-                next_month = current + relativedelta(months=1)
+        months = {}
+        current = start_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        while current <= end_date:
+            months[f"market_data_y{current.year}m{current.month:02d}"] = current
+            current = current + relativedelta(months=1)
 
-                query = f"""
-                   CREATE TABLE IF NOT EXISTS trading.{partition_name}
-                   PARTITION OF trading.market_data
-                   FOR VALUES FROM ('{current.strftime('%Y-%m-01')}')
-                   TO ('{next_month.strftime('%Y-%m-01')}');
-                   """
+        for attempt in range(PARTITION_CREATE_ATTEMPTS):
+            existing = self._existing_partitions(refresh=attempt > 0)
+            missing = {name: month for name, month in months.items() if name not in existing}
+            if not missing:
+                return
 
+            statements = [
+                f"""
+                CREATE TABLE IF NOT EXISTS trading.{name}
+                PARTITION OF trading.market_data
+                FOR VALUES FROM ('{month.strftime('%Y-%m-01')}')
+                TO ('{(month + relativedelta(months=1)).strftime('%Y-%m-01')}');
+                """
+                for name, month in sorted(missing.items())
+            ]
+            try:
                 with self.conn.cursor() as cur:
-                    cur.execute(query)
+                    # Savepoint so a lost race does not abort an enclosing transaction()
+                    cur.execute("SAVEPOINT ensure_partitions;")
+                    try:
+                        cur.execute(''.join(statements))
+                        cur.execute("RELEASE SAVEPOINT ensure_partitions;")
+                    except PARTITION_RACE_ERRORS as e:
+                        cur.execute("ROLLBACK TO SAVEPOINT ensure_partitions;")
+                        self.logger.warning(f"Partition creation raced with another writer, retrying: {e}")
+                        continue
+                self._commit()
+            except Exception as e:
+                self.conn.rollback()
+                _partition_cache.pop(self.conn, None)
+                self.logger.error(f"Error ensuring partitions exist: {str(e)}")
+                raise
 
-                self.logger.info(f"Ensured partition exists for {current.strftime('%Y-%m')}")
-                current = next_month
+            existing.update(missing)
+            self.logger.info(f"Created {len(missing)} market data partitions: {', '.join(sorted(missing))}")
+            return
 
-            self.conn.commit()
-            self.logger.info("All required partitions verified/created")
+        raise RuntimeError(f"Could not create partitions after {PARTITION_CREATE_ATTEMPTS} attempts")
 
-        except Exception as e:
-            self.conn.rollback()
-            self.logger.error(f"Error ensuring partitions exist: {str(e)}")
-            raise
+    def _existing_partitions(self, refresh: bool = False) -> Set[str]:
+        """Names of trading.market_data partitions, cached per connection"""
+        partitions = None if refresh else _partition_cache.get(self.conn)
+        if partitions is None:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT c.relname
+                    FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = 'trading.market_data'::regclass;
+                    """)
+                partitions = {row[0] for row in cur.fetchall()}
+            _partition_cache[self.conn] = partitions
+        return partitions
 
     def save_market_data(self, strategy_id: int, results: Dict, config: Dict):
         """
@@ -102,41 +243,49 @@ class TradingDataPersistence:
                 start_date=dates.min(),
                 end_date=dates.max()
             )
+            write_rows, fingerprints = self._market_data_delta(
+                config.symbol, config.interval, self._market_data_frame(strategy_id, results, config)
+            )
 
             with self.conn.cursor() as cur:
                 # Using ON CONFLICT DO UPDATE for upsert operation
-                query = """
+                query = f"""
                     INSERT INTO trading.market_data 
-                    (strategy_id, timestamp, symbol, price, volume, ema_short, ema_long)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (symbol, timestamp)
+                    (strategy_id, timestamp, symbol, interval, open, high, low, price, volume)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (symbol, interval, timestamp)
                     DO UPDATE SET
-                        strategy_id = EXCLUDED.strategy_id,
+                        open = EXCLUDED.open,
+                        high = EXCLUDED.high,
+                        low = EXCLUDED.low,
                         price = EXCLUDED.price,
-                        volume = EXCLUDED.volume,
-                        ema_short = EXCLUDED.ema_short,
-                        ema_long = EXCLUDED.ema_long;
+                        volume = EXCLUDED.volume
+                    {MARKET_DATA_CHANGED};
                     """
 
                 data = [
-                    (strategy_id, date, config.symbol, price, volume, ema_s, ema_l)
-                    for date, price, volume, ema_s, ema_l in zip(
+                    (strategy_id, date, config.symbol, config.interval, open_, high, low, price, volume)
+                    for date, open_, high, low, price, volume in zip(
                         results['dates'],
+                        results.get('opens', [None] * len(results['dates'])),
+                        results.get('highs', [None] * len(results['dates'])),
+                        results.get('lows', [None] * len(results['dates'])),
                         results['prices'],
-                        results.get('volumes', [0] * len(results['dates'])),
-                        results.get('ema_short', [None] * len(results['dates'])),
-                        results.get('ema_long', [None] * len(results['dates']))
+                        results.get('volumes', [0] * len(results['dates']))
                     )
                 ]
+                data = [row for row, write in zip(data, write_rows) if write]
 
                 # Process in smaller batches to handle large datasets more efficiently
                 batch_size = 1000
                 for i in range(0, len(data), batch_size):
                     batch = data[i:i + batch_size]
                     execute_batch(cur, query, batch, page_size=batch_size)
-                    self.conn.commit()
+                    self._commit()
                     self.logger.info(f"Processed batch of {len(batch)} market data records")
 
+                self._save_fingerprints(cur, config.symbol, config.interval, fingerprints)
+                self._commit()
                 self.logger.info(f"Successfully saved/updated {len(data)} market data records")
 
         except Exception as e:
@@ -144,84 +293,390 @@ class TradingDataPersistence:
             self.logger.error(f"Error saving market data: {str(e)}")
             raise
 
+    def bulk_save_market_data(self, strategy_id: int, results: Dict, config):
+        """
+        Save market data by streaming it into a staging table with COPY and
+        merging into trading.market_data with one upsert, in one transaction.
+
+        Args:
+            strategy_id: The strategy_id from trading_strategies table
+            results: Dictionary containing market data
+            config: Trading configuration containing dates and symbol
+        """
+        dates = pd.to_datetime(pd.Series(results['dates']))
+        if not len(dates):
+            self.logger.warning("No market data to save")
+            return
+        self.ensure_partitions_exist(start_date=dates.min(), end_date=dates.max())
+
+        with self.transaction():
+            frame = self._market_data_frame(strategy_id, results, config)
+            write_rows, fingerprints = self._market_data_delta(config.symbol, config.interval, frame)
+            if write_rows.any():
+                self._copy_merge('trading.market_data', frame[write_rows], f"""
+                    INSERT INTO trading.market_data
+                    (strategy_id, timestamp, symbol, interval, open, high, low, price, volume)
+                    SELECT strategy_id, timestamp, symbol, interval, open, high, low, price, volume
+                    FROM {{staging}}
+                    ON CONFLICT (symbol, interval, timestamp)
+                    DO UPDATE SET
+                        open = EXCLUDED.open,
+                        high = EXCLUDED.high,
+                        low = EXCLUDED.low,
+                        price = EXCLUDED.price,
+                        volume = EXCLUDED.volume
+                    {MARKET_DATA_CHANGED};
+                    """)
+            with self.conn.cursor() as cur:
+                self._save_fingerprints(cur, config.symbol, config.interval, fingerprints)
+
+    @staticmethod
+    def _market_data_frame(strategy_id: int, results: Dict, config) -> pd.DataFrame:
+        """market_data rows of a results dict as columns named like the table"""
+        dates = pd.to_datetime(pd.Series(results['dates']))
+        n = len(dates)
+        return pd.DataFrame({
+            'strategy_id': np.full(n, strategy_id),
+            'timestamp': _naive_timestamps(dates),
+            'symbol': config.symbol,
+            'interval': config.interval,
+            'open': _column(results.get('opens'), n),
+            'high': _column(results.get('highs'), n),
+            'low': _column(results.get('lows'), n),
+            'price': _column(results.get('prices'), n),
+            'volume': _column(results.get('volumes'), n, fill=0.0),
+        })
+
+    def save_indicators(self, run_id: int, results: Dict):
+        """
+        Save the run's strategy indicators (EMAs), which depend on its
+        parameters and so are kept per run rather than in the shared
+        market_data table.
+
+        Args:
+            run_id: The run_id from backtest_runs table
+            results: Dictionary containing dates and ema_short/ema_long
+        """
+        frame = self._indicator_frame(run_id, results)
+        if frame is None:
+            return
+        try:
+            with self.conn.cursor() as cur:
+                execute_batch(cur, """
+                    INSERT INTO trading.run_indicators (run_id, timestamp, ema_short, ema_long)
+                    VALUES (%s, %s, %s, %s)
+                    """, [
+                        (run_id, timestamp.to_pydatetime(), *(None if np.isnan(v) else v for v in emas))
+                        for timestamp, *emas in zip(frame['timestamp'], frame['ema_short'], frame['ema_long'])
+                    ], page_size=1000)
+            self._commit()
+            self.logger.info(f"Saved {len(frame)} indicator records for run {run_id}")
+        except Exception as e:
+            self.conn.rollback()
+            self.logger.error(f"Error saving indicators: {str(e)}")
+            raise
+
+    def bulk_save_indicators(self, run_id: int, results: Dict):
+        """
+        Save the run's strategy indicators (EMAs) through COPY.
+
+        Args:
+            run_id: The run_id from backtest_runs table
+            results: Dictionary containing dates and ema_short/ema_long
+        """
+        frame = self._indicator_frame(run_id, results)
+        if frame is None:
+            return
+        self._copy_merge('trading.run_indicators', frame, """
+            INSERT INTO trading.run_indicators (run_id, timestamp, ema_short, ema_long)
+            SELECT run_id, timestamp, ema_short, ema_long
+            FROM {staging};
+            """)
+
+    @staticmethod
+    def _indicator_frame(run_id: int, results: Dict) -> Optional[pd.DataFrame]:
+        """run_indicators rows of a results dict, or None when it has no indicators"""
+        if results.get('ema_short') is None and results.get('ema_long') is None:
+            return None
+        dates = pd.to_datetime(pd.Series(results['dates']))
+        n = len(dates)
+        if not n:
+            return None
+        return pd.DataFrame({
+            'run_id': np.full(n, run_id),
+            'timestamp': _naive_timestamps(dates),
+            'ema_short': _column(results.get('ema_short'), n),
+            'ema_long': _column(results.get('ema_long'), n),
+        })
+
+    def _market_data_delta(self, symbol: str, interval: str,
+                           frame: pd.DataFrame) -> Tuple[np.ndarray, List[Tuple]]:
+        """
+        Decide which market data rows need writing.
+        Fingerprints are kept per symbol and bar interval.
+
+        Rows are grouped by month. A month whose fingerprint matches the
+        stored one is skipped; a month that only gained rows after its stored
+        watermark (its earlier rows still match the stored fingerprint) writes
+        just those rows; any other month is rewritten.
+
+        Returns:
+            Tuple of a boolean mask over the frame's rows and the
+            (month, row_count, last_timestamp, fingerprint) rows to store
+            once the data is written
+        """
+        timestamps = frame['timestamp'].to_numpy(dtype='datetime64[ns]')
+        values = _storage_values(frame)
+        months = timestamps.astype('datetime64[M]')
+        month_keys, starts = np.unique(months, return_index=True)
+        ends = np.append(starts[1:], len(frame)) if len(starts) else starts
+
+        if not self.differential:
+            write_rows = np.ones(len(frame), dtype=bool)
+            stored = {}
+        else:
+            write_rows = np.zeros(len(frame), dtype=bool)
+            stored = self._load_fingerprints(symbol, interval, [month.astype(date) for month in month_keys])
+
+        fingerprints = []
+        changed_months = 0
+        for month, start, end in zip(month_keys, starts, ends):
+            month_start = month.astype(date)
+            fingerprint = _fingerprint(timestamps[start:end], values[start:end])
+            fingerprints.append((month_start, int(end - start), pd.Timestamp(timestamps[end - 1]).to_pydatetime(),
+                                 fingerprint))
+            if not self.differential:
+                continue
+
+            previous = stored.get(month_start)
+            if previous is not None and previous[2] == fingerprint:
+                continue
+            changed_months += 1
+            if previous is not None:
+                row_count, watermark, _ = previous
+                prefix_end = start + np.searchsorted(
+                    timestamps[start:end], np.datetime64(watermark, 'ns'), side='right'
+                )
+                if (prefix_end - start == row_count and
+                        _fingerprint(timestamps[start:prefix_end], values[start:prefix_end]) == previous[2]):
+                    # Only bars after the watermark are new
+                    write_rows[prefix_end:end] = True
+                    continue
+            write_rows[start:end] = True
+
+        if self.differential:
+            self.logger.info(
+                f"Market data delta for {symbol} ({interval}): {int(write_rows.sum())} of {len(frame)} rows, "
+                f"{changed_months} of {len(month_keys)} months changed"
+            )
+        return write_rows, fingerprints
+
+    def _load_fingerprints(self, symbol: str, interval: str, months: List) -> Dict:
+        """Stored (row_count, last_timestamp, fingerprint) per month"""
+        if not months:
+            return {}
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT month, row_count, last_timestamp, fingerprint
+                FROM trading.market_data_fingerprints
+                WHERE symbol = %s AND interval = %s AND month = ANY(%s);
+                """, (symbol, interval, months))
+            return {month: (row_count, last_timestamp, fingerprint)
+                    for month, row_count, last_timestamp, fingerprint in cur.fetchall()}
+
+    @staticmethod
+    def _save_fingerprints(cur, symbol: str, interval: str, fingerprints: List[Tuple]):
+        """Record the content of the months just written"""
+        execute_batch(cur, """
+            INSERT INTO trading.market_data_fingerprints
+            (symbol, interval, month, row_count, last_timestamp, fingerprint)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (symbol, interval, month)
+            DO UPDATE SET
+                row_count = EXCLUDED.row_count,
+                last_timestamp = EXCLUDED.last_timestamp,
+                fingerprint = EXCLUDED.fingerprint,
+                updated_at = CURRENT_TIMESTAMP;
+            """, [(symbol, interval, *row) for row in fingerprints])
+
+    def bulk_save_trades(self, strategy_id: int, trades: Union[List[Dict], pd.DataFrame], symbol: str,
+                         run_id: Optional[int] = None):
+        """
+        Save executed trades through COPY.
+        Accepts both the persistence trade schema and TradeManager's trade
+        dicts (entry_date/exit_date/profit), which are treated as long trades
+        of one unit.
+
+        Args:
+            strategy_id: The strategy_id from trading_strategies table
+            trades: List of trade dictionaries, or a DataFrame with those columns
+            symbol: Symbol used when a trade does not carry one
+            run_id: The run_id from backtest_runs table
+        """
+        if not len(trades):
+            return
+        trades_df = trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(trades)
+        n = len(trades_df)
+
+        def field(name, default=None):
+            return trades_df[name] if name in trades_df else pd.Series([default] * n)
+
+        profit = field('profit_loss') if 'profit_loss' in trades_df else field('profit')
+        entry_price = trades_df['entry_price'].astype(float)
+        exit_dates = field('exit_date')
+        frame = pd.DataFrame({
+            'strategy_id': np.full(n, strategy_id),
+            'run_id': pd.array([run_id] * n, dtype='Int64'),
+            'symbol': field('symbol', symbol),
+            'entry_date': _naive_timestamps(trades_df['entry_date']),
+            'exit_date': _naive_timestamps(exit_dates),
+            'entry_price': entry_price,
+            'exit_price': field('exit_price'),
+            'position_size': field('position_size', 1),
+            'trade_type': field('trade_type', 'LONG'),
+            'profit_loss': profit,
+            'profit_loss_pct': (field('profit_loss_pct') if 'profit_loss_pct' in trades_df
+                                else profit.astype(float) / entry_price),
+            'status': np.where(exit_dates.notna(), 'CLOSED', 'OPEN'),
+            'exit_reason': field('exit_reason'),
+        })
+        self._copy_merge('trading.trades', frame, """
+            INSERT INTO trading.trades
+            (strategy_id, run_id, symbol, entry_date, exit_date, entry_price, exit_price,
+            position_size, trade_type, profit_loss, profit_loss_pct, status, exit_reason)
+            SELECT strategy_id, run_id, symbol, entry_date, exit_date, entry_price, exit_price,
+            position_size, trade_type, profit_loss, profit_loss_pct, status, exit_reason
+            FROM {staging};
+            """)
+
+    def bulk_save_portfolio_metrics(self, strategy_id: int, metrics: Dict, run_id: Optional[int] = None):
+        """
+        Save portfolio metrics through COPY.
+
+        Args:
+            strategy_id: The strategy_id from trading_strategies table
+            metrics: Dictionary containing portfolio metrics
+            run_id: The run_id from backtest_runs table
+        """
+        n = min(len(metrics['dates']), len(metrics['equity_curve']))
+        if not n:
+            return
+        frame = pd.DataFrame({
+            'strategy_id': np.full(n, strategy_id),
+            'run_id': pd.array([run_id] * n, dtype='Int64'),
+            'timestamp': _naive_timestamps(pd.Series(metrics['dates'][:n])),
+            'equity_value': _column(metrics['equity_curve'], n),
+            'drawdown': _column(metrics.get('drawdown'), n),
+            'drawdown_pct': _column(metrics.get('drawdown_pct'), n),
+        })
+        self._copy_merge('metrics.portfolio_metrics', frame, """
+            INSERT INTO metrics.portfolio_metrics
+            (strategy_id, run_id, timestamp, equity_value, drawdown, drawdown_pct)
+            SELECT strategy_id, run_id, timestamp, equity_value, drawdown, drawdown_pct
+            FROM {staging};
+            """)
+
+    def _copy_merge(self, table: str, frame: pd.DataFrame, merge_sql: str):
+        """
+        COPY a frame into a temporary staging table shaped like `table`, run
+        the set-based merge and commit once.
+
+        Args:
+            table: Target table, used for the staging table's column types
+            frame: Rows to load, columns named like the target table
+            merge_sql: Statement moving rows from {staging} into the target
+        """
+        staging = f"staging_{table.split('.')[-1]}"
+        columns = ', '.join(frame.columns)
+        start = time.perf_counter()
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(f"""
+                    CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+                    SELECT {columns} FROM {table} WITH NO DATA;
+                    """)
+                for offset in range(0, len(frame), COPY_CHUNK_ROWS):
+                    buffer = io.StringIO()
+                    frame.iloc[offset:offset + COPY_CHUNK_ROWS].to_csv(
+                        buffer, header=False, index=False, na_rep='',
+                        date_format='%Y-%m-%d %H:%M:%S.%f'
+                    )
+                    instrumentation.count('db_bytes_written', buffer.tell(), table=table)
+                    buffer.seek(0)
+                    cur.copy_expert(f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+                cur.execute(merge_sql.format(staging=staging))
+                cur.execute(f"DROP TABLE {staging};")
+            self._commit()
+        except Exception as e:
+            self.conn.rollback()
+            self.logger.error(f"Error bulk loading {table}: {str(e)}")
+            raise
+
+        elapsed = time.perf_counter() - start
+        self.load_stats[table] = (len(frame), elapsed)
+        instrumentation.count('db_rows_written', len(frame), table=table)
+        self.logger.info(
+            f"Bulk loaded {len(frame)} rows into {table} in {elapsed:.2f}s "
+            f"({len(frame) / max(elapsed, 1e-9):,.0f} rows/sec)"
+        )
+
     def save_trading_strategy(self, config) -> int:
         """
-        Save trading strategy configuration and return the strategy_id.
-        If symbol already exists, update the existing strategy.
+        Return the strategy_id of the strategy with exactly these parameters,
+        inserting it if it is new. Strategy rows are never updated, so
+        concurrent runs never contend on them.
 
         Args:
             config: TradingConfig object containing strategy parameters
 
         Returns:
-            int: The strategy_id of the inserted/updated record
+            int: The strategy_id of the matching or inserted record
         """
+        params = (
+            config.symbol,
+            config.start_date,
+            config.end_date,
+            config.initial_capital,
+            config.ema_short,
+            config.ema_long,
+            config.volume_threshold,
+            config.stop_loss,
+            config.take_profit,
+            config.pivot_threshold,
+            config.interval,
+            config.intraday
+        )
         try:
             with self.conn.cursor() as cur:
-                # First try to get existing strategy_id
+                # The unique constraint settles concurrent inserts of the same strategy
                 cur.execute("""
-                    SELECT strategy_id FROM config.trading_strategies 
-                    WHERE symbol = %s
-                    ORDER BY created_at DESC 
-                    LIMIT 1
-                """, (config.symbol,))
-
+                    INSERT INTO config.trading_strategies
+                    (symbol, start_date, end_date, initial_capital, ema_short,
+                    ema_long, volume_threshold, stop_loss, take_profit,
+                    pivot_threshold, interval, intraday)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (symbol, start_date, end_date, initial_capital, ema_short,
+                    ema_long, volume_threshold, stop_loss, take_profit,
+                    pivot_threshold, interval, intraday) DO NOTHING
+                    RETURNING strategy_id;
+                """, params)
                 result = cur.fetchone()
 
                 if result:
-                    # Update existing strategy
                     strategy_id = result[0]
-                    query = """
-                    UPDATE config.trading_strategies 
-                    SET start_date = %s,
-                        end_date = %s,
-                        initial_capital = %s,
-                        ema_short = %s,
-                        ema_long = %s,
-                        volume_threshold = %s,
-                        stop_loss = %s,
-                        take_profit = %s,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE strategy_id = %s
-                    """
-                    cur.execute(query, (
-                        config.start_date,
-                        config.end_date,
-                        config.initial_capital,
-                        config.ema_short,
-                        config.ema_long,
-                        config.volume_threshold,
-                        config.stop_loss,
-                        config.take_profit,
-                        strategy_id
-                    ))
-                    self.logger.info(f"Updated existing trading strategy with ID: {strategy_id}")
+                    self.logger.info(f"Created new trading strategy with ID: {strategy_id}")
                 else:
-                    # Insert new strategy
-                    query = """
-                    INSERT INTO config.trading_strategies 
-                    (symbol, start_date, end_date, initial_capital, ema_short, 
-                    ema_long, volume_threshold, stop_loss, take_profit)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING strategy_id;
-                    """
-                    cur.execute(query, (
-                        config.symbol,
-                        config.start_date,
-                        config.end_date,
-                        config.initial_capital,
-                        config.ema_short,
-                        config.ema_long,
-                        config.volume_threshold,
-                        config.stop_loss,
-                        config.take_profit
-                    ))
+                    cur.execute("""
+                    SELECT strategy_id FROM config.trading_strategies
+                    WHERE symbol = %s AND start_date = %s AND end_date = %s
+                    AND initial_capital = %s AND ema_short = %s AND ema_long = %s
+                    AND volume_threshold = %s AND stop_loss = %s AND take_profit = %s
+                    AND pivot_threshold = %s AND interval = %s AND intraday = %s;
+                    """, params)
                     strategy_id = cur.fetchone()[0]
-                    self.logger.info(f"Created new trading strategy with ID: {strategy_id}")
+                    self.logger.info(f"Reusing trading strategy with ID: {strategy_id}")
 
-                # Clean up old data for this symbol
-                self._cleanup_old_data(strategy_id, config.symbol)
-
-                self.conn.commit()
+                self._commit()
                 return strategy_id
 
         except Exception as e:
@@ -229,25 +684,69 @@ class TradingDataPersistence:
             self.logger.error(f"Error saving trading strategy: {str(e)}")
             raise
 
-    def save_trades(self, strategy_id: int, trades: List[Dict]):
+    def start_run(self, strategy_id: int, symbol: str) -> int:
+        """
+        Register a new backtest run and return its run_id.
+
+        Args:
+            strategy_id: The strategy_id from trading_strategies table
+            symbol: The trading symbol
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO config.backtest_runs (strategy_id, symbol)
+                    VALUES (%s, %s)
+                    RETURNING run_id;
+                """, (strategy_id, symbol))
+                run_id = cur.fetchone()[0]
+            self._commit()
+            self.logger.info(f"Started run {run_id} for strategy {strategy_id}")
+            return run_id
+        except Exception as e:
+            self.conn.rollback()
+            self.logger.error(f"Error starting run: {str(e)}")
+            raise
+
+    def complete_run(self, run_id: int):
+        """
+        Mark a run complete once all of its rows are written.
+
+        Args:
+            run_id: The run_id from backtest_runs table
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE config.backtest_runs SET status = 'COMPLETE'
+                    WHERE run_id = %s;
+                """, (run_id,))
+            self._commit()
+        except Exception as e:
+            self.conn.rollback()
+            self.logger.error(f"Error completing run: {str(e)}")
+            raise
+
+    def save_trades(self, strategy_id: int, trades: List[Dict], run_id: Optional[int] = None):
         """
         Save executed trades.
 
         Args:
             strategy_id: The strategy_id from trading_strategies table
             trades: List of trade dictionaries
+            run_id: The run_id from backtest_runs table
         """
         try:
             with self.conn.cursor() as cur:
                 query = """
                 INSERT INTO trading.trades 
-                (strategy_id, symbol, entry_date, exit_date, entry_price, 
+                (strategy_id, run_id, symbol, entry_date, exit_date, entry_price, 
                 exit_price, position_size, trade_type, profit_loss, 
                 profit_loss_pct, status, exit_reason)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """
                 data = [
-                    (strategy_id, trade['symbol'], trade['entry_date'],
+                    (strategy_id, run_id, trade['symbol'], trade['entry_date'],
                      trade.get('exit_date'), trade['entry_price'],
                      trade.get('exit_price'), trade['position_size'],
                      trade['trade_type'], trade.get('profit_loss'),
@@ -257,30 +756,31 @@ class TradingDataPersistence:
                     for trade in trades
                 ]
                 execute_batch(cur, query, data)
-                self.conn.commit()
+                self._commit()
                 self.logger.info(f"Saved {len(trades)} trades")
         except Exception as e:
             self.conn.rollback()
             self.logger.error(f"Error saving trades: {str(e)}")
             raise
 
-    def save_portfolio_metrics(self, strategy_id: int, metrics: Dict):
+    def save_portfolio_metrics(self, strategy_id: int, metrics: Dict, run_id: Optional[int] = None):
         """
         Save portfolio metrics including equity curve and drawdown.
 
         Args:
             strategy_id: The strategy_id from trading_strategies table
             metrics: Dictionary containing portfolio metrics
+            run_id: The run_id from backtest_runs table
         """
         try:
             with self.conn.cursor() as cur:
                 query = """
                 INSERT INTO metrics.portfolio_metrics 
-                (strategy_id, timestamp, equity_value, drawdown, drawdown_pct)
-                VALUES (%s, %s, %s, %s, %s)
+                (strategy_id, run_id, timestamp, equity_value, drawdown, drawdown_pct)
+                VALUES (%s, %s, %s, %s, %s, %s)
                 """
                 data = [
-                    (strategy_id, date, equity, dd, dd_pct)
+                    (strategy_id, run_id, date, equity, dd, dd_pct)
                     for date, equity, dd, dd_pct in zip(
                         metrics['dates'],
                         metrics['equity_curve'],
@@ -289,32 +789,33 @@ class TradingDataPersistence:
                     )
                 ]
                 execute_batch(cur, query, data, page_size=1000)
-                self.conn.commit()
+                self._commit()
                 self.logger.info(f"Saved {len(data)} portfolio metric records")
         except Exception as e:
             self.conn.rollback()
             self.logger.error(f"Error saving portfolio metrics: {str(e)}")
             raise
 
-    def save_daily_performance(self, strategy_id: int, performance: Dict):
+    def save_daily_performance(self, strategy_id: int, performance: Dict, run_id: Optional[int] = None):
         """
         Save daily performance metrics.
 
         Args:
             strategy_id: The strategy_id from trading_strategies table
             performance: Dictionary containing daily performance metrics
+            run_id: The run_id from backtest_runs table
         """
         try:
             with self.conn.cursor() as cur:
                 query = """
                 INSERT INTO metrics.daily_performance 
-                (strategy_id, date, starting_equity, ending_equity, 
+                (strategy_id, run_id, date, starting_equity, ending_equity, 
                 daily_returns, daily_profit_loss, number_of_trades, 
                 winning_trades, losing_trades, sharpe_ratio)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """
                 data = [
-                    (strategy_id, date, perf['starting_equity'],
+                    (strategy_id, run_id, date, perf['starting_equity'],
                      perf['ending_equity'], perf['returns'],
                      perf['profit_loss'], perf['num_trades'],
                      perf['winning_trades'], perf['losing_trades'],
@@ -322,59 +823,83 @@ class TradingDataPersistence:
                     for date, perf in performance.items()
                 ]
                 execute_batch(cur, query, data)
-                self.conn.commit()
+                self._commit()
                 self.logger.info(f"Saved {len(data)} daily performance records")
         except Exception as e:
             self.conn.rollback()
             self.logger.error(f"Error saving daily performance: {str(e)}")
             raise
 
-    def _cleanup_old_data(self, current_strategy_id: int, symbol: str):
+    def retire_runs(self, keep_latest: int = 5, older_than_days: Optional[int] = None,
+                    batch_size: int = RETIRE_BATCH_ROWS) -> int:
         """
-        Clean up old data for the given symbol, keeping data for the current strategy.
+        Apply the retention policy: delete runs beyond the newest
+        `keep_latest` per symbol, or only those also older than
+        `older_than_days` when given.
+
+        Rows are deleted by run_id in batches of at most batch_size, each
+        committed on its own, so no long-held locks block concurrent writers.
+        Shared market data and strategies are kept.
 
         Args:
-            current_strategy_id: The current strategy_id to keep
-            symbol: The trading symbol
+            keep_latest: Complete runs kept per symbol
+            older_than_days: Only retire runs created at least this many days ago
+            batch_size: Rows deleted per statement and commit
+
+        Returns:
+            int: Number of runs retired
         """
         try:
             with self.conn.cursor() as cur:
-                # Instead of deleting market data, update it to the current strategy_id
                 cur.execute("""
-                    UPDATE trading.market_data 
-                    SET strategy_id = %s
-                    WHERE symbol = %s AND strategy_id != %s
-                """, (current_strategy_id, symbol, current_strategy_id))
-
-                # Delete other related data for old strategies
-                tables = [
-                    'trading.trades',
-                    'metrics.portfolio_metrics',
-                    'metrics.daily_performance'
-                ]
+                    SELECT run_id FROM (
+                        SELECT run_id, created_at, ROW_NUMBER() OVER (
+                            PARTITION BY symbol ORDER BY created_at DESC, run_id DESC
+                        ) AS newest
+                        FROM config.backtest_runs
+                        WHERE status = 'COMPLETE'
+                    ) ranked
+                    WHERE newest > %s
+                    AND (%s IS NULL OR created_at < CURRENT_TIMESTAMP - make_interval(days => %s))
+                    ORDER BY run_id;
+                """, (keep_latest, older_than_days, older_than_days or 0))
+                run_ids = [row[0] for row in cur.fetchall()]
+            self.conn.commit()
+            if not run_ids:
+                return 0
 
-                for table in tables:
-                    cur.execute(f"""
-                        DELETE FROM {table}
-                        WHERE strategy_id IN (
-                            SELECT strategy_id 
-                            FROM config.trading_strategies 
-                            WHERE symbol = %s AND strategy_id != %s
-                        )
-                    """, (symbol, current_strategy_id))
-
-                # Delete old strategies
-                cur.execute("""
-                    DELETE FROM config.trading_strategies 
-                    WHERE symbol = %s AND strategy_id != %s
-                """, (symbol, current_strategy_id))
+            for table in ('trading.trades', 'trading.run_indicators', 'metrics.portfolio_metrics',
+                          'metrics.daily_performance'):
+                deleted = self._delete_in_batches(table, run_ids, batch_size)
+                self.logger.info(f"Retired {deleted} rows from {table}")
 
-                self.logger.info(f"Cleaned up old data for symbol: {symbol}")
+            with self.conn.cursor() as cur:
+                cur.execute("DELETE FROM config.backtest_runs WHERE run_id = ANY(%s);", (run_ids,))
+            self.conn.commit()
+            self.logger.info(f"Retired {len(run_ids)} runs")
+            return len(run_ids)
 
         except Exception as e:
-            self.logger.error(f"Error cleaning up old data: {str(e)}")
+            self.conn.rollback()
+            self.logger.error(f"Error retiring runs: {str(e)}")
             raise
 
+    def _delete_in_batches(self, table: str, run_ids: List[int], batch_size: int) -> int:
+        """Delete the rows of the given runs from table, committing every batch_size rows"""
+        deleted = 0
+        while True:
+            with self.conn.cursor() as cur:
+                cur.execute(f"""
+                    DELETE FROM {table} WHERE ctid = ANY(ARRAY(
+                        SELECT ctid FROM {table} WHERE run_id = ANY(%s) LIMIT %s
+                    ));
+                """, (run_ids, batch_size))
+                count = cur.rowcount
+            self.conn.commit()
+            deleted += count
+            if count < batch_size:
+                return deleted
+
     def diagnose_data_saving(self, config, results, analysis):
         """
         Diagnose issues with data saving process by checking data structure and contents.
@@ -390,10 +915,14 @@ class TradingDataPersistence:
         if 'trades' not in results:
             self.logger.error("No trades data found in results dictionary")
         else:
-            self.logger.info(f"Found {len(results['trades'])} trades")
+            # A BacktestResult's columnar trade log, so its trade dicts are not built here
+            trades = getattr(results, 'trade_log', None)
+            if trades is None:
+                trades = results['trades']
+            self.logger.info(f"Found {len(trades)} trades")
             # Log sample trade for structure verification
-            if results['trades']:
-                self.logger.info(f"Sample trade structure: {results['trades'][0]}")
+            if len(trades):
+                self.logger.info(f"Sample trade structure: {trades[0]}")
 
         # Check portfolio metrics data
         if 'equity_curve' not in results:
@@ -427,7 +956,7 @@ class TradingDataPersistence:
         except Exception as e:
             self.logger.error(f"Error checking database schema: {str(e)}")
 
-    def persist_all_data(self, config, results, analysis) -> int:
+    def persist_all_data(self, config, results, analysis) -> Optional[int]:
         """
         Persist all trading data in a single transaction.
 
@@ -436,53 +965,131 @@ class TradingDataPersistence:
             results: Trading results dictionary
             analysis: Trading analysis dictionary
 
+        Returns:
+            Optional[int]: The strategy_id of the saved data, or None when the
+            run was written to the spool for a later replay_spool()
+        """
+        if self.spool is not None:
+            with instrumentation.stage('persist:spool'):
+                segment_id = self.spool.append(config, results, analysis)
+            self.logger.info(f"Spooled {config.symbol} run as segment {segment_id}")
+            return None
+        with instrumentation.stage('persist'):
+            return self.write_all_data(config, results, analysis)
+
+    def write_all_data(self, config, results, analysis) -> int:
+        """
+        Persist all trading data straight to the database, bypassing the spool.
+
+        Args:
+            config: Trading configuration object
+            results: Trading results dictionary
+            analysis: Trading analysis dictionary
+
+        Every call is recorded as a new run: its trades and metrics are
+        appended under a fresh run_id and the run is marked COMPLETE last, all
+        in one transaction, so a failed run leaves no rows behind and readers
+        never see a partial one. The run_id is kept in self.run_id.
+
         Returns:
             int: The strategy_id of the saved data
         """
         try:
             # Run diagnostics first
             self.diagnose_data_saving(config, results, analysis)
+            self.table_latency = {}
 
-            strategy_id = self.save_trading_strategy(config)
-            self.save_market_data(strategy_id, results, config)
+            strategy_id = self._timed('config.trading_strategies', self.save_trading_strategy, config)
+            # One transaction from start_run to complete_run: a failed step leaves
+            # no partial rows behind under a run that never completes
+            with self.transaction():
+                run_id = self.run_id = self.start_run(strategy_id, config.symbol)
+                if self.bulk_load:
+                    self._timed('trading.market_data', self.bulk_save_market_data, strategy_id, results, config)
+                else:
+                    self._timed('trading.market_data', self.save_market_data, strategy_id, results, config)
 
-            if 'trades' in results:
-                if not results['trades']:
-                    self.logger.warning("Trades list is empty")
+                if self.bulk_load:
+                    self._timed('trading.run_indicators', self.bulk_save_indicators, run_id, results)
                 else:
-                    self.save_trades(strategy_id, results['trades'])
-            else:
-                self.logger.warning("No trades data found in results")
-
-            if 'equity_curve' in results:
-                metrics_data = {
-                    'dates': results['dates'],
-                    'equity_curve': results['equity_curve'],
-                    'drawdown': analysis.get('drawdown_series', []),
-                    'drawdown_pct': analysis.get('drawdown_pct_series', [])
-                }
-                self.save_portfolio_metrics(strategy_id, metrics_data)
-            else:
-                self.logger.warning("No equity curve data found in results")
+                    self._timed('trading.run_indicators', self.save_indicators, run_id, results)
+
+                if 'trades' in results:
+                    if not _trade_count(results):
+                        self.logger.warning("Trades list is empty")
+                    elif self.bulk_load:
+                        # A BacktestResult hands over its columnar trade log directly
+                        trades = results.trades_frame() if hasattr(results, 'trades_frame') else results['trades']
+                        self._timed('trading.trades', self.bulk_save_trades,
+                                    strategy_id, trades, config.symbol, run_id)
+                    else:
+                        self._timed('trading.trades', self.save_trades, strategy_id, results['trades'], run_id)
+                else:
+                    self.logger.warning("No trades data found in results")
 
-            if 'daily_performance' in analysis:
-                if not analysis['daily_performance']:
-                    self.logger.warning("Daily performance dictionary is empty")
+                if 'equity_curve' in results:
+                    metrics_data = {
+                        'dates': results['dates'],
+                        'equity_curve': results['equity_curve'],
+                        'drawdown': analysis.get('drawdown_series', []),
+                        'drawdown_pct': analysis.get('drawdown_pct_series', [])
+                    }
+                    if self.bulk_load:
+                        self._timed('metrics.portfolio_metrics', self.bulk_save_portfolio_metrics,
+                                    strategy_id, metrics_data, run_id)
+                    else:
+                        self._timed('metrics.portfolio_metrics', self.save_portfolio_metrics,
+                                    strategy_id, metrics_data, run_id)
                 else:
-                    self.save_daily_performance(strategy_id, analysis['daily_performance'])
-            else:
-                self.logger.warning("No daily performance data found in analysis")
+                    self.logger.warning("No equity curve data found in results")
 
-            self.logger.info(f"Successfully persisted all available trading data for strategy {strategy_id}")
+                if 'daily_performance' in analysis:
+                    if not analysis['daily_performance']:
+                        self.logger.warning("Daily performance dictionary is empty")
+                    else:
+                        self._timed('metrics.daily_performance', self.save_daily_performance,
+                                    strategy_id, analysis['daily_performance'], run_id)
+                else:
+                    self.logger.warning("No daily performance data found in analysis")
+
+                self.complete_run(run_id)
+            self.logger.info(
+                f"Successfully persisted all available trading data for strategy {strategy_id}, run {run_id}"
+            )
             return strategy_id
 
         except Exception as e:
             self.logger.error(f"Error persisting trading data: {str(e)}")
             raise
-0
+
+    def replay_spool(self, limit: Optional[int] = None) -> int:
+        """
+        Persist spooled runs, oldest first, connecting if needed.
+
+        Args:
+            limit: Maximum number of segments to replay
+
+        Returns:
+            int: Number of segments applied by this call
+        """
+        if self.spool is None:
+            raise ValueError("replay_spool requires a spool_dir")
+        if self.conn is None:
+            self.connect()
+        return self.spool.replay(self, limit=limit)
+
+    def _timed(self, table: str, save, *args):
+        """Call a save method and add its wall time to table_latency"""
+        start = time.perf_counter()
+        try:
+            with instrumentation.stage(f"persist:{table}"):
+                return save(*args)
+        finally:
+            self.table_latency[table] = self.table_latency.get(table, 0.0) + time.perf_counter() - start
+
     def close(self):
-        """Close database connection"""
-        if self.conn:
+        """Close database connection unless it was handed in by the caller"""
+        if self.conn and self.owns_conn:
             self.conn.close()
             self.logger.info("Database connection closed")
 
@@ -490,4 +1097,43 @@ class TradingDataPersistence:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
\ No newline at end of file
+        self.close()
+
+
+def _trade_count(results) -> int:
+    """Trades in a results dict, or in a BacktestResult without building its trade dicts"""
+    trade_log = getattr(results, 'trade_log', None)
+    return len(trade_log) if trade_log is not None else len(results['trades'])
+
+
+def _column(values, n: int, fill=None) -> np.ndarray:
+    """First n values as an array, padded with `fill` (NULL when None) if short or missing"""
+    column = np.full(n, np.nan if fill is None else fill, dtype=np.float64)
+    if values is not None and len(values):
+        values = np.asarray(values[:n], dtype=np.float64)
+        column[:len(values)] = values
+    return column
+
+
+def _naive_timestamps(dates: pd.Series) -> pd.Series:
+    """Exchange wall-clock timestamps for TIMESTAMP WITHOUT TIME ZONE columns"""
+    dates = pd.to_datetime(dates)
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates
+
+
+def _storage_values(frame: pd.DataFrame) -> np.ndarray:
+    """Fingerprinted columns at the DECIMAL(15,2) precision they are stored with"""
+    values = np.round(frame[FINGERPRINT_COLUMNS].to_numpy(dtype=np.float64), 2)
+    # One NaN bit pattern so missing values always hash alike
+    values[np.isnan(values)] = np.nan
+    return np.ascontiguousarray(values)
+
+
+def _fingerprint(timestamps: np.ndarray, values: np.ndarray) -> str:
+    """Content hash of a run of market data rows"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(timestamps.astype('datetime64[ns]').view(np.int64).tobytes())
+    digest.update(values.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,294 @@
+"""
+In-process registry of pipeline stage timings and counters.
+
+Code reports through the module-level helpers, which go to the default
+registry:
+
+    from ..instrumentation import registry as instrumentation
+
+    with instrumentation.stage('signals'):
+        ...
+    instrumentation.count('rows_written', len(frame), table='trading.trades')
+
+The default registry is disabled: stage() then returns a shared no-op
+context manager and count() returns immediately, so instrumented code costs
+one attribute check per call. configure() enables it, optionally with
+cProfile and tracemalloc capture per stage, and export() writes JSON or
+Prometheus text format.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = 'algotrader'
+
+# Functions listed per profiled stage in snapshots
+PROFILE_TOP = 15
+
+_NULL_STAGE = nullcontext()
+
+# Python 3.12+ allows one active profiler per process, so at most one stage
+# profiles at a time; concurrent stages in other threads go unprofiled
+_profiler_lock = threading.Lock()
+
+
+@dataclass
+class StageStats:
+    """Timings of one named stage, accumulated over its calls"""
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    # Highest traced memory above the stage's starting point, with tracemalloc on
+    peak_bytes: Optional[int] = None
+    profile: Optional[pstats.Stats] = field(default=None, repr=False)
+
+    def as_dict(self) -> Dict:
+        stats = {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'max_seconds': self.max_seconds,
+            'peak_bytes': self.peak_bytes,
+        }
+        if self.profile is not None:
+            stats['profile'] = _top_functions(self.profile)
+        return stats
+
+
+class MetricsRegistry:
+    """
+    Stage timers and labelled counters, safe to update from several threads.
+
+    cProfile and tracemalloc capture only the outermost stage of each
+    thread, since a nested stage would reset the enclosing stage's memory
+    peak. Only one stage is profiled at a time across the process: a stage
+    starting while another thread's stage is profiled runs unprofiled.
+    Memory peaks are process-wide, so they include allocations of stages
+    running concurrently in other threads.
+    """
+
+    def __init__(self, enabled: bool = False, profile: bool = False, trace_memory: bool = False):
+        """
+        Args:
+            enabled: Record stages and counters
+            profile: Run each stage under cProfile
+            trace_memory: Record each stage's peak traced memory with tracemalloc
+        """
+        self.enabled = enabled
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now()
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stage(self, name: str):
+        """Context manager timing one run of the named stage"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed_stage(name)
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Add `value` to the counter `name` with the given labels"""
+        if not self.enabled:
+            return
+        key = _counter_key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def _timed_stage(self, name: str):
+        outermost = not getattr(self._local, 'active', False)
+        self._local.active = True
+        memory_start = None
+        if self.trace_memory and outermost:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            memory_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        profiler = None
+        if self.profile and outermost and _profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler (e.g. an outer cProfile run) is already active
+                profiler = None
+                _profiler_lock.release()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _profiler_lock.release()
+            if outermost:
+                self._local.active = False
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - memory_start if memory_start is not None else None
+
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+                stats.calls += 1
+                stats.seconds += elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+                if peak is not None:
+                    stats.peak_bytes = max(stats.peak_bytes or 0, peak)
+                if profiler is not None:
+                    if stats.profile is None:
+                        stats.profile = pstats.Stats(profiler)
+                    else:
+                        stats.profile.add(profiler)
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of a counter (0 when never counted)"""
+        return self.counters.get(_counter_key(name, labels), 0)
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+            self.started_at = datetime.now()
+
+    def snapshot(self) -> Dict:
+        """Stages and counters as a JSON-serializable dict"""
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'exported_at': datetime.now().isoformat(timespec='seconds'),
+                'stages': {name: stats.as_dict() for name, stats in self.stages.items()},
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+            }
+
+    def prometheus(self) -> str:
+        """Stages and counters in the Prometheus text exposition format"""
+        with self._lock:
+            stages = sorted(self.stages.items())
+            counters = sorted(self.counters.items())
+
+        lines: List[str] = []
+        stage_metrics = (
+            ('stage_calls_total', 'counter', 'Completed runs of the stage', lambda s: s.calls),
+            ('stage_seconds_total', 'counter', 'Wall time spent in the stage', lambda s: s.seconds),
+            ('stage_max_seconds', 'gauge', 'Longest single run of the stage', lambda s: s.max_seconds),
+            ('stage_peak_bytes', 'gauge', 'Peak traced memory during the stage', lambda s: s.peak_bytes),
+        )
+        for metric, kind, help_text, value in stage_metrics:
+            samples = [(name, value(stats)) for name, stats in stages if value(stats) is not None]
+            if not samples:
+                continue
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} {kind}")
+            lines.extend(
+                f"{PROMETHEUS_PREFIX}_{metric}{_labels({'stage': name})} {sample}"
+                for name, sample in samples
+            )
+
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_labels(dict(labels))} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str) -> str:
+        """
+        Write the registry to `path`: Prometheus text for .prom/.txt files,
+        JSON otherwise. Profiled stages are also dumped as <path stem>.<stage>.prof
+        files for pstats or snakeviz.
+
+        Returns:
+            str: The path written
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith(('.prom', '.txt')):
+            content = self.prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=1)
+        with open(path, 'w') as f:
+            f.write(content)
+
+        stem = os.path.splitext(path)[0]
+        with self._lock:
+            profiles = [(name, stats.profile) for name, stats in self.stages.items() if stats.profile is not None]
+        for name, profile in profiles:
+            profile.dump_stats(f"{stem}.{_metric_name(name)}.prof")
+        return path
+
+
+# Default registry the module-level helpers report to
+default_registry = MetricsRegistry()
+
+
+def configure(enabled: bool = True, profile: bool = False, trace_memory: bool = False) -> MetricsRegistry:
+    """Switch the default registry on or off and clear what it recorded"""
+    default_registry.enabled = enabled
+    default_registry.profile = profile
+    default_registry.trace_memory = trace_memory
+    default_registry.reset()
+    return default_registry
+
+
+def stage(name: str):
+    """Time a stage on the default registry"""
+    if not default_registry.enabled:
+        return _NULL_STAGE
+    return default_registry._timed_stage(name)
+
+
+def count(name: str, value: float = 1, **labels):
+    """Add to a counter of the default registry"""
+    if default_registry.enabled:
+        default_registry.count(name, value, **labels)
+
+
+def enabled() -> bool:
+    return default_registry.enabled
+
+
+def _top_functions(profile: pstats.Stats) -> List[str]:
+    """The PROFILE_TOP functions with the most cumulative time, as pstats prints them"""
+    output = io.StringIO()
+    profile.stream = output
+    profile.sort_stats('cumulative').print_stats(PROFILE_TOP)
+    lines = output.getvalue().splitlines()
+    # Keep the table: header and one row per function
+    start = next((i for i, line in enumerate(lines) if line.lstrip().startswith('ncalls')), len(lines))
+    return [line.rstrip() for line in lines[start:] if line.strip()]
+
+
+def _counter_key(name: str, labels: Dict) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    return name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items()))
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for label, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{_metric_name(label)}="{value}"')
+    return '{' + ','.join(pairs) + '}'
@@ -1,6 +1,10 @@
+import os
+
 from config.config import TradingConfig
 from src.backtesting.backtest import Backtest
-from src.data.trading_data_persistence import TradingDataPersistence
+from src.data.market_data_cache import MarketDataCache
+from src.data.persistence_pool import AsyncPersistenceWriter, PersistencePool
+from src.instrumentation import registry as instrumentation
 from src.reporting.trading_report import TradingReport
 
 
@@ -30,21 +34,42 @@ def main():
 
     config = TradingConfig.from_dict(config_dict)
 
+    # Per-stage timings and counters, e.g. ALGOTRADER_METRICS=../metrics/run.json;
+    # ALGOTRADER_PROFILE=1 and ALGOTRADER_TRACEMALLOC=1 add cProfile and memory peaks
+    metrics_path = os.environ.get('ALGOTRADER_METRICS')
+    if metrics_path:
+        instrumentation.configure(
+            profile=os.environ.get('ALGOTRADER_PROFILE') == '1',
+            trace_memory=os.environ.get('ALGOTRADER_TRACEMALLOC') == '1'
+        )
+
+    # Local OHLCV cache; repeated runs only download missing date spans
+    cache = MarketDataCache('../data_cache')
+
     # Run backtest
-    backtest = Backtest(config)
+    backtest = Backtest(config, cache=cache)
     results = backtest.run()
     analysis = backtest.analyze_results()
+    print(f"Market data cache: {cache.stats.as_dict()}")
+
+    # Persist in the background while the report is generated
+    with PersistencePool(db_config, minconn=1, maxconn=2) as pool:
+        with AsyncPersistenceWriter(pool, workers=1) as writer:
+            persisted = writer.submit(config, results, analysis)
 
-    # Persist the data
-    with TradingDataPersistence(db_config) as db:
-        strategy_id = db.persist_all_data(config, results, analysis)
-        print(f"Data persisted successfully with strategy_id: {strategy_id}")
+            # Generate report
+            report = TradingReport(config, results, analysis)
+            report_file = report.generate_report()
 
-    # Generate report
-    report = TradingReport(config, results, analysis)
-    report_file = report.generate_report()
+            print(f"\nReport generated successfully: {report_file}")
+            print(f"Data persisted successfully with strategy_id: {persisted.result()}")
+        print(f"Persistence: {writer.stats.as_dict()}")
 
-    print(f"\nReport generated successfully: {report_file}")
+    if metrics_path:
+        registry = instrumentation.default_registry
+        registry.export(metrics_path)
+        registry.export(os.path.splitext(metrics_path)[0] + '.prom')
+        print(f"Metrics written to {metrics_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Points per plotted line; well above what a 500px wide chart can show
+DEFAULT_MAX_POINTS = 2000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, from each of n_out - 2 equal buckets
+    in between, the point forming the largest triangle with the point kept
+    from the previous bucket and the mean of the next bucket. Peaks and
+    troughs survive, so the line looks like the full series.
+
+    Args:
+        x: Increasing x coordinates
+        y: Values, NaN allowed
+        n_out: Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the interior points 1 .. n - 2
+    edges = np.floor(np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end]
+        avg_y = np.nanmean(next_y) if not np.isnan(next_y).all() else y[a]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        area[np.isnan(area)] = -1.0
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+
+    return kept
+
+
+def chart_indices(dates: Sequence, values: Sequence, max_points: Optional[int],
+                  keep_dates: Sequence = ()) -> np.ndarray:
+    """
+    Positions to plot for a dated series: its LTTB selection plus the bars
+    of every date in keep_dates (e.g. buy/sell markers), so the line passes
+    through every marker.
+
+    Args:
+        dates: Dates of the series
+        values: Series values
+        max_points: Target point count; None or 0 keeps every point
+        keep_dates: Dates whose bars are always kept
+    """
+    n = min(len(dates), len(values))
+    if not max_points or n <= max_points:
+        return np.arange(n)
+
+    index = pd.DatetimeIndex(dates[:n])
+    x = index.asi8.astype(np.float64)
+    kept = lttb_indices(x, np.asarray(values[:n], dtype=np.float64), max_points)
+
+    keep_dates = [date for date in keep_dates if date is not None and not pd.isna(date)]
+    if keep_dates:
+        markers = index.searchsorted(pd.DatetimeIndex(keep_dates))
+        kept = np.union1d(kept, markers[markers < n])
+    return kept
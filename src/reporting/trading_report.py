@@ -1,23 +1,52 @@
+import dataclasses
+import io
+import json
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
 
-import matplotlib.pyplot as plt
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+import numpy as np
+import pandas as pd
+
+from .downsampling import DEFAULT_MAX_POINTS, chart_indices
+from ..instrumentation import registry as instrumentation
+
+# Matplotlib and ReportLab are imported only when a PDF is built, so the
+# JSON/HTML formats start fast and work without them installed
+OUTPUT_FORMATS = ('pdf', 'json', 'html')
 
 
 class TradingReport:
-    def __init__(self, config, results, analysis):
+    def __init__(self, config, results, analysis, report_dir: str = "../report",
+                 max_points: Optional[int] = DEFAULT_MAX_POINTS, output_format: str = 'pdf'):
+        """
+        Args:
+            config: Trading configuration object
+            results: Backtest.run BacktestResult, or a results dict of lists
+            analysis: Backtest.analyze_results metrics
+            report_dir: Directory the report files are written to
+            max_points: Points plotted per chart line; longer series are
+                downsampled with LTTB, keeping every buy/sell bar (None plots all)
+            output_format: 'pdf' for the full report, 'json' for the config and
+                metrics only, 'html' for that JSON plus a self-contained HTML
+                page with embedded charts
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
         self.config = config
         self.results = results
         self.analysis = analysis
+        self.report_dir = report_dir
+        self.max_points = max_points
+        self.output_format = output_format
+        # Shared by every file written for this report
+        self.report_stem = f"trading_report_{config.symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
         # Calculate final portfolio value from the equity curve if available
+        equity_curve = self.results.get('equity_curve', [])
         self.final_portfolio_value = (
-            self.results.get('equity_curve', [])[-1]
-            if self.results.get('equity_curve') and len(self.results.get('equity_curve', [])) > 0
+            float(equity_curve[-1]) if len(equity_curve) > 0
             else self.config.initial_capital + self.analysis.get('total_profit', 0)
         )
         self.setup_logging()
@@ -39,88 +68,126 @@ class TradingReport:
         )
         self.logger = logging.getLogger(__name__)
 
-    def create_charts(self):
-        """Create trading charts with buy/sell signals"""
-        plt.figure(figsize=(12, 6))
+    def create_charts(self) -> io.BytesIO:
+        """Create trading charts with buy/sell signals, returned as an in-memory PNG"""
+        from matplotlib.figure import Figure
+
+        # Figures are not registered with pyplot, so concurrent reports share no state
+        fig = Figure(figsize=(12, 6))
+        ax = fig.subplots()
 
         # Check if we have the required data
         if not all(key in self.results for key in ['dates', 'prices']):
             self.logger.warning("Missing required price data for charts")
             # Create a simple placeholder chart
-            plt.text(0.5, 0.5, 'Insufficient data for chart',
-                     horizontalalignment='center', verticalalignment='center')
-            chart_path = 'trading_chart.png'
-            plt.savefig(chart_path)
-            plt.close()
-            return chart_path
+            ax.text(0.5, 0.5, 'Insufficient data for chart',
+                    horizontalalignment='center', verticalalignment='center')
+            return _render_png(fig)
 
-        plt.plot(self.results['dates'], self.results['prices'], label='Price')
+        # Downsample the lines; the EMAs share the price's points
+        points = chart_indices(
+            self.results['dates'],
+            self.results['prices'],
+            self.max_points,
+            self._marker_dates()
+        )
+        dates = _take(self.results['dates'], points)
+        ax.plot(dates, _take(self.results['prices'], points), label='Price')
 
         # Plot EMAs if available
         if 'ema_short' in self.results:
-            plt.plot(self.results['dates'], self.results['ema_short'],
-                     label=f'EMA {self.config.ema_short}')
+            ax.plot(dates, _take(self.results['ema_short'], points),
+                    label=f'EMA {self.config.ema_short}')
         if 'ema_long' in self.results:
-            plt.plot(self.results['dates'], self.results['ema_long'],
-                     label=f'EMA {self.config.ema_long}')
+            ax.plot(dates, _take(self.results['ema_long'], points),
+                    label=f'EMA {self.config.ema_long}')
 
         # Plot signals if available
         if 'buy_dates' in self.results and 'buy_prices' in self.results:
-            plt.scatter(self.results['buy_dates'], self.results['buy_prices'],
-                        color='green', marker='^', label='Buy Signal')
+            ax.scatter(self.results['buy_dates'], self.results['buy_prices'],
+                       color='green', marker='^', label='Buy Signal')
         if 'sell_dates' in self.results and 'sell_prices' in self.results:
-            plt.scatter(self.results['sell_dates'], self.results['sell_prices'],
-                        color='red', marker='v', label='Sell Signal')
+            ax.scatter(self.results['sell_dates'], self.results['sell_prices'],
+                       color='red', marker='v', label='Sell Signal')
+
+        ax.set_title(f'Trading Chart for {self.config.symbol}')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Price')
+        ax.legend()
+        ax.grid(True)
 
-        plt.title(f'Trading Chart for {self.config.symbol}')
-        plt.xlabel('Date')
-        plt.ylabel('Price')
-        plt.legend()
-        plt.grid(True)
+        return _render_png(fig)
 
-        chart_path = 'trading_chart.png'
-        plt.savefig(chart_path)
-        plt.close()
-        return chart_path
+    def create_equity_curve(self) -> io.BytesIO:
+        """Create equity curve chart, returned as an in-memory PNG"""
+        from matplotlib.figure import Figure
 
-    def create_equity_curve(self):
-        """Create equity curve chart"""
-        plt.figure(figsize=(12, 6))
+        fig = Figure(figsize=(12, 6))
+        ax = fig.subplots()
 
         dates = self.results.get('dates', [])
         equity_curve = self.results.get('equity_curve', [])
 
-        if not dates or not equity_curve:
+        if not len(dates) or not len(equity_curve):
             self.logger.warning("Missing equity curve data")
             # Create a simple placeholder chart
-            plt.text(0.5, 0.5, 'Insufficient data for equity curve',
-                     horizontalalignment='center', verticalalignment='center')
+            ax.text(0.5, 0.5, 'Insufficient data for equity curve',
+                    horizontalalignment='center', verticalalignment='center')
         else:
             # Ensure both lists have the same length
             min_length = min(len(dates), len(equity_curve))
             dates = dates[:min_length]
             equity_curve = equity_curve[:min_length]
 
-            plt.plot(dates, equity_curve, label='Equity Curve')
+            points = chart_indices(dates, equity_curve, self.max_points, self._marker_dates())
+            ax.plot(_take(dates, points), _take(equity_curve, points), label='Equity Curve')
 
-        plt.title('Equity Curve')
-        plt.xlabel('Date')
-        plt.ylabel('Portfolio Value ($)')
-        plt.grid(True)
+        ax.set_title('Equity Curve')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Portfolio Value ($)')
+        ax.grid(True)
 
-        equity_path = 'equity_curve.png'
-        plt.savefig(equity_path)
-        plt.close()
-        return equity_path
+        return _render_png(fig)
+
+    def _marker_dates(self) -> List:
+        """Dates of all buy and sell markers"""
+        return list(self.results.get('buy_dates', [])) + list(self.results.get('sell_dates', []))
+
+    def config_rows(self) -> List[List[str]]:
+        """Configuration table rows, formatted for display"""
+        return [
+            ["Symbol", self.config.symbol],
+            ["Start Date", self.config.start_date],
+            ["End Date", self.config.end_date],
+            ["Initial Capital", f"${self.config.initial_capital:,.2f}"],
+            ["EMA Short", str(self.config.ema_short)],
+            ["EMA Long", str(self.config.ema_long)],
+            ["Volume Threshold", str(self.config.volume_threshold)],
+            ["Stop Loss", f"{self.config.stop_loss:.1%}"],
+            ["Take Profit", f"{self.config.take_profit:.1%}"]
+        ]
+
+    def metrics_rows(self) -> List[List[str]]:
+        """Performance metrics table rows, formatted for display"""
+        return [
+            ["Total Trades", str(self.analysis.get('total_trades', 0))],
+            ["Winning Trades", str(self.analysis.get('winning_trades', 0))],
+            ["Win Rate",
+             f"{self.analysis.get('winning_trades', 0) / max(self.analysis.get('total_trades', 1), 1):.1%}"],
+            ["Total Profit", f"${self.analysis.get('total_profit', 0):,.2f}"],
+            ["Max Drawdown", f"{self.analysis.get('max_drawdown', 0):.1%}"],
+            ["Sharpe Ratio", f"{self.analysis.get('sharpe_ratio', 0):.2f}"],
+            ["Final Portfolio Value", f"${self.final_portfolio_value:,.2f}"]
+        ]
 
     def generate_pdf_report(self):
         """Generate PDF report with all trading statistics and charts"""
-        report_dir = "../report"
-        if not os.path.exists(report_dir):
-            os.makedirs(report_dir)
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
 
-        report_filename = os.path.join(report_dir,
-                                       f"trading_report_{self.config.symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+        report_filename = self._report_path('pdf')
         doc = SimpleDocTemplate(report_filename, pagesize=letter)
         styles = getSampleStyleSheet()
         story = []
@@ -137,18 +204,7 @@ class TradingReport:
 
         # Configuration Section
         story.append(Paragraph("Trading Configuration", styles['Heading2']))
-        config_data = [
-            ["Parameter", "Value"],
-            ["Symbol", self.config.symbol],
-            ["Start Date", self.config.start_date],
-            ["End Date", self.config.end_date],
-            ["Initial Capital", f"${self.config.initial_capital:,.2f}"],
-            ["EMA Short", str(self.config.ema_short)],
-            ["EMA Long", str(self.config.ema_long)],
-            ["Volume Threshold", str(self.config.volume_threshold)],
-            ["Stop Loss", f"{self.config.stop_loss:.1%}"],
-            ["Take Profit", f"{self.config.take_profit:.1%}"]
-        ]
+        config_data = [["Parameter", "Value"]] + self.config_rows()
         config_table = Table(config_data)
         config_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
@@ -168,17 +224,7 @@ class TradingReport:
 
         # Performance Metrics
         story.append(Paragraph("Performance Metrics", styles['Heading2']))
-        metrics_data = [
-            ["Metric", "Value"],
-            ["Total Trades", str(self.analysis.get('total_trades', 0))],
-            ["Winning Trades", str(self.analysis.get('winning_trades', 0))],
-            ["Win Rate",
-             f"{self.analysis.get('winning_trades', 0) / max(self.analysis.get('total_trades', 1), 1):.1%}"],
-            ["Total Profit", f"${self.analysis.get('total_profit', 0):,.2f}"],
-            ["Max Drawdown", f"{self.analysis.get('max_drawdown', 0):.1%}"],
-            ["Sharpe Ratio", f"{self.analysis.get('sharpe_ratio', 0):.2f}"],
-            ["Final Portfolio Value", f"${self.final_portfolio_value:,.2f}"]
-        ]
+        metrics_data = [["Metric", "Value"]] + self.metrics_rows()
         metrics_table = Table(metrics_data)
         metrics_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
@@ -198,23 +244,86 @@ class TradingReport:
 
         # Add charts
         story.append(Paragraph("Trading Charts", styles['Heading2']))
-        chart_path = self.create_charts()
-        story.append(Image(chart_path, width=500, height=300))
+        story.append(Image(self.create_charts(), width=500, height=300))
         story.append(Spacer(1, 20))
         story.append(Paragraph("Equity Curve", styles['Heading2']))
-        equity_path = self.create_equity_curve()
-        story.append(Image(equity_path, width=500, height=300))
+        story.append(Image(self.create_equity_curve(), width=500, height=300))
 
         # Generate PDF
         doc.build(story)
         self.logger.info(f"PDF report generated: {report_filename}")
 
-        # Clean up temporary image files
-        os.remove(chart_path)
-        os.remove(equity_path)
+        return report_filename
 
+    def report_data(self) -> Dict:
+        """Config, raw and formatted metrics as a JSON-serializable dict"""
+        initial_capital = self.config.initial_capital
+        return {
+            'symbol': self.config.symbol,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'config': dataclasses.asdict(self.config) if dataclasses.is_dataclass(self.config) else {},
+            'config_table': self.config_rows(),
+            'metrics': {key: value for key, value in self.analysis.items() if _is_scalar(value)},
+            'metrics_table': self.metrics_rows(),
+            'final_portfolio_value': self.final_portfolio_value,
+            'total_return': (self.final_portfolio_value - initial_capital) / initial_capital,
+        }
+
+    def generate_json_report(self) -> str:
+        """Write the config and metrics to JSON, without charts"""
+        report_filename = self._report_path('json')
+        with open(report_filename, 'w') as f:
+            json.dump(self.report_data(), f, default=_json_default, indent=1)
+        self.logger.info(f"JSON report generated: {report_filename}")
+        return report_filename
+
+    def generate_html_report(self) -> str:
+        """
+        Write the JSON report plus a self-contained HTML page drawing the
+        downsampled price and equity series on canvases, without any external
+        scripts
+        """
+        self.generate_json_report()
+        payload = dict(self.report_data(), series=self._chart_series())
+        report_filename = self._report_path('html')
+        with open(report_filename, 'w') as f:
+            f.write(HTML_TEMPLATE
+                    .replace('__TITLE__', f"Trading Report - {_html_escape(self.config.symbol)}")
+                    .replace('__DATA__', json.dumps(payload, default=_json_default, separators=(',', ':'))
+                             .replace('</', '<\\/')))
+        self.logger.info(f"HTML report generated: {report_filename}")
         return report_filename
 
+    def _chart_series(self) -> Dict:
+        """Downsampled chart lines and markers, with dates as epoch milliseconds"""
+        series = {}
+        dates = self.results.get('dates', [])
+        prices = self.results.get('prices', [])
+        if len(dates) and len(prices):
+            points = chart_indices(dates, prices, self.max_points, self._marker_dates())
+            series['dates'] = _epoch_ms(_take(dates, points))
+            for key in ('prices', 'ema_short', 'ema_long'):
+                if len(self.results.get(key, [])):
+                    series[key] = _compact(_take(self.results[key], points))
+
+        equity_curve = self.results.get('equity_curve', [])
+        if len(dates) and len(equity_curve):
+            n = min(len(dates), len(equity_curve))
+            points = chart_indices(dates[:n], equity_curve[:n], self.max_points, self._marker_dates())
+            series['equity_dates'] = _epoch_ms(_take(dates[:n], points))
+            series['equity_curve'] = _compact(_take(equity_curve[:n], points))
+
+        for side in ('buy', 'sell'):
+            marker_dates = self.results.get(f'{side}_dates', [])
+            if len(marker_dates):
+                series[f'{side}_dates'] = _epoch_ms(marker_dates)
+                series[f'{side}_prices'] = _compact(self.results.get(f'{side}_prices', []))
+        return series
+
+    def _report_path(self, extension: str) -> str:
+        os.makedirs(self.report_dir, exist_ok=True)
+        return os.path.join(self.report_dir, f"{self.report_stem}.{extension}")
+
     def generate_report(self):
         """Main method to generate the complete report"""
         self.logger.info("Starting report generation...")
@@ -223,6 +332,176 @@ class TradingReport:
         self.logger.info(
             f"Total return: {((self.final_portfolio_value - self.config.initial_capital) / self.config.initial_capital):,.2%}")
 
-        report_file = self.generate_pdf_report()
+        with instrumentation.stage('report'):
+            if self.output_format == 'json':
+                report_file = self.generate_json_report()
+            elif self.output_format == 'html':
+                report_file = self.generate_html_report()
+            else:
+                report_file = self.generate_pdf_report()
+        if instrumentation.enabled():
+            instrumentation.count('report_bytes_written', os.path.getsize(report_file), format=self.output_format)
         self.logger.info("Report generation completed.")
-        return report_file
\ No newline at end of file
+        return report_file
+
+
+def _take(values: Sequence, points: np.ndarray) -> List:
+    """Values at the given positions"""
+    if len(points) == len(values):
+        return values
+    if isinstance(values, (np.ndarray, pd.Index)):
+        return values[points]
+    return [values[i] for i in points]
+
+
+def _render_png(fig: 'Figure') -> io.BytesIO:
+    """Render a figure with the Agg canvas into a PNG buffer positioned at its start"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    buffer.seek(0)
+    return buffer
+
+
+def _generate_one(job: Tuple) -> str:
+    config, results, analysis, report_dir, output_format = job
+    return TradingReport(config, results, analysis, report_dir=report_dir,
+                         output_format=output_format).generate_report()
+
+
+def generate_reports(jobs: Sequence[Tuple], report_dir: str = "../report",
+                     max_workers: Optional[int] = None, chunksize: int = 4,
+                     output_format: str = 'pdf') -> List[str]:
+    """
+    Generate the reports of many backtests across a process pool.
+
+    Charts are rendered in memory and every report is written to its own
+    file, so workers share no files.
+
+    Args:
+        jobs: (config, results, analysis) per report
+        report_dir: Directory the PDF files are written to
+        max_workers: Worker processes (None uses the CPU count, 1 runs inline)
+        chunksize: Reports handed to a worker at a time
+        output_format: 'pdf', 'json' or 'html', see TradingReport
+
+    Returns:
+        List[str]: Report file paths, in the order of jobs
+    """
+    tasks = [(config, results, analysis, report_dir, output_format) for config, results, analysis in jobs]
+    if max_workers == 1:
+        return [_generate_one(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_generate_one, tasks, chunksize=chunksize))
+
+
+def _is_scalar(value) -> bool:
+    return isinstance(value, (str, bool, int, float, np.generic)) or value is None
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _epoch_ms(dates: Sequence) -> List[int]:
+    return (pd.DatetimeIndex(dates).as_unit('ms').asi8).tolist()
+
+
+def _compact(values: Sequence) -> List:
+    """Values rounded to 4 decimals, NaN as null, to keep the embedded JSON small"""
+    values = np.round(np.asarray(values, dtype=np.float64), 4)
+    return [None if np.isnan(value) else value for value in values.tolist()]
+
+
+def _html_escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 1.5em; }
+th, td { border: 1px solid #444; padding: 4px 12px; text-align: center; }
+th { background: #888; color: #fff; }
+td { background: #f5f5dc; }
+canvas { border: 1px solid #ccc; margin-bottom: 1.5em; }
+</style>
+</head>
+<body>
+<h1>__TITLE__</h1>
+<h2>Trading Configuration</h2><table id="config"></table>
+<h2>Performance Metrics</h2><table id="metrics"></table>
+<h2>Trading Chart</h2><canvas id="price" width="1000" height="400"></canvas>
+<h2>Equity Curve</h2><canvas id="equity" width="1000" height="400"></canvas>
+<script id="report-data" type="application/json">__DATA__</script>
+<script>
+const report = JSON.parse(document.getElementById('report-data').textContent);
+
+function fillTable(id, header, rows) {
+  const table = document.getElementById(id);
+  [header].concat(rows).forEach((row, i) => {
+    const tr = table.insertRow();
+    row.forEach(cell => {
+      const td = document.createElement(i ? 'td' : 'th');
+      td.textContent = cell;
+      tr.appendChild(td);
+    });
+  });
+}
+
+function draw(id, x, lines, markers) {
+  const canvas = document.getElementById(id), ctx = canvas.getContext('2d');
+  if (!x || !x.length) { ctx.fillText('Insufficient data', 20, 20); return; }
+  const pad = 50, w = canvas.width - 2 * pad, h = canvas.height - 2 * pad;
+  const values = lines.flatMap(l => l.y).concat(markers.flatMap(m => m.y)).filter(v => v !== null);
+  const lo = Math.min(...values), hi = Math.max(...values), x0 = x[0], x1 = x[x.length - 1];
+  const px = t => pad + (x1 > x0 ? (t - x0) / (x1 - x0) : 0.5) * w;
+  const py = v => pad + (hi > lo ? (hi - v) / (hi - lo) : 0.5) * h;
+  ctx.strokeStyle = '#ccc'; ctx.strokeRect(pad, pad, w, h);
+  ctx.fillStyle = '#222';
+  ctx.fillText(hi.toFixed(2), 2, pad); ctx.fillText(lo.toFixed(2), 2, pad + h);
+  ctx.fillText(new Date(x0).toISOString().slice(0, 10), pad, pad + h + 15);
+  ctx.fillText(new Date(x1).toISOString().slice(0, 10), pad + w - 60, pad + h + 15);
+  lines.forEach((line, n) => {
+    ctx.strokeStyle = line.color; ctx.beginPath();
+    let pen = false;
+    line.y.forEach((v, i) => {
+      if (v === null) { pen = false; return; }
+      pen ? ctx.lineTo(px(x[i]), py(v)) : ctx.moveTo(px(x[i]), py(v));
+      pen = true;
+    });
+    ctx.stroke();
+    ctx.fillStyle = line.color; ctx.fillText(line.label, pad + 10 + 110 * n, pad - 10);
+  });
+  markers.forEach(m => {
+    ctx.fillStyle = m.color;
+    m.x.forEach((t, i) => {
+      const cx = px(t), cy = py(m.y[i]), d = m.up ? 6 : -6;
+      ctx.beginPath(); ctx.moveTo(cx, cy - d); ctx.lineTo(cx - 5, cy + d); ctx.lineTo(cx + 5, cy + d); ctx.fill();
+    });
+  });
+}
+
+const s = report.series, c = report.config;
+fillTable('config', ['Parameter', 'Value'], report.config_table);
+fillTable('metrics', ['Metric', 'Value'], report.metrics_table);
+draw('price', s.dates, [
+  {y: s.prices || [], color: '#1f77b4', label: 'Price'},
+  {y: s.ema_short || [], color: '#ff7f0e', label: 'EMA ' + c.ema_short},
+  {y: s.ema_long || [], color: '#2ca02c', label: 'EMA ' + c.ema_long}
+].filter(l => l.y.length), [
+  {x: s.buy_dates || [], y: s.buy_prices || [], color: 'green', up: true},
+  {x: s.sell_dates || [], y: s.sell_prices || [], color: 'red', up: false}
+]);
+draw('equity', s.equity_dates, [{y: s.equity_curve || [], color: '#1f77b4', label: 'Equity Curve'}], []);
+</script>
+</body>
+</html>
+"""
@@ -1,13 +1,35 @@
 from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series]
 
 
 @dataclass
 class CPRLevels:
+    __slots__ = ('pivot', 'bc', 'tc')
+
     pivot: float
     bc: float
     tc: float
 
 
+@dataclass
+class CPRLevelsArray:
+    """CPR levels for many bars, one array per level"""
+    pivot: np.ndarray
+    bc: np.ndarray
+    tc: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pivot)
+
+    def __getitem__(self, i: int) -> CPRLevels:
+        return CPRLevels(pivot=self.pivot[i], bc=self.bc[i], tc=self.tc[i])
+
+
 class CPRCalculator:
     @staticmethod
     def calculate(high: float, low: float, close: float) -> CPRLevels:
@@ -18,7 +40,25 @@ class CPRCalculator:
 
         return CPRLevels(pivot=pivot, bc=bc, tc=tc)
 
+    @staticmethod
+    def calculate_batch(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> CPRLevelsArray:
+        """Calculate CPR levels for arrays of price data"""
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+
+        pivot = (high + low + close) / 3
+        bc = (high + low) / 2
+        tc = (pivot - bc) + pivot
+
+        return CPRLevelsArray(pivot=pivot, bc=bc, tc=tc)
+
     @staticmethod
     def is_price_above_tc(price: float, cpr: CPRLevels) -> bool:
         """Check if price is above TC level"""
         return price > cpr.tc
+
+    @staticmethod
+    def is_price_above_tc_batch(price: ArrayLike, cpr: CPRLevelsArray) -> np.ndarray:
+        """Boolean mask of bars whose price is above the TC level"""
+        return np.asarray(price, dtype=np.float64) > cpr.tc
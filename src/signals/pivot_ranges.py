@@ -1,8 +1,16 @@
 from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series]
 
 
 @dataclass
 class PivotLevels:
+    __slots__ = ('pivot', 'r1', 'r2', 'r3', 's1', 's2', 's3')
+
     pivot: float
     r1: float
     r2: float
@@ -12,6 +20,32 @@ class PivotLevels:
     s3: float
 
 
+@dataclass
+class PivotLevelsArray:
+    """Pivot levels for many bars, one array per level"""
+    pivot: np.ndarray
+    r1: np.ndarray
+    r2: np.ndarray
+    r3: np.ndarray
+    s1: np.ndarray
+    s2: np.ndarray
+    s3: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pivot)
+
+    def __getitem__(self, i: int) -> PivotLevels:
+        return PivotLevels(
+            pivot=self.pivot[i],
+            r1=self.r1[i],
+            r2=self.r2[i],
+            r3=self.r3[i],
+            s1=self.s1[i],
+            s2=self.s2[i],
+            s3=self.s3[i]
+        )
+
+
 class PivotCalculator:
     @staticmethod
     def calculate(high: float, low: float, close: float) -> PivotLevels:
@@ -38,7 +72,35 @@ class PivotCalculator:
             s3=s3
         )
 
+    @staticmethod
+    def calculate_batch(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> PivotLevelsArray:
+        """Calculate pivot points and support/resistance levels for arrays of price data"""
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+
+        pivot = (high + low + close) / 3
+        price_range = high - low
+
+        return PivotLevelsArray(
+            pivot=pivot,
+            r1=(2 * pivot) - low,
+            r2=pivot + price_range,
+            r3=high + 2 * (pivot - low),
+            s1=(2 * pivot) - high,
+            s2=pivot - price_range,
+            s3=low - 2 * (high - pivot)
+        )
+
     @staticmethod
     def is_price_near_level(price: float, level: float, threshold: float = 0.001) -> bool:
         """Check if price is near a pivot level"""
-        return abs(price - level) / level < threshold
\ No newline at end of file
+        return abs(price - level) / level < threshold
+
+    @staticmethod
+    def is_price_near_level_batch(price: ArrayLike, level: ArrayLike, threshold: float = 0.001) -> np.ndarray:
+        """Boolean mask of bars whose price is near the matching pivot level"""
+        price = np.asarray(price, dtype=np.float64)
+        level = np.asarray(level, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.abs(price - level) / level < threshold
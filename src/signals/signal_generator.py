@@ -1,15 +1,25 @@
+from typing import Tuple
+
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from config.config import TradingConfig
 from .cpr import CPRCalculator, CPRLevels
 from .ema import EMACalculator
-from .pivot_ranges import PivotCalculator, PivotLevels
+from .pivot_ranges import PivotCalculator, PivotLevels, PivotLevelsArray
 from ..data.data_loader import DataLoader
 
+# Number of previous bars averaged for the volume filter
+VOLUME_LOOKBACK = 20
+# Bars evaluated per block, bounding the temporaries of the vectorized path
+SIGNAL_CHUNK_BARS = 1_000_000
+
 
 class SignalGenerator:
     def __init__(self, config: 'TradingConfig'):
         self.config = config
+        self.chunk_bars = SIGNAL_CHUNK_BARS
         self.data_loader = DataLoader(
             config.symbol,
             config.start_date,
@@ -30,6 +40,103 @@ class SignalGenerator:
             self.config.ema_long
         )
 
+        entries = self._entry_mask(
+            data,
+            signals['EMA_short'].to_numpy(),
+            signals['EMA_long'].to_numpy()
+        )
+        signals['signal'] = entries.astype(np.int64)
+
+        return signals
+
+    def _entry_mask(self, data: pd.DataFrame, ema_short: np.ndarray, ema_long: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the entry conditions for every bar as whole-column operations,
+        in blocks of chunk_bars to bound memory on very long histories.
+        Mirrors _check_entry_conditions applied to the previous bar's levels,
+        or to the previous session's levels when config.intraday is set.
+        """
+        price = data['Close'].to_numpy(dtype=np.float64)
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        volume = data['Volume'].to_numpy()
+        avg_volume = rolling_volume_mean(volume)
+
+        if self.config.intraday:
+            session_of_bar, session_high, session_low, session_close = session_levels(
+                data.index, high, low, price
+            )
+
+        n = len(data)
+        entries = np.zeros(n, dtype=bool)
+        for start in range(0, n, self.chunk_bars):
+            block = slice(start, min(start + self.chunk_bars, n))
+            if self.config.intraday:
+                sessions = session_of_bar[block]
+                levels = (session_high[sessions], session_low[sessions], session_close[sessions])
+            else:
+                levels = tuple(
+                    previous_bar(values[block]) if start == 0 else values[start - 1:block.stop - 1]
+                    for values in (high, low, price)
+                )
+            entries[block] = self._entry_block(
+                price[block],
+                levels,
+                volume[block],
+                avg_volume[block],
+                ema_short[block],
+                ema_long[block]
+            )
+
+        return entries
+
+    def _entry_block(self, price: np.ndarray, levels: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                     volume: np.ndarray, avg_volume: np.ndarray,
+                     ema_short: np.ndarray, ema_long: np.ndarray) -> np.ndarray:
+        """Entry conditions for one block given the high/low/close the levels derive from"""
+        cpr = CPRCalculator.calculate_batch(*levels)
+        pivot_levels = PivotCalculator.calculate_batch(*levels)
+
+        with np.errstate(invalid='ignore'):
+            basic_conditions = (
+                    CPRCalculator.is_price_above_tc_batch(price, cpr) &
+                    (ema_short > ema_long) &
+                    (volume > (avg_volume * self.config.volume_threshold))
+            )
+
+        pivot_conditions = self.pivot_mask(price, pivot_levels, self.config.pivot_threshold)
+
+        return basic_conditions & pivot_conditions
+
+    @staticmethod
+    def pivot_mask(price: np.ndarray, pivot_levels: PivotLevelsArray, threshold: float) -> np.ndarray:
+        """Vectorized counterpart of _check_pivot_conditions"""
+        near_resistance = (
+                PivotCalculator.is_price_near_level_batch(price, pivot_levels.r1, threshold) |
+                PivotCalculator.is_price_near_level_batch(price, pivot_levels.r2, threshold) |
+                PivotCalculator.is_price_near_level_batch(price, pivot_levels.r3, threshold)
+        )
+
+        return (price > pivot_levels.pivot) & ~near_resistance & (price > pivot_levels.s1)
+
+    def generate_signals_iterative(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reference per-bar implementation of generate_signals with previous-bar
+        levels. Kept for validating the vectorized path; far slower on long
+        histories.
+        """
+        signals = pd.DataFrame(index=data.index)
+
+        # Calculate EMAs
+        signals['EMA_short'] = EMACalculator.calculate(
+            data['Close'],
+            self.config.ema_short
+        )
+        signals['EMA_long'] = EMACalculator.calculate(
+            data['Close'],
+            self.config.ema_long
+        )
+
         signals['signal'] = 0
 
         for i in range(1, len(data)):
@@ -101,13 +208,91 @@ class SignalGenerator:
         above_pivot = price > pivot_levels.pivot
 
         # 2. Check if price is not near major resistance levels (avoid entering near resistance)
+        threshold = self.config.pivot_threshold
         not_near_resistance = not any([
-            PivotCalculator.is_price_near_level(price, pivot_levels.r1),
-            PivotCalculator.is_price_near_level(price, pivot_levels.r2),
-            PivotCalculator.is_price_near_level(price, pivot_levels.r3)
+            PivotCalculator.is_price_near_level(price, pivot_levels.r1, threshold),
+            PivotCalculator.is_price_near_level(price, pivot_levels.r2, threshold),
+            PivotCalculator.is_price_near_level(price, pivot_levels.r3, threshold)
         ])
 
         # 3. Price should be above S1 for trend confirmation
         above_s1 = price > pivot_levels.s1
 
-        return above_pivot and not_near_resistance and above_s1
\ No newline at end of file
+        return above_pivot and not_near_resistance and above_s1
+
+
+def previous_bar(values: np.ndarray) -> np.ndarray:
+    """Shift values forward by one bar, leaving NaN on the first bar"""
+    shifted = np.empty(len(values), dtype=np.float64)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def session_levels(index: pd.DatetimeIndex, high: np.ndarray, low: np.ndarray,
+                   close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Previous trading session's high/low/close for intraday bars.
+
+    Sessions are calendar days in the index's own timezone. Bars must be in
+    time order. Sessions are aggregated in one reduceat pass.
+
+    Returns:
+        Tuple of the session number of every bar and, per session, the
+        high/low/close of the session before it (NaN for the first session).
+        Index the per-session arrays with the session numbers to broadcast
+        the levels back onto the bars.
+    """
+    local = index.tz_localize(None) if index.tz is not None else index
+    days = local.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+
+    new_session = np.empty(len(days), dtype=bool)
+    new_session[:1] = True
+    new_session[1:] = days[1:] != days[:-1]
+    starts = np.flatnonzero(new_session)
+    session_of_bar = np.cumsum(new_session) - 1
+
+    if not len(starts):
+        empty = np.empty(0, dtype=np.float64)
+        return session_of_bar, empty, empty, empty
+
+    ends = np.append(starts[1:], len(days))
+    return (
+        session_of_bar,
+        previous_bar(np.fmax.reduceat(high, starts)),
+        previous_bar(np.fmin.reduceat(low, starts)),
+        previous_bar(close[ends - 1])
+    )
+
+
+def rolling_volume_mean(volume: np.ndarray, lookback: int = VOLUME_LOOKBACK) -> np.ndarray:
+    """
+    Mean volume over the `lookback` bars preceding each bar.
+    Matches Series.iloc[i - lookback:i].mean() of the per-bar loop, including
+    NaN skipping and the wrap-around slice it produces on very short histories.
+    """
+    n = len(volume)
+    avg_volume = np.full(n, np.nan)
+
+    if volume.dtype.kind in 'iub':
+        filled = volume.astype(np.int64)
+        valid = np.ones(n, dtype=np.int64)
+    else:
+        values = volume.astype(np.float64)
+        valid = (~np.isnan(values)).astype(np.int64)
+        filled = np.where(valid.astype(bool), values, 0.0)
+
+    if n > lookback:
+        sums = sliding_window_view(filled, lookback)[:-1].sum(axis=1)
+        counts = sliding_window_view(valid, lookback)[:-1].sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_volume[lookback:] = sums / counts.astype(np.float64)
+    elif n > 1:
+        # Negative slice starts wrap around when the history is shorter than the lookback
+        for i in range(1, n):
+            start = max(i - lookback + n, 0)
+            count = valid[start:i].sum()
+            if count:
+                avg_volume[i] = filled[start:i].sum() / np.float64(count)
+
+    return avg_volume
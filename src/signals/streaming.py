@@ -0,0 +1,138 @@
+import math
+from typing import Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from .cpr import CPRCalculator
+from .pivot_ranges import PivotCalculator
+from .signal_generator import SignalGenerator, VOLUME_LOOKBACK
+
+
+class RecursiveEMA:
+    """
+    EMA updated one value at a time.
+    Reproduces Series.ewm(span=span, adjust=False).mean() bit for bit,
+    including its handling of missing values.
+    """
+    __slots__ = ('com', 'alpha', 'old_wt_factor', 'old_wt', 'value')
+
+    def __init__(self, span: int):
+        self.com = (span - 1) / 2.0
+        self.alpha = 1. / (1. + self.com)
+        self.old_wt_factor = 1. - self.alpha
+        self.old_wt = 1.
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        """Add one observation and return the current EMA"""
+        if self.value is None:
+            self.value = x
+            return x
+
+        is_observation = not math.isnan(x)
+        if not math.isnan(self.value):
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                # pandas re-derives the new weight after gaps when com == 1
+                new_wt = 1. - self.old_wt if self.com == 1 else self.alpha
+                # Same update order as pandas, which skips it on constant input
+                if self.value != x:
+                    self.value = self.old_wt * self.value + new_wt * x
+                    self.value /= (self.old_wt + new_wt)
+                self.old_wt = 1.
+        elif is_observation:
+            self.value = x
+        return self.value
+
+
+class StreamingSignalEngine:
+    """
+    Incremental counterpart of SignalGenerator.generate_signals.
+
+    Keeps recursive EMAs, a ring buffer of the last VOLUME_LOOKBACK volumes
+    and the previous bar's high/low/close (with config.intraday, the running
+    levels of the current session and the levels of the previous one), so
+    each update() runs in constant time and memory. On histories of at least
+    VOLUME_LOOKBACK bars the signals equal the batch generator's.
+    """
+
+    def __init__(self, config: TradingConfig):
+        self.config = config
+        self.ema_short = RecursiveEMA(config.ema_short)
+        self.ema_long = RecursiveEMA(config.ema_long)
+        self.signal_generator = SignalGenerator(config)
+        self._volumes = np.full(VOLUME_LOOKBACK, np.nan)
+        self._head = 0
+        self._bars = 0
+        self._previous: Optional[Tuple[float, float, float]] = None
+        # Intraday: calendar day and running high/low/close of the current session
+        self._session_day = None
+        self._session: Optional[Tuple[float, float, float]] = None
+
+    def update(self, bar: Mapping, timestamp: Optional[pd.Timestamp] = None) -> int:
+        """
+        Feed the next bar and return its signal (1 to enter, 0 otherwise).
+
+        Args:
+            bar: Mapping with High, Low, Close and Volume entries
+            timestamp: The bar's time, required with config.intraday to tell
+                sessions apart (calendar days in the timestamp's own timezone)
+        """
+        if self.config.intraday:
+            if timestamp is None:
+                raise ValueError("Intraday signals need each bar's timestamp")
+            self._update_session(bar, timestamp.date())
+
+        price = bar['Close']
+        volume = bar['Volume']
+        ema_short = self.ema_short.update(price)
+        ema_long = self.ema_long.update(price)
+
+        signal = 0
+        if self._previous is not None:
+            cpr = CPRCalculator.calculate(*self._previous)
+            pivot_levels = PivotCalculator.calculate(*self._previous)
+            if self.signal_generator._check_entry_conditions(
+                    price,
+                    cpr,
+                    pivot_levels,
+                    ema_short,
+                    ema_long,
+                    volume,
+                    self._average_volume()
+            ):
+                signal = 1
+
+        self._volumes[self._head] = volume
+        self._head = (self._head + 1) % VOLUME_LOOKBACK
+        self._bars += 1
+        if not self.config.intraday:
+            self._previous = (bar['High'], bar['Low'], price)
+        return signal
+
+    def _update_session(self, bar: Mapping, day):
+        """Roll the session levels forward; _previous holds the last completed session's"""
+        if day != self._session_day:
+            if self._session is not None:
+                self._previous = self._session
+            self._session_day = day
+            high = low = np.nan
+        else:
+            high, low, _ = self._session
+        # NaN-skipping like the batch path's fmax/fmin session aggregation
+        self._session = (np.fmax(high, bar['High']), np.fmin(low, bar['Low']), bar['Close'])
+
+    def _average_volume(self) -> float:
+        """Mean of the buffered volumes in arrival order, NaN until the buffer is full"""
+        if self._bars < VOLUME_LOOKBACK:
+            return np.nan
+
+        # Sum oldest to newest, matching Series.mean() over the same slice
+        window = np.concatenate((self._volumes[self._head:], self._volumes[:self._head]))
+        valid = ~np.isnan(window)
+        count = valid.sum()
+        if not count:
+            return np.nan
+        return np.where(valid, window, 0.0).sum() / np.float64(count)
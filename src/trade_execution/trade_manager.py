@@ -1,8 +1,12 @@
 from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
 from config.config import TradingConfig
 
+# Bars compared per vectorized exit scan; doubles while no exit is found
+EXIT_SCAN_CHUNK = 256
+
 
 class TradeManager:
     def __init__(self, config: 'TradingConfig'):
@@ -12,7 +16,77 @@ class TradeManager:
         self.equity_curve: List[float] = []
 
     def execute_trades(self, data: pd.DataFrame, signals: pd.DataFrame) -> Dict:
-        """Execute trades based on signals"""
+        """
+        Execute trades based on signals.
+        Jumps from event to event (next entry signal, then the first stop-loss or
+        take-profit breach) instead of visiting every bar, so the cost grows with
+        the number of trades. Produces the same trades and equity curve as
+        execute_trades_iterative.
+        """
+        equity = self.config.initial_capital
+        prices = data['Close'].to_numpy()
+        entries = np.flatnonzero(signals['signal'].to_numpy() == 1)
+        n = len(data)
+
+        # Equity changes only on exit bars; remember where and to what value
+        exit_bars: List[int] = []
+        exit_equity: List[float] = []
+
+        i = 0
+        while i < n:
+            if self.current_position is None:
+                k = np.searchsorted(entries, i)
+                if k == len(entries):
+                    break
+                i = int(entries[k])
+                self._enter_trade(data.index[i], prices[i], i)
+            else:
+                exit_bar = self._find_exit(prices, i)
+                if exit_bar is None:
+                    break
+                i = exit_bar
+                profit = self._exit_trade(data.index[i], prices[i], i)
+                equity += profit
+                exit_bars.append(i)
+                exit_equity.append(equity)
+            i += 1
+
+        # Forward-fill equity between exits: entry 0 is the starting capital and
+        # entry i + 1 is the equity after bar i
+        self.equity_curve = []
+        value = self.config.initial_capital
+        start = 0
+        for exit_bar, new_value in zip(exit_bars, exit_equity):
+            self.equity_curve.extend([value] * (exit_bar + 1 - start))
+            value, start = new_value, exit_bar + 1
+        self.equity_curve.extend([value] * (n + 1 - start))
+
+        return {
+            'trades': self.trades,
+            'equity_curve': self.equity_curve
+        }
+
+    def _find_exit(self, prices: np.ndarray, start: int) -> Optional[int]:
+        """Return the first bar at or after start that breaches stop loss or take profit"""
+        stop_loss = self.current_position['stop_loss']
+        take_profit = self.current_position['take_profit']
+        chunk = EXIT_SCAN_CHUNK
+
+        while start < len(prices):
+            window = prices[start:start + chunk]
+            hits = np.flatnonzero((window <= stop_loss) | (window >= take_profit))
+            if len(hits):
+                return start + int(hits[0])
+            start += chunk
+            chunk *= 2
+
+        return None
+
+    def execute_trades_iterative(self, data: pd.DataFrame, signals: pd.DataFrame) -> Dict:
+        """
+        Reference per-bar implementation of execute_trades.
+        Kept for validating the event-driven path.
+        """
         equity = self.config.initial_capital
         self.equity_curve = [equity]
 
@@ -22,7 +96,8 @@ class TradeManager:
                 if signals['signal'].iloc[i] == 1:
                     self._enter_trade(
                         data.index[i],
-                        data['Close'].iloc[i]
+                        data['Close'].iloc[i],
+                        i
                     )
             else:
                 # Check for exit
@@ -32,7 +107,8 @@ class TradeManager:
                 ):
                     profit = self._exit_trade(
                         data.index[i],
-                        data['Close'].iloc[i]
+                        data['Close'].iloc[i],
+                        i
                     )
                     equity += profit
 
@@ -43,10 +119,40 @@ class TradeManager:
             'equity_curve': self.equity_curve
         }
 
-    def _enter_trade(self, date: pd.Timestamp, price: float):
-        """Enter a new trade"""
+    def process_bar(self, date: pd.Timestamp, price: float, signal: int) -> Optional[Dict]:
+        """
+        Handle one live or replayed bar.
+        Applies the same entry and exit rules as execute_trades_iterative, one
+        bar at a time, and extends the equity curve.
+
+        Returns:
+            Dict: The simulated order (side, date, price, and profit on
+            exits) when the bar enters or exits a trade, otherwise None
+        """
+        if not self.equity_curve:
+            self.equity_curve.append(self.config.initial_capital)
+        equity = self.equity_curve[-1]
+        # Bars seen so far, as the position the batch paths would record
+        bar = len(self.equity_curve) - 1
+
+        order = None
+        if self.current_position is None:
+            if signal == 1:
+                self._enter_trade(date, price, bar)
+                order = {'side': 'BUY', 'date': date, 'price': price}
+        elif self._should_exit(price, self.current_position['entry_price']):
+            profit = self._exit_trade(date, price, bar)
+            equity += profit
+            order = {'side': 'SELL', 'date': date, 'price': price, 'profit': profit}
+
+        self.equity_curve.append(equity)
+        return order
+
+    def _enter_trade(self, date: pd.Timestamp, price: float, bar: int):
+        """Enter a new trade at bar position `bar`"""
         self.current_position = {
             'entry_date': date,
+            'entry_bar': bar,
             'entry_price': price,
             'stop_loss': price * (1 - self.config.stop_loss),
             'take_profit': price * (1 + self.config.take_profit)
@@ -62,8 +168,8 @@ class TradeManager:
                 current_price >= self.current_position['take_profit']
         )
 
-    def _exit_trade(self, date: pd.Timestamp, price: float) -> float:
-        """Exit the current trade and return profit/loss"""
+    def _exit_trade(self, date: pd.Timestamp, price: float, bar: int) -> float:
+        """Exit the current trade at bar position `bar` and return profit/loss"""
         if self.current_position is None:
             return 0.0
 
@@ -74,7 +180,10 @@ class TradeManager:
             'entry_price': self.current_position['entry_price'],
             'exit_date': date,
             'exit_price': price,
-            'profit': profit
+            'profit': profit,
+            # Positions in the data the trade was executed on
+            'entry_bar': self.current_position['entry_bar'],
+            'exit_bar': bar
         })
 
         self.current_position = None
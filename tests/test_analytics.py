@@ -0,0 +1,102 @@
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting.analytics import PerformanceAnalyzer, SCALAR_METRICS
+
+
+def make_run(n=500, seed=0, freq='D'):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-02 09:30', periods=n, freq=freq)
+    equity = np.r_[100000.0, 100000 + rng.normal(5, 200, n).cumsum()]
+    trades = []
+    for entry in range(5, n - 10, 40):
+        exit_bar = entry + 7
+        trades.append({'entry_date': dates[entry], 'entry_price': 100.0,
+                       'exit_date': dates[exit_bar], 'exit_price': 100.0 + (entry % 3 - 1),
+                       'profit': float(entry % 3 - 1)})
+    return dates, equity.tolist(), trades
+
+
+class TestPerformanceAnalyzer(unittest.TestCase):
+    def test_metrics_match_pandas_reference(self):
+        dates, equity, trades = make_run()
+        analysis = PerformanceAnalyzer.analyze(equity, trades, dates=dates)
+
+        series = pd.Series(equity)
+        returns = series.pct_change()
+        drawdown_pct = series / series.expanding().max() - 1.0
+        downside = np.sqrt((returns.dropna().clip(upper=0) ** 2).mean())
+        self.assertAlmostEqual(analysis['max_drawdown'], drawdown_pct.min())
+        self.assertAlmostEqual(analysis['sharpe_ratio'], returns.mean() / returns.std() * 252 ** 0.5)
+        self.assertAlmostEqual(analysis['sortino_ratio'], returns.mean() / downside * 252 ** 0.5)
+        self.assertAlmostEqual(analysis['calmar_ratio'], analysis['annual_return'] / -drawdown_pct.min())
+        np.testing.assert_allclose(analysis['drawdown_pct_series'], drawdown_pct)
+        np.testing.assert_allclose(analysis['drawdown_series'], series - series.expanding().max())
+
+        profits = [trade['profit'] for trade in trades]
+        self.assertEqual(analysis['total_trades'], len(trades))
+        self.assertEqual(analysis['winning_trades'], sum(profit > 0 for profit in profits))
+        self.assertEqual(analysis['losing_trades'], sum(profit < 0 for profit in profits))
+        self.assertAlmostEqual(analysis['total_profit'], sum(profits))
+        self.assertAlmostEqual(analysis['exposure'], 7 * len(trades) / (len(dates) - 1))
+        self.assertGreater(analysis['turnover'], 0)
+
+    def test_daily_performance_groups_intraday_bars(self):
+        dates, equity, trades = make_run(n=390 * 3, freq='min')
+        daily = PerformanceAnalyzer.analyze(equity, trades, dates=dates)['daily_performance']
+
+        frame = pd.DataFrame({'after': equity[1:], 'before': equity[:-1]}, index=dates)
+        grouped = frame.groupby(frame.index.date)
+        self.assertEqual(list(daily), [str(day) for day in grouped.groups])
+        for day, rows in grouped:
+            perf = daily[str(day)]
+            self.assertEqual(perf['starting_equity'], rows['before'].iloc[0])
+            self.assertEqual(perf['ending_equity'], rows['after'].iloc[-1])
+            self.assertAlmostEqual(perf['profit_loss'], rows['after'].iloc[-1] - rows['before'].iloc[0])
+        self.assertEqual(sum(perf['num_trades'] for perf in daily.values()), len(trades))
+        self.assertEqual(sum(perf['winning_trades'] for perf in daily.values()),
+                         sum(trade['profit'] > 0 for trade in trades))
+
+    def test_annualization_follows_bar_spacing(self):
+        sessions = pd.bdate_range('2024-01-02', periods=20)
+        intraday = pd.DatetimeIndex([day + pd.Timedelta(hours=9, minutes=30 + 5 * i)
+                                     for day in sessions for i in range(78)])
+        self.assertEqual(PerformanceAnalyzer.periods_per_year(intraday), 252 * 78)
+        self.assertEqual(PerformanceAnalyzer.periods_per_year(sessions), 252)
+        self.assertAlmostEqual(PerformanceAnalyzer.periods_per_year(pd.date_range('2024-01-05', periods=30, freq='W')),
+                               365.25 / 7)
+        self.assertEqual(PerformanceAnalyzer.periods_per_year(None), 252)
+
+        _, equity, trades = make_run(n=len(intraday))
+        returns = pd.Series(equity).pct_change()
+        analysis = PerformanceAnalyzer.analyze(equity, trades, dates=intraday, series=False)
+        self.assertAlmostEqual(analysis['sharpe_ratio'], returns.mean() / returns.std() * (252 * 78) ** 0.5)
+        explicit = PerformanceAnalyzer.analyze(equity, trades, dates=intraday, series=False, periods_per_year=252)
+        self.assertAlmostEqual(explicit['sharpe_ratio'], returns.mean() / returns.std() * 252 ** 0.5)
+
+    def test_empty_run(self):
+        analysis = PerformanceAnalyzer.analyze([100000.0], [], series=False)
+        self.assertEqual(set(analysis), set(SCALAR_METRICS))
+        self.assertEqual(analysis['max_drawdown'], 0.0)
+
+    def test_open_trade_counts_as_exposure_only(self):
+        dates, equity, trades = make_run(n=100)
+        trades.append({'entry_date': dates[90], 'entry_price': 100.0,
+                       'exit_date': None, 'exit_price': None, 'profit': None})
+        analysis = PerformanceAnalyzer.analyze(equity, trades, dates=dates)
+        self.assertAlmostEqual(analysis['total_profit'], sum(trade['profit'] or 0 for trade in trades))
+        self.assertAlmostEqual(analysis['exposure'], (7 * (len(trades) - 1) + 9) / 99)
+
+    def test_scalar_analysis_is_fast(self):
+        dates, equity, trades = make_run(n=5000)
+        start = time.perf_counter()
+        for _ in range(200):
+            PerformanceAnalyzer.analyze(equity, trades, dates=dates, series=False)
+        self.assertLess((time.perf_counter() - start) / 200, 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
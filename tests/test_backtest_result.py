@@ -0,0 +1,155 @@
+import json
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.backtesting.analytics import PerformanceAnalyzer
+from src.backtesting.backtest import Backtest
+from src.backtesting.backtest_result import BacktestResult
+from src.data.persistence_spool import PersistenceSpool
+from src.data.trading_data_persistence import TradingDataPersistence
+from src.reporting.trading_report import TradingReport
+from src.signals.signal_generator import SignalGenerator
+from src.trade_execution.trade_manager import TradeManager
+from tests.test_trading_data_persistence import RecordingCursor
+
+
+def make_frame(n, seed=0, freq='D'):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame({
+        'Open': close, 'High': close + spread, 'Low': close - spread, 'Close': close,
+        'Volume': rng.lognormal(13, 0.6, n)
+    }, index=pd.date_range('2023-01-02', periods=n, freq=freq, tz='America/New_York'))
+
+
+class TestBacktestResult(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST', start_date='2023-01-01', end_date='2024-01-01', initial_capital=100000,
+            ema_short=9, ema_long=20, volume_threshold=1.0, stop_loss=0.02, take_profit=0.03
+        )
+        self.data = make_frame(600)
+        backtest = Backtest(self.config)
+        with mock.patch.object(backtest.data_loader, 'fetch_data', return_value=self.data):
+            self.result = backtest.run()
+        self.backtest = backtest
+        self.signals = backtest.signal_generator.generate_signals(self.data)
+        self.trades = TradeManager(self.config).execute_trades(self.data, self.signals)['trades']
+
+    def test_columns_and_markers(self):
+        result = self.result
+        self.assertIsInstance(result, BacktestResult)
+        self.assertEqual(result['dates'].dtype, self.data.index.dtype)
+        self.assertTrue(result['dates'].equals(self.data.index))
+        np.testing.assert_array_equal(result['prices'], self.data['Close'])
+        # EMAs come from the signal generator, not the price frame
+        np.testing.assert_allclose(result['ema_short'], self.signals['EMA_short'])
+        np.testing.assert_allclose(result['ema_long'], self.signals['EMA_long'])
+        self.assertEqual(len(result['equity_curve']), len(self.data) + 1)
+
+        self.assertGreater(len(self.trades), 0)
+        self.assertEqual(result['trades'], self.trades)
+        self.assertEqual(list(result['buy_dates']), [trade['entry_date'] for trade in self.trades])
+        self.assertEqual(list(result['sell_dates']), [trade['exit_date'] for trade in self.trades])
+        np.testing.assert_array_equal(result['sell_prices'], [trade['exit_price'] for trade in self.trades])
+
+    def test_duplicate_timestamps(self):
+        # Merged feeds can repeat a timestamp; bar positions come from TradeManager
+        data = self.data.iloc[np.r_[0:300, 299:600]]
+        signals = SignalGenerator(self.config).generate_signals(data)
+        trade_results = TradeManager(self.config).execute_trades(data, signals)
+        result = BacktestResult.from_run(data, signals, trade_results)
+
+        self.assertFalse(data.index.is_unique)
+        self.assertEqual(result['trades'], trade_results['trades'])
+        self.assertEqual(list(result['buy_dates']), [trade['entry_date'] for trade in trade_results['trades']])
+        from_dicts = PerformanceAnalyzer.analyze(trade_results['equity_curve'], trade_results['trades'],
+                                                 dates=data.index, series=False)
+        from_log = PerformanceAnalyzer.analyze(result.equity_curve, result.trade_log,
+                                               dates=data.index, series=False)
+        self.assertEqual(from_dicts['exposure'], from_log['exposure'])
+
+    def test_conversions(self):
+        as_dict = self.result.to_dict()
+        self.assertIsInstance(as_dict['prices'], list)
+        self.assertEqual(as_dict['buy_dates'][0], self.trades[0]['entry_date'])
+
+        frame = self.result.to_frame()
+        self.assertEqual(len(frame), len(self.data))
+        self.assertEqual(frame['equity'].iloc[-1], self.result['equity_curve'][-1])
+
+        trades = self.result.trades_frame()
+        self.assertEqual(trades['exit_date'].tolist(), [trade['exit_date'] for trade in self.trades])
+
+    def test_analysis_matches_trade_dicts(self):
+        from_log = self.backtest.analyze_results()
+        self.backtest.results = self.result.to_dict()
+        from_dicts = self.backtest.analyze_results()
+        self.assertEqual(set(from_log), set(from_dicts))
+        for key in ('total_trades', 'total_profit', 'exposure', 'turnover', 'sharpe_ratio'):
+            self.assertAlmostEqual(from_log[key], from_dicts[key])
+        self.assertEqual(from_log['daily_performance'], from_dicts['daily_performance'])
+
+    def test_consumers_accept_result(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = PersistenceSpool(tmp)
+            _, results, _ = spool.load(spool.append(self.config, self.result, {'total_trades': 1}))
+            self.assertEqual(results['prices'], self.data['Close'].tolist())
+            self.assertEqual(results['trades'], self.trades)
+
+            analysis = self.backtest.analyze_results(series=False)
+            path = TradingReport(self.config, self.result, analysis, report_dir=tmp,
+                                 output_format='html').generate_report()
+            with open(path[:-len('html')] + 'json') as f:
+                report = json.load(f)
+        self.assertAlmostEqual(report['final_portfolio_value'], self.result['equity_curve'][-1])
+
+    def test_bulk_persist_keeps_trade_log_columnar(self):
+        cursor = RecordingCursor()
+        conn = mock.MagicMock()
+        conn.cursor.return_value = cursor
+        db = TradingDataPersistence({}, conn=conn)
+        analysis = self.backtest.analyze_results(series=False)
+
+        with mock.patch.object(BacktestResult, 'trades', side_effect=AssertionError('trade dicts built')):
+            db.write_all_data(self.config, self.result, dict(analysis, daily_performance={}))
+        self.assertTrue(any('staging_trades' in sql for sql, _ in cursor.copies))
+
+    def test_zero_trade_result_spools(self):
+        signals = self.signals.assign(signal=0)
+        trade_results = TradeManager(self.config).execute_trades(self.data, signals)
+        result = BacktestResult.from_run(self.data, signals, trade_results)
+        self.assertEqual(len(result['buy_dates']), 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = PersistenceSpool(tmp)
+            _, results, _ = spool.load(spool.append(self.config, result, {'total_trades': 0}))
+        self.assertEqual(results['trades'], [])
+        self.assertEqual(results['buy_dates'], [])
+        self.assertEqual(results['sell_prices'], [])
+        self.assertEqual(len(results['dates']), len(self.data))
+
+    def test_smaller_than_list_results(self):
+        data = make_frame(200_000, seed=1, freq='min')
+        signals = pd.DataFrame({'signal': np.zeros(len(data), dtype=np.int64)}, index=data.index)
+        trade_results = TradeManager(self.config).execute_trades(data, signals)
+
+        tracemalloc.start()
+        result = BacktestResult.from_run(data, signals, trade_results)
+        columnar = tracemalloc.get_traced_memory()[0]
+        as_dict = result.to_dict()
+        lists = tracemalloc.get_traced_memory()[0] - columnar
+        tracemalloc.stop()
+        self.assertLess(columnar * 3, lists)
+        self.assertEqual(len(as_dict['prices']), len(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
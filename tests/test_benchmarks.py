@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pipeline import STAGES, compare, run_benchmarks
+from benchmarks.synthetic import SESSION_MINUTES, make_ohlcv
+
+
+class TestSyntheticData(unittest.TestCase):
+    def test_deterministic_sessions(self):
+        data = make_ohlcv(2 * SESSION_MINUTES + 10, seed=3)
+        pd.testing.assert_frame_equal(data, make_ohlcv(2 * SESSION_MINUTES + 10, seed=3))
+
+        self.assertTrue(data.index.is_monotonic_increasing)
+        self.assertEqual(data.index[0], pd.Timestamp('2010-01-04 09:30'))
+        self.assertEqual(data.index[SESSION_MINUTES - 1], pd.Timestamp('2010-01-04 15:59'))
+        self.assertEqual(data.index[SESSION_MINUTES], pd.Timestamp('2010-01-05 09:30'))
+        self.assertTrue((data['High'] >= data[['Open', 'Close']].max(axis=1)).all())
+        self.assertTrue((data['Low'] <= data[['Open', 'Close']].min(axis=1)).all())
+        # Opening minutes trade more than midday
+        minute = np.arange(len(data)) % SESSION_MINUTES
+        self.assertGreater(data['Volume'][minute < 30].mean(), data['Volume'][(minute > 180) & (minute < 210)].mean())
+
+    def test_gbm_volatility(self):
+        data = make_ohlcv(100_000, freq='D', start='1800-01-01', annual_volatility=0.2)
+        log_returns = np.diff(np.log(data['Close'].to_numpy()))
+        self.assertAlmostEqual(log_returns.std() * np.sqrt(252), 0.2, delta=0.005)
+
+
+class TestPipelineBenchmark(unittest.TestCase):
+    def test_every_stage_recorded(self):
+        rows = run_benchmarks([1_000], report_format='json')
+        self.assertEqual([row['stage'] for row in rows], list(STAGES))
+        self.assertTrue(all(row['wall_time'] > 0 and row['peak_bytes'] > 0 for row in rows))
+
+        slower = [dict(row, wall_time=row['wall_time'] * 2) for row in rows]
+        ratios = compare(slower, rows)['time_ratio']
+        np.testing.assert_allclose(ratios, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
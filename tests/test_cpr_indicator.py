@@ -1,5 +1,8 @@
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from src.signals.cpr import CPRCalculator
 
 
@@ -33,3 +36,26 @@ class TestCPRIndicator(unittest.TestCase):
         self.assertEqual(cpr.bc, 0)
         self.assertEqual(cpr.tc, 0)
 
+    def test_cpr_batch_matches_scalar(self):
+        high = pd.Series([100.0, 101.5, 0.0])
+        low = pd.Series([90.0, 99.0, 0.0])
+        close = pd.Series([95.0, 100.25, 0.0])
+
+        levels = CPRCalculator.calculate_batch(high, low, close)
+
+        self.assertEqual(len(levels), 3)
+        for i in range(3):
+            expected = CPRCalculator.calculate(high[i], low[i], close[i])
+            self.assertEqual(levels[i], expected)
+
+    def test_price_above_tc_batch(self):
+        levels = CPRCalculator.calculate_batch(
+            np.array([100.0, 100.0]), np.array([90.0, 90.0]), np.array([98.0, 92.0])
+        )
+        mask = CPRCalculator.is_price_above_tc_batch(np.array([97.0, 97.0]), levels)
+
+        self.assertEqual(mask.tolist(), [False, True])
+
+    def test_cpr_levels_use_slots(self):
+        cpr = CPRCalculator.calculate(100.0, 90.0, 95.0)
+        self.assertFalse(hasattr(cpr, '__dict__'))
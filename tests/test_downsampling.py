@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.reporting.downsampling import chart_indices, lttb_indices
+
+
+class TestLTTB(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(100_000, dtype=np.float64)
+        self.y = rng.normal(0, 1, len(self.x)).cumsum()
+
+    def test_keeps_endpoints_and_count(self):
+        kept = lttb_indices(self.x, self.y, 1000)
+        self.assertEqual(len(kept), 1000)
+        self.assertEqual((kept[0], kept[-1]), (0, len(self.x) - 1))
+        self.assertTrue(np.all(np.diff(kept) > 0))
+
+    def test_keeps_spikes(self):
+        y = self.y.copy()
+        y[31_337] += 500
+        y[77_777] -= 500
+        kept = lttb_indices(self.x, y, 500)
+        self.assertIn(31_337, kept)
+        self.assertIn(77_777, kept)
+
+    def test_short_series_and_nans_untouched(self):
+        np.testing.assert_array_equal(lttb_indices(self.x[:10], self.y[:10], 50), np.arange(10))
+        y = self.y.copy()
+        y[:5_000] = np.nan
+        kept = lttb_indices(self.x, y, 300)
+        self.assertEqual(len(kept), 300)
+
+
+class TestChartIndices(unittest.TestCase):
+    def test_markers_always_kept(self):
+        dates = pd.date_range('2020-01-01', periods=200_000, freq='min', tz='America/New_York')
+        values = np.sin(np.arange(len(dates)) / 1000)
+        markers = [dates[5], dates[123_457], dates[199_998]]
+
+        kept = chart_indices(list(dates), values, 800, markers)
+        for position in (5, 123_457, 199_998):
+            self.assertIn(position, kept)
+        self.assertLessEqual(len(kept), 803)
+
+    def test_disabled_or_short_series_keep_everything(self):
+        dates = list(pd.date_range('2020-01-01', periods=50, freq='D'))
+        np.testing.assert_array_equal(chart_indices(dates, np.ones(50), None), np.arange(50))
+        np.testing.assert_array_equal(chart_indices(dates, np.ones(50), 100), np.arange(50))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.trading_data_persistence import TradingDataPersistence
+from src.instrumentation import registry as instrumentation
+from src.instrumentation.registry import MetricsRegistry
+from tests.test_trading_data_persistence import RecordingCursor
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.configure(enabled=False)
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry()
+        with registry.stage('signals'):
+            registry.count('bars_processed', 100)
+
+        self.assertIs(instrumentation.stage('signals'), registry.stage('other'))
+        self.assertEqual(registry.stages, {})
+        self.assertEqual(registry.counters, {})
+
+    def test_stages_and_labelled_counters(self):
+        registry = MetricsRegistry(enabled=True)
+        for _ in range(3):
+            with registry.stage('signals'):
+                time.sleep(0.001)
+        registry.count('db_rows_written', 10, table='trading.trades')
+        registry.count('db_rows_written', 5, table='trading.trades')
+        registry.count('db_rows_written', 7, table='trading.market_data')
+
+        stats = registry.stages['signals']
+        self.assertEqual(stats.calls, 3)
+        self.assertGreaterEqual(stats.seconds, 0.003)
+        self.assertLessEqual(stats.max_seconds, stats.seconds)
+        self.assertIsNone(stats.peak_bytes)
+        self.assertEqual(registry.counter('db_rows_written', table='trading.trades'), 15)
+        self.assertEqual(registry.counter('db_rows_written', table='trading.market_data'), 7)
+        self.assertEqual(registry.counter('db_rows_written'), 0)
+
+    def test_failing_stage_is_still_timed(self):
+        registry = MetricsRegistry(enabled=True)
+        with self.assertRaises(ValueError):
+            with registry.stage('trades'):
+                raise ValueError('bad bar')
+        self.assertEqual(registry.stages['trades'].calls, 1)
+
+    def test_prometheus_text_format(self):
+        registry = MetricsRegistry(enabled=True)
+        with registry.stage('persist:trading.trades'):
+            pass
+        registry.count('db_round_trips', 4)
+        registry.count('report_bytes_written', 2048, format='json')
+
+        lines = registry.prometheus().splitlines()
+        self.assertIn('# TYPE algotrader_stage_seconds_total counter', lines)
+        self.assertIn('algotrader_stage_calls_total{stage="persist:trading.trades"} 1', lines)
+        self.assertIn('algotrader_db_round_trips_total 4', lines)
+        self.assertIn('algotrader_report_bytes_written_total{format="json"} 2048', lines)
+        # Memory peaks are only exported when traced
+        self.assertFalse(any('peak_bytes' in line for line in lines))
+
+    def test_memory_peak_and_profile_export(self):
+        registry = MetricsRegistry(enabled=True, profile=True, trace_memory=True)
+        with registry.stage('signals'):
+            with registry.stage('inner'):
+                block = np.ones(1_000_000)
+            del block
+
+        outer, inner = registry.stages['signals'], registry.stages['inner']
+        self.assertGreaterEqual(outer.peak_bytes, 8_000_000)
+        self.assertIsNotNone(outer.profile)
+        # Only the outermost stage of a thread is profiled and traced
+        self.assertIsNone(inner.profile)
+        self.assertIsNone(inner.peak_bytes)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = registry.export(os.path.join(directory, 'metrics', 'run.json'))
+            with open(path) as f:
+                snapshot = json.load(f)
+            self.assertEqual(snapshot['stages']['signals']['calls'], 1)
+            self.assertTrue(any('ncalls' in line for line in snapshot['stages']['signals']['profile']))
+            self.assertEqual(
+                [os.path.basename(p) for p in glob.glob(os.path.join(directory, 'metrics', '*.prof'))],
+                ['run.signals.prof']
+            )
+
+    def test_concurrent_stages_share_one_profiler(self):
+        registry = MetricsRegistry(enabled=True, profile=True)
+        both_inside = threading.Barrier(2, timeout=5)
+        errors = []
+
+        def run(name):
+            try:
+                with registry.stage(name):
+                    both_inside.wait()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ('persist', 'report')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual({name: stats.calls for name, stats in registry.stages.items()}, {'persist': 1, 'report': 1})
+        # One of the overlapping stages was profiled, the other skipped quietly
+        self.assertEqual(sum(stats.profile is not None for stats in registry.stages.values()), 1)
+
+    def test_copy_merge_counts_rows_and_bytes(self):
+        registry = instrumentation.configure()
+        cursor = RecordingCursor()
+        conn = mock.MagicMock()
+        conn.cursor.return_value = cursor
+        db = TradingDataPersistence({}, conn=conn)
+        dates = pd.date_range('2024-01-02', periods=3, freq='D')
+        trades = [
+            {'entry_date': date, 'exit_date': date, 'entry_price': 100.0, 'exit_price': 101.0, 'profit': 1.0}
+            for date in dates
+        ]
+
+        db._timed('trading.trades', db.bulk_save_trades, 7, trades, 'TEST')
+
+        self.assertEqual(registry.counter('db_rows_written', table='trading.trades'), 3)
+        self.assertEqual(
+            registry.counter('db_bytes_written', table='trading.trades'),
+            sum(len(payload) for _, payload in cursor.copies)
+        )
+        self.assertEqual(registry.stages['persist:trading.trades'].calls, 1)
+
+    def test_disabled_overhead_is_negligible(self):
+        calls = 100_000
+        start = time.perf_counter()
+        for _ in range(calls):
+            with instrumentation.stage('signals'):
+                pass
+            instrumentation.count('bars_processed', 1)
+        per_call = (time.perf_counter() - start) / calls
+
+        self.assertEqual(instrumentation.default_registry.stages, {})
+        # A stage and a counter cost well under a microsecond each when off
+        self.assertLess(per_call, 5e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.market_data_cache import MarketDataCache
+
+
+class FakeUpstream:
+    """Deterministic upstream returning one tz-aware daily bar per calendar day"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        index = pd.date_range(start_date, end_date, freq='D', inclusive='left', tz='America/New_York')
+        values = np.arange(len(index), dtype=np.float64) + index.day.to_numpy()
+        return pd.DataFrame({
+            'Open': values, 'High': values + 1, 'Low': values - 1,
+            'Close': values, 'Volume': (values * 1000).astype(np.int64)
+        }, index=index)
+
+
+class TestMarketDataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.upstream = FakeUpstream()
+
+    def test_repeated_request_is_served_from_disk(self):
+        cache = MarketDataCache(self.tmp.name)
+        first = cache.get('AAPL', '2023-01-01', '2023-02-01', self.upstream)
+        second = cache.get('AAPL', '2023-01-01', '2023-02-01', self.upstream)
+
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+        self.assertEqual(len(self.upstream.calls), 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(str(second.index.tz), 'America/New_York')
+
+    def test_only_missing_spans_are_fetched(self):
+        cache = MarketDataCache(self.tmp.name)
+        cache.get('AAPL', '2023-01-10', '2023-01-20', self.upstream)
+        data = cache.get('AAPL', '2023-01-01', '2023-02-01', self.upstream)
+
+        self.assertEqual(self.upstream.calls[1:], [
+            ('2023-01-01', '2023-01-10'),
+            ('2023-01-20', '2023-02-01'),
+        ])
+        self.assertEqual(len(data), 31)
+        self.assertTrue(data.index.is_monotonic_increasing)
+        self.assertEqual(cache.covered_ranges('AAPL'),
+                         [(pd.Timestamp('2023-01-01'), pd.Timestamp('2023-02-01'))])
+        self.assertEqual(cache.stats.partial_hits, 1)
+
+    def test_offline_mode_never_calls_upstream(self):
+        MarketDataCache(self.tmp.name).get('AAPL', '2023-01-01', '2023-01-15', self.upstream)
+        offline = MarketDataCache(self.tmp.name, offline=True)
+
+        data = offline.get('AAPL', '2023-01-01', '2023-02-01', self.upstream)
+
+        self.assertEqual(len(self.upstream.calls), 1)
+        self.assertEqual(len(data), 14)
+        self.assertEqual(offline.stats.partial_hits, 1)
+        self.assertEqual(len(offline.get('MSFT', '2023-01-01', '2023-02-01', self.upstream)), 0)
+
+    def test_writers_use_distinct_temp_files(self):
+        # Two processes saving the same symbol must not share a temp path
+        renamed = []
+        real_replace = os.replace
+
+        def recording_replace(src, dst):
+            renamed.append(src)
+            real_replace(src, dst)
+
+        with mock.patch('src.data.market_data_cache.os.replace', side_effect=recording_replace):
+            MarketDataCache(self.tmp.name).get('AAPL', '2023-01-01', '2023-01-15', self.upstream)
+            MarketDataCache(self.tmp.name).get('AAPL', '2023-01-01', '2023-02-01', self.upstream)
+
+        self.assertEqual(len(renamed), 2)
+        self.assertEqual(len(set(renamed)), 2)
+        # The manifest lives inside the archive, so data and ranges are replaced together
+        self.assertEqual(os.listdir(self.tmp.name), ['AAPL.npz'])
+        data = MarketDataCache(self.tmp.name).get('AAPL', '2023-01-01', '2023-02-01', self.upstream)
+        self.assertEqual(len(data), 31)
+
+    def test_empty_upstream_answer_is_not_covered(self):
+        cache = MarketDataCache(self.tmp.name)
+        cache.get('AAPL', '2023-01-01', '2023-01-15', self.upstream)
+        outage = mock.Mock(return_value=pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume']))
+
+        self.assertEqual(len(cache.get('AAPL', '2023-01-01', '2023-02-01', outage)), 14)
+        self.assertEqual(cache.covered_ranges('AAPL'),
+                         [(pd.Timestamp('2023-01-01'), pd.Timestamp('2023-01-15'))])
+        # The span is fetched again once the upstream answers
+        self.assertEqual(len(cache.get('AAPL', '2023-01-01', '2023-02-01', self.upstream)), 31)
+        self.assertEqual(self.upstream.calls, [('2023-01-01', '2023-01-15'), ('2023-01-15', '2023-02-01')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import DataLoader
+from src.data.market_data_db import MarketDataDB
+
+
+class StreamingCursor:
+    """Cursor double that streams a CSV payload to copy_expert in small pieces"""
+
+    def __init__(self, payload, piece=37):
+        self.payload = payload
+        self.piece = piece
+        self.copy_sql = None
+        self.mogrified = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, query, params):
+        # Record the real query and parameters; interpolation is psycopg2's job
+        self.mogrified.append((query, params))
+        return b'<bound query>'
+
+    def copy_expert(self, sql, file):
+        self.copy_sql = sql
+        for i in range(0, len(self.payload), self.piece):
+            file.write(self.payload[i:i + self.piece])
+
+
+def to_csv(ordinal, index, frame):
+    micros = index.to_numpy(dtype='datetime64[us]').astype(np.int64)
+    rows = []
+    for ts, (o, h, l, c, v) in zip(micros, frame[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy()):
+        rows.append(f"{ordinal},{ts},{float(o)!r},{float(h)!r},{float(l)!r},{float(c)!r},{float(v)!r}\n")
+    return ''.join(rows)
+
+
+class TestMarketDataDB(unittest.TestCase):
+    def make_frame(self, n, seed):
+        rng = np.random.default_rng(seed)
+        close = 100 + rng.normal(0, 1, n).cumsum()
+        index = pd.date_range('2024-01-02 09:30', periods=n, freq='min', name='Date')
+        return pd.DataFrame({
+            'Open': close + 0.1,
+            'High': close + 0.5,
+            'Low': close - 0.5,
+            'Close': close,
+            'Volume': rng.integers(1, 10_000, n).astype(np.float64),
+        }, index=index)
+
+    def test_multi_symbol_read_split_by_symbol(self):
+        frames = {'AAA': self.make_frame(500, 0), 'CCC': self.make_frame(120, 1)}
+        payload = to_csv(0, frames['AAA'].index, frames['AAA']) + to_csv(2, frames['CCC'].index, frames['CCC'])
+        cursor = StreamingCursor(payload.encode())
+        conn = mock.MagicMock()
+        conn.cursor.return_value = cursor
+
+        # A tiny chunk size forces rows to straddle chunk boundaries
+        db = MarketDataDB(conn=conn, chunk_bytes=1000, tz='America/New_York')
+        result = db.read_frames(['AAA', 'BBB', 'CCC'], '2024-01-01', '2024-02-01')
+
+        self.assertEqual(list(result), ['AAA', 'BBB', 'CCC'])
+        self.assertTrue(result['BBB'].empty)
+        for symbol in ('AAA', 'CCC'):
+            expected = frames[symbol].tz_localize('America/New_York')
+            pd.testing.assert_frame_equal(result[symbol], expected, check_freq=False, check_index_type=False)
+        self.assertEqual(cursor.copy_sql, "COPY (<bound query>) TO STDOUT WITH (FORMAT csv)")
+        (query, params), = cursor.mogrified
+        self.assertIn("WHERE symbol = ANY(%(symbols)s) AND interval = %(interval)s "
+                      "AND timestamp >= %(start)s AND timestamp < %(end)s", ' '.join(query.split()))
+        self.assertEqual(params, {'symbols': ['AAA', 'BBB', 'CCC'], 'interval': '1d',
+                                  'start': datetime(2024, 1, 1), 'end': datetime(2024, 2, 1)})
+
+    def test_reads_are_keyed_by_interval(self):
+        cursor = StreamingCursor(b'')
+        conn = mock.MagicMock()
+        conn.cursor.return_value = cursor
+        loader = DataLoader('AAA', '2024-01-01', '2024-02-01', interval='5m',
+                            database=MarketDataDB(conn=conn))
+
+        self.assertTrue(loader.fetch_data().empty)
+        (query, params), = cursor.mogrified
+        self.assertIn('interval = %(interval)s', query)
+        self.assertEqual((params['symbols'], params['interval']), (['AAA'], '5m'))
+
+    def test_requires_connection_settings(self):
+        with self.assertRaises(ValueError):
+            MarketDataDB()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import DataLoader
+from src.data.market_data_store import MarketDataStore
+
+
+def make_frame(start, periods, tz='America/New_York'):
+    index = pd.date_range(start, periods=periods, freq='h', tz=tz, name='Date')
+    close = np.linspace(100, 200, periods)
+    return pd.DataFrame({
+        'Open': close - 0.5, 'High': close + 1, 'Low': close - 1,
+        'Close': close, 'Volume': np.arange(periods, dtype=np.float64)
+    }, index=index)
+
+
+class TestMarketDataStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # Small stride so lookups cross several index blocks
+        self.store = MarketDataStore(self.tmp.name, index_stride=16)
+
+    def test_append_skips_overlap(self):
+        frame = make_frame('2023-01-01', 500)
+        self.assertEqual(self.store.append('AAPL', frame.iloc[:300]), 300)
+        self.assertEqual(self.store.append('AAPL', frame.iloc[250:]), 200)
+        self.assertEqual(self.store.count('AAPL'), 500)
+
+        pd.testing.assert_frame_equal(self.store.read_frame('AAPL'), frame, check_freq=False,
+                                      check_index_type=False)
+
+    def test_append_after_torn_record(self):
+        frame = make_frame('2023-01-01', 500)
+        self.store.append('AAPL', frame.iloc[:300])
+        data_path, index_path, _ = self.store._paths('AAPL')
+        # An append interrupted mid-record, before the index was extended
+        with open(data_path, 'ab') as f:
+            f.write(b'\x01' * 20)
+        with open(index_path, 'r+b') as f:
+            f.truncate(8)
+
+        self.assertEqual(self.store.append('AAPL', frame.iloc[300:]), 200)
+        self.assertEqual(self.store.count('AAPL'), 500)
+        pd.testing.assert_frame_equal(self.store.read_frame('AAPL'), frame, check_freq=False,
+                                      check_index_type=False)
+        np.testing.assert_array_equal(np.fromfile(index_path, dtype='<i8'),
+                                      self.store.read('AAPL')['timestamp'][::16])
+
+    def test_range_read_is_zero_copy_view(self):
+        frame = make_frame('2023-01-01', 1000)
+        self.store.ingest({'AAPL': frame})
+
+        records = self.store.read('AAPL', pd.Timestamp('2023-01-10'), pd.Timestamp('2023-01-20'))
+        expected = frame[(frame.index >= '2023-01-10') & (frame.index < '2023-01-20')]
+
+        self.assertIsInstance(records, np.memmap)
+        self.assertEqual(len(records), len(expected))
+        np.testing.assert_array_equal(records['close'], expected['Close'].to_numpy())
+
+    def test_range_lookup_matches_linear_scan(self):
+        frame = make_frame('2023-01-01', 333)
+        self.store.append('MSFT', frame)
+        local = frame.index.tz_localize(None)
+
+        for start, end in [('2022-12-01', '2023-01-02'), ('2023-01-03 05:00', '2023-01-09 17:00'),
+                           ('2023-01-14', '2023-02-01'), ('2023-03-01', '2023-04-01')]:
+            records = self.store.read('MSFT', pd.Timestamp(start), pd.Timestamp(end))
+            self.assertEqual(len(records), int(((local >= start) & (local < end)).sum()))
+
+    def test_data_loader_reads_from_store(self):
+        frame = make_frame('2023-01-01', 200)
+        self.store.append('AAPL', frame)
+
+        data = DataLoader('AAPL', '2023-01-02', '2023-01-05', store=self.store).fetch_data()
+
+        self.assertEqual(len(data), 72)
+        self.assertEqual(str(data.index.tz), 'America/New_York')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import dataclasses
+import unittest
+
+import numpy as np
+
+from config.config import TradingConfig
+from src.backtesting.backtest import Backtest
+from src.backtesting.parameter_sweep import ParameterSweep
+from src.signals.signal_generator import SignalGenerator
+from src.trade_execution.trade_manager import TradeManager
+from tests.test_signal_generator import make_ohlcv
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST', start_date='2020-01-01', end_date='2021-01-01', initial_capital=100000,
+            ema_short=9, ema_long=20, volume_threshold=1.5, stop_loss=0.02, take_profit=0.03
+        )
+        self.data = make_ohlcv(1500, seed=3)
+        self.grid = {
+            'ema_short': [5, 9],
+            'ema_long': [20, 30],
+            'volume_threshold': [1.0, 1.3],
+            'stop_loss': [0.01, 0.02],
+            'take_profit': [0.02, 0.05],
+            'pivot_threshold': [0.001, 0.005],
+        }
+
+    def reference(self, params):
+        config = dataclasses.replace(self.config, **params)
+        signals = SignalGenerator(config).generate_signals(self.data)
+        backtest = Backtest(config)
+        backtest.results = TradeManager(config).execute_trades(self.data, signals)
+        backtest.dates = self.data.index
+        return backtest.analyze_results()
+
+    def test_sweep_matches_individual_backtests(self):
+        results = ParameterSweep(self.config, self.grid, max_workers=1, data=self.data).run()
+
+        self.assertEqual(len(results), 64)
+        self.assertTrue(results['total_profit'].is_monotonic_decreasing)
+        for _, row in results.iloc[::7].iterrows():
+            params = {field: row[field] for field in self.grid}
+            params['ema_short'], params['ema_long'] = int(params['ema_short']), int(params['ema_long'])
+            expected = self.reference(params)
+            self.assertEqual(row['total_trades'], expected['total_trades'])
+            self.assertAlmostEqual(row['total_profit'], expected['total_profit'])
+            self.assertAlmostEqual(row['sharpe_ratio'], expected['sharpe_ratio'])
+            self.assertAlmostEqual(row['exposure'], expected['exposure'])
+        self.assertTrue((results['exposure'] > 0).any())
+
+    def test_random_search_in_process_pool(self):
+        sweep = ParameterSweep(self.config, self.grid, metric='sharpe_ratio', max_workers=2, data=self.data)
+        results = sweep.run(n_iter=10, seed=1)
+        inline = ParameterSweep(self.config, self.grid, metric='sharpe_ratio', max_workers=1,
+                                data=self.data).run(n_iter=10, seed=1)
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results.to_dict('records'), inline.to_dict('records'))
+
+    def test_chunked_signal_matrix_matches_unchunked(self):
+        sweep = ParameterSweep(self.config, self.grid, data=self.data)
+        keys = sorted({sweep._signal_key(params) for params in sweep.combinations()})
+        whole = ParameterSweep._signal_matrix(self.data, keys, chunk_cells=len(self.data) * len(keys))
+        # Three keys per block leaves a short last block
+        chunked = ParameterSweep._signal_matrix(self.data, keys, chunk_cells=len(self.data) * 3)
+
+        self.assertTrue(chunked.flags.f_contiguous)
+        self.assertTrue(whole.any())
+        np.testing.assert_array_equal(chunked, whole)
+        np.testing.assert_array_equal(ParameterSweep._signal_matrix(self.data, keys, chunk_cells=1), whole)
+
+    def test_random_search_samples_without_building_the_grid(self):
+        # 10^18 combinations: only the sampled ones may be materialized
+        grid = {field: list(range(1000)) for field in self.grid}
+        sweep = ParameterSweep(self.config, grid)
+        combos = sweep.combinations(n_iter=50, seed=7)
+
+        self.assertEqual(len(combos), 50)
+        self.assertEqual(len({tuple(combo.values()) for combo in combos}), 50)
+        self.assertTrue(all(type(value) is int for combo in combos for value in combo.values()))
+        self.assertEqual(combos, sweep.combinations(n_iter=50, seed=7))
+        self.assertEqual(len(ParameterSweep(self.config, self.grid).combinations(n_iter=100)), 64)
+
+    def test_rejects_unknown_fields(self):
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.config, {'symbol': ['AAPL']})
+
+
+if __name__ == '__main__':
+    unittest.main()
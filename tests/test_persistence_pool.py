@@ -0,0 +1,135 @@
+import threading
+import time
+import unittest
+from concurrent.futures import wait
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+from src.data.persistence_pool import AsyncPersistenceWriter, PersistencePool
+
+
+class FakeDB:
+    def __init__(self, gate, fail_symbols):
+        self.gate = gate
+        self.fail_symbols = fail_symbols
+        self.table_latency = {}
+
+    def persist_all_data(self, config, results, analysis):
+        self.gate.wait()
+        if config.symbol in self.fail_symbols:
+            raise RuntimeError('insert failed')
+        self.table_latency = {'trading.market_data': 0.5, 'trading.trades': 0.25}
+        return results['id']
+
+
+class FakePool:
+    def __init__(self, fail_symbols=()):
+        self.gate = threading.Event()
+        self.fail_symbols = set(fail_symbols)
+
+    @contextmanager
+    def persistence(self):
+        yield FakeDB(self.gate, self.fail_symbols)
+
+
+def job(i, symbol='TEST'):
+    return SimpleNamespace(symbol=symbol), {'id': i}, {}
+
+
+class TestAsyncPersistenceWriter(unittest.TestCase):
+    def test_results_and_per_table_latency(self):
+        pool = FakePool(fail_symbols={'BAD'})
+        pool.gate.set()
+        with AsyncPersistenceWriter(pool, workers=3, max_queue=4) as writer:
+            futures = [writer.submit(*job(i)) for i in range(10)]
+            failed = writer.submit(*job(99, symbol='BAD'))
+
+        self.assertEqual([future.result() for future in futures], list(range(10)))
+        self.assertIsInstance(failed.exception(), RuntimeError)
+        stats = writer.stats.as_dict()
+        self.assertEqual((stats['submitted'], stats['completed'], stats['failed']), (11, 10, 1))
+        self.assertEqual(stats['table_seconds'], {'trading.market_data': 5.0, 'trading.trades': 2.5})
+        with self.assertRaises(RuntimeError):
+            writer.submit(*job(100))
+
+    def test_full_queue_blocks_submit(self):
+        pool = FakePool()
+        writer = AsyncPersistenceWriter(pool, workers=1, max_queue=1)
+        # One job held by the worker, one filling the queue
+        writer.submit(*job(0))
+        writer.submit(*job(1))
+
+        blocked = threading.Thread(target=writer.submit, args=job(2))
+        blocked.start()
+        blocked.join(0.2)
+        self.assertTrue(blocked.is_alive())
+
+        pool.gate.set()
+        blocked.join()
+        writer.shutdown()
+        self.assertEqual(writer.stats.completed, 3)
+        self.assertGreaterEqual(writer.stats.blocked_submits, 1)
+
+    def test_non_waiting_shutdown_with_full_queue(self):
+        pool = FakePool()
+        writer = AsyncPersistenceWriter(pool, workers=1, max_queue=1)
+        futures = [writer.submit(*job(0)), writer.submit(*job(1))]
+
+        start = time.perf_counter()
+        writer.shutdown(wait=False)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        with self.assertRaises(RuntimeError):
+            writer.submit(*job(2))
+
+        # Jobs queued before the shutdown still complete, then the thread exits
+        pool.gate.set()
+        self.assertEqual([future.result(timeout=5) for future in futures], [0, 1])
+        writer._threads[0].join(5)
+        self.assertFalse(writer._threads[0].is_alive())
+
+    def test_no_job_dropped_when_shutdown_races_submit(self):
+        pool = FakePool()
+        pool.gate.set()
+        writer = AsyncPersistenceWriter(pool, workers=2, max_queue=2)
+        accepted = []
+
+        def produce(offset):
+            for i in range(offset, offset + 200):
+                try:
+                    accepted.append(writer.submit(*job(i)))
+                except RuntimeError:
+                    return
+
+        producers = [threading.Thread(target=produce, args=(i * 1000,)) for i in range(4)]
+        for producer in producers:
+            producer.start()
+        time.sleep(0.01)
+        writer.shutdown()
+        for producer in producers:
+            producer.join()
+
+        # Every accepted job was persisted; none was queued behind the shutdown
+        done, not_done = wait(accepted, timeout=5)
+        self.assertEqual(not_done, set())
+        self.assertEqual(writer.stats.completed, len(accepted))
+
+
+class TestPersistencePool(unittest.TestCase):
+    def test_unhealthy_connections_are_replaced(self):
+        broken = mock.MagicMock(closed=0)
+        broken.cursor.return_value.__enter__.return_value.execute.side_effect = RuntimeError('gone')
+        healthy = mock.MagicMock(closed=0)
+
+        with mock.patch('src.data.persistence_pool.ThreadedConnectionPool') as pool_cls:
+            pool_cls.return_value.getconn.side_effect = [broken, healthy]
+            pool = PersistencePool({}, minconn=1, maxconn=2)
+            with pool.connection() as conn:
+                self.assertIs(conn, healthy)
+
+        pool_cls.return_value.putconn.assert_any_call(broken, close=True)
+        pool_cls.return_value.putconn.assert_called_with(healthy, close=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
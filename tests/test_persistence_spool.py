@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.data.persistence_spool import PersistenceSpool
+from src.data.trading_data_persistence import TradingDataPersistence
+
+
+def make_run(symbol='TEST', n=50):
+    config = TradingConfig(
+        symbol=symbol,
+        start_date='2024-01-01',
+        end_date='2024-03-01',
+        initial_capital=100000,
+        ema_short=9,
+        ema_long=20,
+        volume_threshold=1.5,
+        stop_loss=0.02,
+        take_profit=0.03,
+        interval='5m',
+        intraday=True
+    )
+    dates = pd.date_range('2024-01-02 09:30', periods=n, freq='5min', tz='America/New_York')
+    results = {
+        'dates': dates.tolist(),
+        'prices': np.linspace(100, 110, n).tolist(),
+        'equity_curve': np.linspace(100000, 101000, n + 1).tolist(),
+        'trades': [{'entry_date': dates[3], 'entry_price': 101.0,
+                    'exit_date': dates[9], 'exit_price': 103.0, 'profit': np.float64(2.0)}],
+        'sell_prices': [103.0, None],
+        'buy_dates': [],
+    }
+    analysis = {'total_trades': 1, 'total_profit': np.float64(2.0), 'sharpe_ratio': float('nan')}
+    return config, results, analysis
+
+
+class FakeDB:
+    """Stands in for TradingDataPersistence, with the marker table as a set"""
+
+    def __init__(self):
+        self.applied = set()
+        self.written = []
+        self.fail_writes = False
+        self.conn = mock.MagicMock()
+        self.conn.cursor.return_value.__enter__.return_value.execute.side_effect = self._execute
+        self._pending = None
+
+    def _execute(self, query, params):
+        cursor = self.conn.cursor.return_value.__enter__.return_value
+        if 'INSERT INTO trading.spool_applied' in query:
+            cursor.rowcount = 0 if params[0] in self.applied else 1
+            self._pending = params[0]
+
+    @contextmanager
+    def transaction(self):
+        yield self
+        self.applied.add(self._pending)
+
+    def write_all_data(self, config, results, analysis):
+        if self.fail_writes:
+            raise ConnectionError('database is down')
+        self.written.append(config.symbol)
+        return len(self.written)
+
+
+class TestPersistenceSpool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spool = PersistenceSpool(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        config, results, analysis = make_run()
+        segment_id = self.spool.append(config, results, analysis)
+        self.assertEqual(self.spool.segments(), [segment_id])
+
+        loaded_config, loaded_results, loaded_analysis = self.spool.load(segment_id)
+        self.assertEqual(loaded_config, config)
+        self.assertEqual(loaded_results['dates'], results['dates'])
+        self.assertEqual(loaded_results['prices'], results['prices'])
+        self.assertEqual(loaded_results['trades'], results['trades'])
+        self.assertEqual(loaded_results['sell_prices'], [103.0, None])
+        self.assertEqual(loaded_results['buy_dates'], [])
+        self.assertEqual(loaded_analysis['total_profit'], 2.0)
+        self.assertTrue(np.isnan(loaded_analysis['sharpe_ratio']))
+        self.assertEqual(self.spool.describe()['bars'].tolist(), [50])
+
+    def test_replay_in_order_and_resumable(self):
+        for symbol in ('AAA', 'BBB', 'CCC'):
+            self.spool.append(*make_run(symbol))
+        db = FakeDB()
+
+        self.assertEqual(self.spool.replay(db, limit=1), 1)
+        self.assertEqual(db.written, ['AAA'])
+
+        # The database goes away mid-replay: the failed segment stays spooled
+        db.fail_writes = True
+        with self.assertRaises(ConnectionError):
+            self.spool.replay(db)
+        self.assertEqual(len(self.spool.segments()), 2)
+
+        db.fail_writes = False
+        self.assertEqual(self.spool.replay(db), 2)
+        self.assertEqual(db.written, ['AAA', 'BBB', 'CCC'])
+        self.assertEqual(self.spool.segments(), [])
+
+    def test_segment_committed_before_crash_is_not_reapplied(self):
+        segment_id = self.spool.append(*make_run())
+        db = FakeDB()
+        # Committed earlier, but the process died before removing the file
+        db.applied.add(segment_id)
+
+        self.assertEqual(self.spool.replay(db), 0)
+        self.assertEqual(db.written, [])
+        self.assertEqual(self.spool.segments(), [])
+
+    def test_spool_mode_acknowledges_without_database(self):
+        with mock.patch('psycopg2.connect') as connect:
+            db = TradingDataPersistence({}, spool_dir=self.tmp.name)
+            self.assertIsNone(db.persist_all_data(*make_run()))
+            connect.assert_not_called()
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
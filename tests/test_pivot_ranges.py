@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+
+from src.signals.pivot_ranges import PivotCalculator
+
+
+class TestPivotRanges(unittest.TestCase):
+
+    def test_pivot_batch_matches_scalar(self):
+        high = np.array([100.0, 105.0, 52.5])
+        low = np.array([90.0, 95.0, 50.0])
+        close = np.array([95.0, 104.0, 51.0])
+
+        levels = PivotCalculator.calculate_batch(high, low, close)
+
+        self.assertEqual(len(levels), 3)
+        for i in range(3):
+            self.assertEqual(levels[i], PivotCalculator.calculate(high[i], low[i], close[i]))
+
+    def test_price_near_level_batch(self):
+        price = np.array([100.0, 100.05, 101.0, 0.0])
+        level = np.array([100.0, 100.0, 100.0, 0.0])
+
+        mask = PivotCalculator.is_price_near_level_batch(price, level)
+
+        expected = [PivotCalculator.is_price_near_level(p, l) for p, l in zip(price[:3], level[:3])]
+        self.assertEqual(mask[:3].tolist(), expected)
+        # A zero level yields no proximity instead of raising
+        self.assertFalse(mask[3])
@@ -0,0 +1,81 @@
+import dataclasses
+import unittest
+
+import pandas as pd
+
+from config.config import TradingConfig
+from src.backtesting.replay import ReplayEngine
+from src.signals.signal_generator import SignalGenerator
+from src.trade_execution.trade_manager import TradeManager
+from tests.test_signal_generator import make_intraday, make_ohlcv
+
+
+class TestReplayEngine(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST', start_date='2020-01-01', end_date='2021-01-01', initial_capital=100000,
+            ema_short=9, ema_long=20, volume_threshold=1.2, stop_loss=0.02, take_profit=0.03
+        )
+
+    def test_replay_matches_batch_backtest(self):
+        frames = {symbol: make_ohlcv(3000, seed=seed) for seed, symbol in enumerate(['AAA', 'BBB', 'CCC'])}
+        engine = ReplayEngine(self.config, frames, queue_size=8)
+        stats = engine.run()
+
+        self.assertEqual(stats.bars, 9000)
+        for symbol, data in frames.items():
+            signals = SignalGenerator(self.config).generate_signals(data)
+            batch = TradeManager(self.config).execute_trades_iterative(data, signals)
+            manager = engine.consumers[symbol].trade_manager
+            self.assertEqual(manager.trades, batch['trades'])
+            self.assertEqual(manager.equity_curve, batch['equity_curve'])
+
+        summary = stats.as_dict()
+        self.assertGreater(summary['orders'], 0)
+        self.assertEqual(len(stats.order_latency_ns), stats.orders)
+        latency = summary['signal_latency_us']
+        self.assertLessEqual(latency['p50'], latency['p99'])
+        self.assertLessEqual(latency['p99'], latency['max'])
+        self.assertLessEqual(summary['max_queue_depth'], 8)
+
+    def test_intraday_replay_matches_batch_backtest(self):
+        config = dataclasses.replace(self.config, interval='5m', intraday=True)
+        frames = {'AAA': make_intraday(15, seed=4), 'BBB': make_intraday(15, seed=5)}
+        engine = ReplayEngine(config, frames)
+        engine.run()
+
+        for symbol, data in frames.items():
+            signals = SignalGenerator(config).generate_signals(data)
+            batch = TradeManager(config).execute_trades(data, signals)
+            self.assertGreater(len(batch['trades']), 0)
+            self.assertEqual(engine.consumers[symbol].trade_manager.trades, batch['trades'])
+
+    def test_paced_replay_follows_bar_clock(self):
+        # 40 one-minute bars, an overnight gap, then 20 more
+        data = make_ohlcv(60, seed=1)
+        data.index = pd.date_range('2024-01-02 09:30', periods=40, freq='min').append(
+            pd.date_range('2024-01-03 09:30', periods=20, freq='min'))
+
+        stats = ReplayEngine(self.config, {'AAA': data}, speed=60 * 200, max_gap=60).run()
+
+        # 59 gaps of one market minute, 200x faster
+        self.assertEqual(stats.bars, 60)
+        self.assertGreaterEqual(stats.wall_seconds, 59 * 60 / (60 * 200))
+        self.assertLess(stats.wall_seconds, 1.0)
+
+    def test_failing_consumer_stops_replay(self):
+        class Failing:
+            def signal(self, date, bar):
+                raise RuntimeError('strategy failed')
+
+        frames = {'AAA': make_ohlcv(500, seed=2), 'BBB': make_ohlcv(500, seed=3)}
+        with self.assertRaises(RuntimeError):
+            ReplayEngine(self.config, frames, queue_size=2, consumer_factory=lambda symbol: Failing()).run()
+
+    def test_invalid_speed(self):
+        with self.assertRaises(ValueError):
+            ReplayEngine(self.config, {}, speed=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.signals.cpr import CPRCalculator
+from src.signals.pivot_ranges import PivotCalculator
+from src.signals.signal_generator import SignalGenerator, session_levels
+
+
+def make_ohlcv(n, seed=0, int_volume=True):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    volume = rng.lognormal(13, 0.6, n)
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.2, n),
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': volume.astype(np.int64) if int_volume else volume,
+    }, index=pd.date_range('2020-01-01', periods=n, freq='D'))
+
+
+class TestSignalGenerator(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST',
+            start_date='2020-01-01',
+            end_date='2021-01-01',
+            initial_capital=100000,
+            ema_short=9,
+            ema_long=20,
+            volume_threshold=1.2,
+            stop_loss=0.02,
+            take_profit=0.03
+        )
+        self.generator = SignalGenerator(self.config)
+
+    def assert_matches_iterative(self, data):
+        vectorized = self.generator.generate_signals(data)
+        iterative = self.generator.generate_signals_iterative(data)
+        pd.testing.assert_frame_equal(vectorized, iterative)
+        return vectorized
+
+    def test_vectorized_matches_iterative(self):
+        signals = self.assert_matches_iterative(make_ohlcv(2000))
+        self.assertGreater(signals['signal'].sum(), 0)
+
+    def test_vectorized_matches_iterative_with_float_volume_gaps(self):
+        data = make_ohlcv(1500, seed=1, int_volume=False)
+        data.iloc[100:130, data.columns.get_loc('Volume')] = np.nan
+        self.assert_matches_iterative(data)
+
+    def test_vectorized_matches_iterative_on_short_histories(self):
+        for n in (0, 1, 2, 5, 19, 20, 21):
+            self.assert_matches_iterative(make_ohlcv(n, seed=n))
+
+    def test_chunked_evaluation_matches_iterative(self):
+        self.generator.chunk_bars = 97
+        self.assert_matches_iterative(make_ohlcv(1000, seed=2))
+
+
+def make_intraday(days, seed=0):
+    sessions = pd.bdate_range('2023-03-06', periods=days)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta('9h30min'), periods=78, freq='5min').to_numpy()
+        for day in sessions
+    ])).tz_localize('America/New_York')
+    data = make_ohlcv(len(index), seed=seed)
+    data.index = index
+    return data
+
+
+class TestIntradaySignals(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST', start_date='2023-03-01', end_date='2023-04-01', initial_capital=100000,
+            ema_short=9, ema_long=20, volume_threshold=1.2, stop_loss=0.02, take_profit=0.03,
+            interval='5m', intraday=True
+        )
+        self.data = make_intraday(15)
+
+    def previous_session_levels(self):
+        days = self.data.index.date
+        sessions = self.data.groupby(days).agg({'High': 'max', 'Low': 'min', 'Close': 'last'}).shift(1)
+        return sessions.reindex(days).to_numpy()
+
+    def test_session_levels_match_groupby(self):
+        session_of_bar, *levels = session_levels(
+            self.data.index, self.data['High'].to_numpy(), self.data['Low'].to_numpy(),
+            self.data['Close'].to_numpy()
+        )
+        broadcast = np.column_stack([values[session_of_bar] for values in levels])
+
+        np.testing.assert_array_equal(broadcast, self.previous_session_levels())
+
+    def test_intraday_signals_use_previous_session(self):
+        generator = SignalGenerator(self.config)
+        generator.chunk_bars = 100
+        signals = generator.generate_signals(self.data)
+
+        volume_mean = self.data['Volume'].rolling(20).mean().shift(1).to_numpy()
+        expected = [
+            int(generator._check_entry_conditions(
+                price, CPRCalculator.calculate(*levels), PivotCalculator.calculate(*levels),
+                ema_short, ema_long, volume, avg_volume
+            ))
+            for price, levels, ema_short, ema_long, volume, avg_volume in zip(
+                self.data['Close'], self.previous_session_levels(), signals['EMA_short'],
+                signals['EMA_long'], self.data['Volume'], volume_mean
+            )
+        ]
+        self.assertEqual(signals['signal'].tolist(), expected)
+        self.assertGreater(sum(expected), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import dataclasses
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.signals.ema import EMACalculator
+from src.signals.signal_generator import SignalGenerator
+from src.signals.streaming import RecursiveEMA, StreamingSignalEngine
+from tests.test_signal_generator import make_intraday, make_ohlcv
+
+
+class TestStreamingSignalEngine(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST', start_date='2020-01-01', end_date='2021-01-01', initial_capital=100000,
+            ema_short=9, ema_long=20, volume_threshold=1.2, stop_loss=0.02, take_profit=0.03
+        )
+
+    def stream(self, data, config=None):
+        engine = StreamingSignalEngine(config or self.config)
+        return [engine.update(bar, timestamp) for timestamp, bar in zip(data.index, data.to_dict('records'))]
+
+    def test_recursive_ema_matches_pandas(self):
+        values = pd.Series(np.random.default_rng(0).normal(100, 5, 5000))
+        values.iloc[[0, 1, 500, 501, 502, 4000]] = np.nan
+        values.iloc[1000:1010] = 101.0
+        for span in (3, 9, 20, 200):
+            ema = RecursiveEMA(span)
+            streamed = [ema.update(x) for x in values]
+            np.testing.assert_array_equal(streamed, EMACalculator.calculate(values, span).to_numpy())
+
+    def test_matches_batch_generator_over_long_history(self):
+        data = make_ohlcv(10000, seed=7)
+        batch = SignalGenerator(self.config).generate_signals(data)['signal'].tolist()
+
+        streamed = self.stream(data)
+
+        self.assertEqual(streamed, batch)
+        self.assertGreater(sum(streamed), 0)
+
+    def test_matches_batch_generator_with_volume_gaps(self):
+        data = make_ohlcv(3000, seed=8, int_volume=False)
+        data.iloc[200:215, data.columns.get_loc('Volume')] = np.nan
+        batch = SignalGenerator(self.config).generate_signals(data)['signal'].tolist()
+
+        self.assertEqual(self.stream(data), batch)
+
+    def test_matches_batch_generator_intraday(self):
+        config = dataclasses.replace(self.config, interval='5m', intraday=True)
+        data = make_intraday(20, seed=3)
+        batch = SignalGenerator(config).generate_signals(data)['signal'].tolist()
+
+        streamed = self.stream(data, config)
+
+        self.assertEqual(streamed, batch)
+        self.assertGreater(sum(streamed), 0)
+        # Previous-bar levels give different signals on the same bars
+        self.assertNotEqual(self.stream(data), batch)
+
+    def test_intraday_requires_timestamps(self):
+        engine = StreamingSignalEngine(dataclasses.replace(self.config, intraday=True))
+        with self.assertRaises(ValueError):
+            engine.update({'High': 1.0, 'Low': 1.0, 'Close': 1.0, 'Volume': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.trade_execution.trade_manager import TradeManager
+
+
+class TestTradeManager(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST',
+            start_date='2020-01-01',
+            end_date='2021-01-01',
+            initial_capital=100000,
+            ema_short=9,
+            ema_long=20,
+            volume_threshold=1.5,
+            stop_loss=0.02,
+            take_profit=0.03
+        )
+
+    def make_inputs(self, n, signal_rate, seed=0):
+        rng = np.random.default_rng(seed)
+        index = pd.date_range('2020-01-01', periods=n, freq='min')
+        data = pd.DataFrame({'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))}, index=index)
+        signals = pd.DataFrame({'signal': (rng.random(n) < signal_rate).astype(np.int64)}, index=index)
+        return data, signals
+
+    def assert_matches_iterative(self, data, signals):
+        event = TradeManager(self.config).execute_trades(data, signals)
+        iterative = TradeManager(self.config).execute_trades_iterative(data, signals)
+
+        self.assertEqual(event['trades'], iterative['trades'])
+        self.assertEqual(event['equity_curve'], iterative['equity_curve'])
+        self.assertEqual(len(event['equity_curve']), len(data) + 1)
+        return event
+
+    def test_event_execution_matches_iterative(self):
+        for seed, rate in enumerate((0.001, 0.02, 0.5)):
+            data, signals = self.make_inputs(5000, rate, seed)
+            results = self.assert_matches_iterative(data, signals)
+            self.assertGreater(len(results['trades']), 0)
+
+    def test_open_position_at_end_is_kept(self):
+        data, signals = self.make_inputs(50, 0.0)
+        data['Close'] = 100.0
+        signals.iloc[10, 0] = 1
+
+        results = self.assert_matches_iterative(data, signals)
+
+        self.assertEqual(results['trades'], [])
+        self.assertEqual(results['equity_curve'], [100000] * 51)
+
+    def test_bar_by_bar_matches_iterative(self):
+        data, signals = self.make_inputs(3000, 0.02, seed=4)
+        iterative = TradeManager(self.config).execute_trades_iterative(data, signals)
+
+        manager = TradeManager(self.config)
+        orders = [
+            manager.process_bar(date, price, signal)
+            for date, price, signal in zip(data.index, data['Close'], signals['signal'])
+        ]
+
+        self.assertEqual(manager.trades, iterative['trades'])
+        self.assertEqual(manager.equity_curve, iterative['equity_curve'])
+        sells = [order for order in orders if order and order['side'] == 'SELL']
+        self.assertEqual([order['date'] for order in sells], [trade['exit_date'] for trade in manager.trades])
+
+    def test_no_signals(self):
+        data, signals = self.make_inputs(100, 0.0)
+        self.assert_matches_iterative(data, signals)
+        self.assert_matches_iterative(data.iloc[:0], signals.iloc[:0])
+
+
+if __name__ == '__main__':
+    unittest.main()
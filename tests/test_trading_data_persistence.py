@@ -0,0 +1,344 @@
+import csv
+import dataclasses
+import io
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import psycopg2.errors
+
+from config.config import TradingConfig
+from src.data.trading_data_persistence import TradingDataPersistence
+
+
+class RecordingCursor:
+    """Cursor double that keeps executed SQL and COPY payloads"""
+
+    def __init__(self, partitions=()):
+        self.statements = []
+        self.copies = []
+        self.partitions = list(partitions)
+        # market_data_fingerprints rows: (symbol, interval, month, row_count, last_timestamp, fingerprint)
+        self.fingerprints = []
+        self.params = []
+        self.batched = []
+        self.retired_runs = []
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.statements.append(query.decode() if isinstance(query, bytes) else query)
+        self.params.append(params)
+
+    def mogrify(self, query, params):
+        self.batched.append((query, params))
+        return b''
+
+    def fetchone(self):
+        return (42,)
+
+    def fetchall(self):
+        if 'market_data_fingerprints' in self.statements[-1]:
+            symbol, interval, _ = self.params[-1]
+            return [row[2:] for row in self.fingerprints if row[:2] == (symbol, interval)]
+        if 'config.backtest_runs' in self.statements[-1]:
+            return [(run_id,) for run_id in self.retired_runs]
+        return [(name,) for name in self.partitions]
+
+    def copy_expert(self, sql, file):
+        self.copies.append((sql, file.read()))
+
+
+class TestBulkLoad(unittest.TestCase):
+    def setUp(self):
+        self.cursor = RecordingCursor()
+        conn = mock.MagicMock()
+        conn.cursor.return_value = self.cursor
+        with mock.patch('psycopg2.connect', return_value=conn):
+            self.db = TradingDataPersistence({})
+        self.conn = conn
+        self.config = TradingConfig(
+            symbol='TEST',
+            start_date='2024-01-01',
+            end_date='2024-03-01',
+            initial_capital=100000,
+            ema_short=9,
+            ema_long=20,
+            volume_threshold=1.5,
+            stop_loss=0.02,
+            take_profit=0.03
+        )
+
+    def copied_rows(self):
+        rows = []
+        for _, payload in self.cursor.copies:
+            rows.extend(csv.reader(io.StringIO(payload)))
+        return rows
+
+    def test_market_data_copied_then_merged_once(self):
+        n = 45
+        results = {
+            'dates': pd.date_range('2024-01-20', periods=n, freq='D', tz='America/New_York').tolist(),
+            'prices': np.linspace(100, 110, n).tolist(),
+            'volumes': [1000] * n,
+            'ema_short': [np.nan] + [101.0] * (n - 1),
+        }
+        self.db.bulk_save_market_data(7, results, self.config)
+
+        rows = self.copied_rows()
+        self.assertEqual(len(rows), n)
+        self.assertEqual(rows[0][:4], ['7', '2024-01-20 00:00:00.000000', 'TEST', '1d'])
+        # Missing values and columns become NULLs; strategy EMAs are not shared market data
+        self.assertEqual(rows[0][4:7], ['', '', ''])
+        self.assertEqual(len(rows[0]), 9)
+
+        merges = [sql for sql in self.cursor.statements if 'ON CONFLICT (symbol, interval, timestamp)' in sql]
+        self.assertEqual(len(merges), 1)
+        self.assertIn('FROM staging_market_data', merges[0])
+        self.assertEqual(self.db.load_stats['trading.market_data'][0], n)
+        self.conn.rollback.assert_not_called()
+
+    def store_fingerprints(self):
+        """Make the saved fingerprints visible to the next save, as the table would"""
+        stored = {tuple(row[:3]): row[3:] for row in self.cursor.fingerprints}
+        for query, params in self.cursor.batched:
+            if 'market_data_fingerprints' in query:
+                stored[params[:3]] = params[3:]
+        self.cursor.batched.clear()
+        self.cursor.fingerprints = [(*key, *row) for key, row in stored.items()]
+        self.cursor.copies.clear()
+
+    def test_unchanged_months_are_skipped(self):
+        n = 45
+        results = {
+            'dates': pd.date_range('2024-01-20', periods=n, freq='D').tolist(),
+            'prices': np.linspace(100, 110, n).tolist(),
+            'volumes': [1000.0] * n,
+        }
+        self.db.bulk_save_market_data(7, results, self.config)
+        self.assertEqual(len(self.copied_rows()), n)
+        self.store_fingerprints()
+
+        # Identical rerun, apart from noise below the stored precision
+        rerun = dict(results, prices=[price + 1e-9 for price in results['prices']])
+        self.db.bulk_save_market_data(8, rerun, self.config)
+        self.assertEqual(self.copied_rows(), [])
+
+        # Two new bars: only they are written
+        extended = {
+            'dates': pd.date_range('2024-01-20', periods=n + 2, freq='D').tolist(),
+            'prices': results['prices'] + [111.0, 112.0],
+            'volumes': [1000.0] * (n + 2),
+        }
+        self.db.bulk_save_market_data(9, extended, self.config)
+        self.assertEqual([row[1][:10] for row in self.copied_rows()], ['2024-03-05', '2024-03-06'])
+        self.store_fingerprints()
+
+        # A revised January bar rewrites January only
+        revised = dict(extended, prices=[99.0] + extended['prices'][1:])
+        self.db.bulk_save_market_data(10, revised, self.config)
+        months = {row[1][:7] for row in self.copied_rows()}
+        self.assertEqual(months, {'2024-01'})
+        self.assertEqual(len(self.copied_rows()), 12)
+
+    def test_fingerprints_are_kept_per_interval(self):
+        daily = {
+            'dates': pd.date_range('2024-01-02', periods=20, freq='D').tolist(),
+            'prices': np.linspace(100, 110, 20).tolist(),
+        }
+        intraday = {
+            'dates': pd.date_range('2024-01-02 09:30', periods=60, freq='5min').tolist(),
+            'prices': np.linspace(100, 101, 60).tolist(),
+        }
+        five_minute = dataclasses.replace(self.config, interval='5m')
+        self.db.bulk_save_market_data(7, daily, self.config)
+        self.store_fingerprints()
+        self.db.bulk_save_market_data(8, intraday, five_minute)
+        self.assertEqual({row[3] for row in self.copied_rows()}, {'5m'})
+        self.assertEqual(len(self.copied_rows()), 60)
+        self.store_fingerprints()
+
+        # Alternating intervals no longer overwrite each other's fingerprints
+        self.db.bulk_save_market_data(9, daily, self.config)
+        self.db.bulk_save_market_data(10, intraday, five_minute)
+        self.assertEqual(self.copied_rows(), [])
+
+    def test_runs_are_append_only(self):
+        n = 10
+        results = {
+            'dates': pd.date_range('2024-01-02', periods=n, freq='D').tolist(),
+            'prices': np.linspace(100, 110, n).tolist(),
+            'equity_curve': np.linspace(100000, 101000, n).tolist(),
+            'trades': [{'entry_date': pd.Timestamp('2024-01-03'), 'entry_price': 101.0,
+                        'exit_date': pd.Timestamp('2024-01-05'), 'exit_price': 103.0, 'profit': 2.0}],
+        }
+        strategy_id = self.db.write_all_data(self.config, results, {'daily_performance': {}})
+
+        self.assertEqual((strategy_id, self.db.run_id), (42, 42))
+        statements = ' '.join(self.cursor.statements)
+        self.assertNotIn('DELETE', statements)
+        self.assertNotIn('UPDATE trading.market_data', statements)
+        self.assertNotIn('UPDATE config.trading_strategies', statements)
+        self.assertIn("SET status = 'COMPLETE'", self.cursor.statements[-1])
+        trades = self.copied_rows()[n:]
+        self.assertEqual(trades[0][:2], ['42', '42'])
+
+    def test_failed_run_leaves_no_rows(self):
+        results = {
+            'dates': pd.date_range('2024-01-02', periods=3, freq='D').tolist(),
+            'prices': [100.0, 101.0, 103.0],
+            'equity_curve': [100000.0, 100000.0, 100002.0],
+            'trades': [{'entry_date': pd.Timestamp('2024-01-03'), 'entry_price': 101.0,
+                        'exit_date': pd.Timestamp('2024-01-04'), 'exit_price': 103.0, 'profit': 2.0}],
+        }
+        with mock.patch.object(self.db, 'bulk_save_trades', side_effect=RuntimeError('copy failed')):
+            with self.assertRaises(RuntimeError):
+                self.db.write_all_data(self.config, results, {'daily_performance': {}})
+
+        # Only the strategy row committed; the run and its rows rolled back together
+        self.conn.commit.assert_called_once()
+        self.conn.rollback.assert_called()
+        self.assertFalse(any("SET status = 'COMPLETE'" in sql for sql in self.cursor.statements))
+
+    def test_strategy_insert_is_race_free(self):
+        self.assertEqual(self.db.save_trading_strategy(self.config), 42)
+        self.assertIn('ON CONFLICT', self.cursor.statements[0])
+        self.assertEqual(len(self.cursor.statements), 1)
+
+        # A concurrent run inserted the same strategy first: re-select its id
+        with mock.patch.object(self.cursor, 'fetchone', side_effect=[None, (7,)]):
+            self.assertEqual(self.db.save_trading_strategy(self.config), 7)
+        self.assertIn('SELECT strategy_id', self.cursor.statements[-1])
+
+    def test_signal_settings_identify_the_strategy(self):
+        # Settings that change the signals are part of the strategy's key
+        with mock.patch.object(self.cursor, 'execute') as execute:
+            self.db.save_trading_strategy(dataclasses.replace(self.config, interval='5m', intraday=True))
+        query, params = execute.call_args.args
+        self.assertEqual(params[-3:], (0.001, '5m', True))
+        self.assertIn('pivot_threshold, interval, intraday) DO NOTHING', query)
+
+    def test_indicators_stored_per_run(self):
+        n = 40
+        dates = pd.date_range('2024-01-02', periods=n, freq='D')
+        prices = pd.Series(np.linspace(100, 110, n))
+        results = {'dates': dates.tolist(), 'prices': prices.tolist()}
+        fast = dict(results, ema_short=prices.ewm(span=5).mean().tolist(), ema_long=prices.ewm(span=20).mean().tolist())
+        slow = dict(results, ema_short=prices.ewm(span=9).mean().tolist(), ema_long=prices.ewm(span=30).mean().tolist())
+
+        self.db.bulk_save_market_data(7, fast, self.config)
+        self.db.bulk_save_indicators(1, fast)
+        self.store_fingerprints()
+
+        # Other EMA periods on the same bars leave the shared market data untouched
+        self.db.bulk_save_market_data(8, slow, self.config)
+        self.assertEqual(self.copied_rows(), [])
+        self.db.bulk_save_indicators(2, slow)
+        rows = self.copied_rows()
+        self.assertEqual(len(rows), n)
+        self.assertEqual(rows[0][:2], ['2', '2024-01-02 00:00:00.000000'])
+        self.assertAlmostEqual(float(rows[-1][3]), slow['ema_long'][-1])
+        self.assertIn('INSERT INTO trading.run_indicators', self.cursor.statements[-2])
+
+    def test_retire_runs_deletes_in_batches(self):
+        self.cursor.retired_runs = [3, 4]
+        self.assertEqual(self.db.retire_runs(keep_latest=2, batch_size=100), 2)
+
+        deletes = [sql for sql in self.cursor.statements if 'DELETE' in sql]
+        self.assertEqual(len(deletes), 5)
+        self.assertIn('LIMIT', deletes[0])
+        self.assertIn('config.backtest_runs', deletes[-1])
+
+    def test_trade_manager_trades_mapped_to_schema(self):
+        trades = [
+            {'entry_date': pd.Timestamp('2024-01-02'), 'entry_price': 100.0,
+             'exit_date': pd.Timestamp('2024-01-05'), 'exit_price': 103.0, 'profit': 3.0},
+            {'entry_date': pd.Timestamp('2024-01-08'), 'entry_price': 50.0,
+             'exit_date': None, 'exit_price': None, 'profit': None},
+        ]
+        self.db.bulk_save_trades(7, trades, 'TEST', run_id=3)
+
+        closed, still_open = self.copied_rows()
+        self.assertEqual(closed[1:3], ['3', 'TEST'])
+        self.assertEqual(closed[8:12], ['LONG', '3.0', '0.03', 'CLOSED'])
+        self.assertEqual(still_open[4], '')
+        self.assertEqual(still_open[11], 'OPEN')
+
+    def test_failed_copy_rolls_back(self):
+        self.cursor.copy_expert = mock.Mock(side_effect=RuntimeError('copy failed'))
+        metrics = {'dates': ['2024-01-02'], 'equity_curve': [100000.0]}
+        with self.assertRaises(RuntimeError):
+            self.db.bulk_save_portfolio_metrics(7, metrics)
+        self.conn.rollback.assert_called_once()
+        self.conn.commit.assert_not_called()
+
+    def test_transaction_commits_once(self):
+        metrics = {'dates': ['2024-01-02', '2024-01-03'], 'equity_curve': [100000.0, 100500.0]}
+        with self.db.transaction():
+            self.db.bulk_save_portfolio_metrics(7, metrics)
+            self.db.bulk_save_portfolio_metrics(8, metrics)
+            self.conn.commit.assert_not_called()
+        self.conn.commit.assert_called_once()
+
+    def test_only_missing_partitions_created_in_one_statement(self):
+        self.cursor.partitions = ['market_data_y2024m01', 'market_data_y2024m03']
+        self.db.ensure_partitions_exist(pd.Timestamp('2024-01-15'), pd.Timestamp('2024-04-02'))
+
+        catalog_reads = [sql for sql in self.cursor.statements if 'pg_inherits' in sql]
+        creates = [sql for sql in self.cursor.statements if 'CREATE TABLE' in sql]
+        self.assertEqual(len(catalog_reads), 1)
+        self.assertEqual(len(creates), 1)
+        self.assertIn('market_data_y2024m02', creates[0])
+        self.assertIn('market_data_y2024m04', creates[0])
+        self.assertNotIn('market_data_y2024m03', creates[0])
+
+        # Cached for the connection: no catalog read and no DDL the second time
+        self.cursor.statements.clear()
+        self.db.ensure_partitions_exist(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-04-30'))
+        self.assertEqual(self.cursor.statements, [])
+
+    def test_concurrent_partition_creation_refreshes_catalog(self):
+        cursor = self.cursor
+        execute = cursor.execute
+
+        def racing_execute(query, params=None):
+            if 'CREATE TABLE' in query and not cursor.partitions:
+                # Another writer created the partition in the meantime
+                cursor.partitions = ['market_data_y2024m05']
+                raise psycopg2.errors.DuplicateTable('already exists')
+            execute(query, params)
+
+        cursor.execute = racing_execute
+        self.db.ensure_partitions_exist(pd.Timestamp('2024-05-03'), pd.Timestamp('2024-05-20'))
+
+        self.assertIn('ROLLBACK TO SAVEPOINT ensure_partitions;', cursor.statements)
+        self.assertEqual(len([sql for sql in cursor.statements if 'pg_inherits' in sql]), 2)
+        self.assertFalse([sql for sql in cursor.statements if 'CREATE TABLE' in sql])
+        self.conn.rollback.assert_not_called()
+
+    def test_other_partition_errors_are_not_retried(self):
+        cursor = self.cursor
+        execute = cursor.execute
+
+        def failing_execute(query, params=None):
+            if 'CREATE TABLE' in query:
+                raise psycopg2.errors.InsufficientPrivilege('permission denied for schema trading')
+            execute(query, params)
+
+        cursor.execute = failing_execute
+        with self.assertRaises(psycopg2.errors.InsufficientPrivilege):
+            self.db.ensure_partitions_exist(pd.Timestamp('2024-05-03'), pd.Timestamp('2024-05-20'))
+
+        self.assertEqual(len([sql for sql in cursor.statements if 'pg_inherits' in sql]), 1)
+        self.assertNotIn('ROLLBACK TO SAVEPOINT ensure_partitions;', cursor.statements)
+        self.conn.rollback.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
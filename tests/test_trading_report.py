@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.reporting.trading_report import TradingReport, generate_reports
+
+
+def make_job(symbol, n=300, seed=0):
+    config = TradingConfig(
+        symbol=symbol,
+        start_date='2023-01-01',
+        end_date='2024-01-01',
+        initial_capital=100000,
+        ema_short=9,
+        ema_long=20,
+        volume_threshold=1.5,
+        stop_loss=0.02,
+        take_profit=0.03
+    )
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-02', periods=n, freq='D')
+    prices = 100 + rng.normal(0, 1, n).cumsum()
+    results = {
+        'dates': dates.tolist(),
+        'prices': prices.tolist(),
+        'ema_short': pd.Series(prices).ewm(span=9, adjust=False).mean().tolist(),
+        'ema_long': pd.Series(prices).ewm(span=20, adjust=False).mean().tolist(),
+        'equity_curve': (100000 + rng.normal(0, 100, n).cumsum()).tolist(),
+        'buy_dates': [dates[10]],
+        'buy_prices': [prices[10]],
+        'sell_dates': [dates[20]],
+        'sell_prices': [prices[20]],
+    }
+    analysis = {'total_trades': 1, 'winning_trades': 1, 'total_profit': 150.0,
+                'max_drawdown': -0.02, 'sharpe_ratio': 1.1}
+    return config, results, analysis
+
+
+class TestTradingReport(unittest.TestCase):
+    def test_charts_render_in_memory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                report = TradingReport(*make_job('AAA'), report_dir=tmp)
+                chart = report.create_charts()
+                equity = report.create_equity_curve()
+                self.assertEqual(os.listdir(tmp), [])
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(chart.read(8), b'\x89PNG\r\n\x1a\n')
+        self.assertEqual(equity.read(8), b'\x89PNG\r\n\x1a\n')
+
+    def test_batch_reports_do_not_collide(self):
+        jobs = [make_job('AAA', seed=1), make_job('BBB', seed=2), make_job('AAA', seed=3)]
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = generate_reports(jobs, report_dir=tmp, max_workers=2, chunksize=1)
+            self.assertEqual(len(set(paths)), 3)
+            self.assertEqual(sorted(os.listdir(tmp)), sorted(os.path.basename(path) for path in paths))
+            self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+
+    def test_lite_formats_skip_pdf_libraries(self):
+        script = (
+            "import json, sys, tempfile\n"
+            "from tests.test_trading_report import make_job\n"
+            "from src.reporting.trading_report import TradingReport\n"
+            "tmp = tempfile.mkdtemp()\n"
+            "path = TradingReport(*make_job('AAA', n=5000), report_dir=tmp, output_format='html').generate_report()\n"
+            "print(json.dumps([path, 'matplotlib' in sys.modules, 'reportlab' in sys.modules]))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True,
+                                text=True, check=True).stdout
+        path, matplotlib_loaded, reportlab_loaded = json.loads(output.splitlines()[-1])
+        self.assertFalse(matplotlib_loaded)
+        self.assertFalse(reportlab_loaded)
+
+        with open(path) as f:
+            html = f.read()
+        with open(path[:-len('html')] + 'json') as f:
+            report = json.load(f)
+        self.assertIn('<canvas id="equity"', html)
+        self.assertNotIn('__DATA__', html)
+        self.assertEqual(report['symbol'], 'AAA')
+        self.assertEqual(report['config']['ema_long'], 20)
+        self.assertEqual(report['metrics']['total_trades'], 1)
+        self.assertAlmostEqual(report['total_return'], report['final_portfolio_value'] / 100000 - 1)
+
+        data = json.loads(html.split('type="application/json">')[1].split('</script>')[0])
+        self.assertLessEqual(len(data['series']['dates']), 2002)
+        self.assertEqual(len(data['series']['dates']), len(data['series']['prices']))
+
+    def test_batch_json_reports(self):
+        jobs = [make_job('AAA', seed=1), make_job('BBB', seed=2)]
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = generate_reports(jobs, report_dir=tmp, max_workers=1, output_format='json')
+            self.assertTrue(all(path.endswith('.json') for path in paths))
+            with open(paths[1]) as f:
+                self.assertEqual(json.load(f)['symbol'], 'BBB')
+
+    def test_unknown_format_rejected(self):
+        with self.assertRaises(ValueError):
+            TradingReport(*make_job('AAA'), output_format='docx')
+
+
+if __name__ == '__main__':
+    unittest.main()
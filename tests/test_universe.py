@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from config.config import TradingConfig
+from src.backtesting.universe import UniverseRunner
+from src.data.market_data_store import MarketDataStore
+
+
+def make_frame(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame({
+        'Open': close, 'High': close + spread, 'Low': close - spread, 'Close': close,
+        'Volume': rng.lognormal(13, 0.6, n)
+    }, index=pd.date_range('2023-01-01', periods=n, freq='D', tz='America/New_York'))
+
+
+class TestUniverseRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        store = MarketDataStore(self.tmp.name)
+        store.ingest({symbol: make_frame(300, seed) for seed, symbol in enumerate(['AAA', 'BBB', 'CCC'])})
+        # Corrupt header makes this symbol fail while loading
+        with open(os.path.join(self.tmp.name, 'BAD.json'), 'w') as f:
+            f.write('{')
+        store.append('OK', make_frame(30, 9))
+        os.replace(os.path.join(self.tmp.name, 'OK.bin'), os.path.join(self.tmp.name, 'BAD.bin'))
+
+        self.config = TradingConfig(
+            symbol='', start_date='2023-01-01', end_date='2024-01-01', initial_capital=100000,
+            ema_short=9, ema_long=20, volume_threshold=1.2, stop_loss=0.02, take_profit=0.03
+        )
+
+    def test_failing_symbol_is_isolated(self):
+        symbols = ['AAA', 'BAD', 'BBB', 'CCC']
+        results = UniverseRunner(self.config, symbols, max_workers=2, chunksize=1,
+                                 store_dir=self.tmp.name).run()
+
+        self.assertEqual(results['symbol'].tolist(), symbols)
+        self.assertEqual(results['status'].tolist(), ['ok', 'error', 'ok', 'ok'])
+        self.assertIn('JSONDecodeError', results.loc[1, 'error'])
+        self.assertTrue((results['wall_time'] > 0).all())
+        self.assertTrue(results.loc[results['status'] == 'ok', 'total_trades'].notna().all())
+
+
+if __name__ == '__main__':
+    unittest.main()
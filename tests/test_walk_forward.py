@@ -0,0 +1,67 @@
+import unittest
+
+from config.config import TradingConfig
+from src.backtesting.walk_forward import WalkForwardOptimizer
+from src.signals.signal_generator import SignalGenerator
+from src.trade_execution.trade_manager import TradeManager
+from tests.test_signal_generator import make_ohlcv
+
+
+class TestWalkForwardOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol='TEST', start_date='2020-01-01', end_date='2021-01-01', initial_capital=100000,
+            ema_short=9, ema_long=20, volume_threshold=1.2, stop_loss=0.02, take_profit=0.03
+        )
+        self.grid = {'ema_short': [5, 9], 'take_profit': [0.02, 0.04]}
+        self.data = make_ohlcv(1000, seed=5)
+
+    def test_windows_roll_forward(self):
+        optimizer = WalkForwardOptimizer(self.config, self.grid, train_bars=400, test_bars=200)
+        self.assertEqual(optimizer.windows(1000), [(0, 400, 600), (200, 600, 800), (400, 800, 1000)])
+
+    def test_stitched_out_of_sample_results(self):
+        optimizer = WalkForwardOptimizer(self.config, self.grid, train_bars=400, test_bars=200,
+                                         max_workers=2, data=self.data)
+        result = optimizer.run()
+
+        self.assertEqual(len(result.windows), 3)
+        self.assertTrue((result.windows['train_time'] > 0).all())
+        self.assertEqual(len(result.results['dates']), 600)
+        self.assertEqual(len(result.results['equity_curve']), 601)
+        self.assertEqual(result.results['dates'][0], self.data.index[400])
+        self.assertEqual(result.analysis['total_trades'], result.windows['test_total_trades'].sum())
+        self.assertTrue((result.windows['test_exposure'] > 0).all())
+        self.assertGreater(result.analysis['exposure'], 0)
+        self.assertTrue(result.analysis['daily_performance'])
+        self.assertAlmostEqual(result.results['equity_curve'][-1] - self.config.initial_capital,
+                               result.windows['test_total_profit'].sum())
+
+    def test_test_signals_match_full_history(self):
+        # A single-value grid fixes the parameters of every window
+        optimizer = WalkForwardOptimizer(self.config, {'ema_short': [9]}, train_bars=400, test_bars=200,
+                                         max_workers=1, data=self.data)
+        result = optimizer.run()
+
+        signals = SignalGenerator(self.config).generate_signals(self.data)
+        expected = []
+        stitched_bars = 0
+        for _, test_start, test_end in optimizer.windows(len(self.data)):
+            trades = TradeManager(self.config).execute_trades(
+                self.data.iloc[test_start:test_end], signals.iloc[test_start:test_end])['trades']
+            # Bar positions are relative to the stitched out-of-sample bars
+            expected.extend(dict(trade, entry_bar=trade['entry_bar'] + stitched_bars,
+                                 exit_bar=trade['exit_bar'] + stitched_bars) for trade in trades)
+            stitched_bars += test_end - test_start
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(result.results['trades'], expected)
+        dates = result.results['dates']
+        self.assertTrue(all(dates[trade['entry_bar']] == trade['entry_date'] for trade in expected))
+
+    def test_rejects_overlapping_test_slices(self):
+        with self.assertRaises(ValueError):
+            WalkForwardOptimizer(self.config, self.grid, train_bars=400, test_bars=200, step_bars=100)
+
+
+if __name__ == '__main__':
+    unittest.main()